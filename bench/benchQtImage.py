@@ -0,0 +1,68 @@
+"""
+图像数组到Qt界面显示的转换耗时对比
+
+比较原转换方式 (复制数组、构造QImage、BGR交换、转QPixmap、平滑缩放) 与
+ImgProcess.cvImg2QPixmap (零复制包装、尺寸符合时不缩放、复用QPixmap) 在几种典型场景下的耗时。
+
+用法: python bench/benchQtImage.py [-r 重复次数]
+"""
+import sys
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtWidgets import QApplication, QLabel
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lib.utils.utils import ImgProcess
+
+
+def legacyCvImg2QPixmap(obj, inputImg):
+    """
+    原转换方式
+    """
+    if len(inputImg.shape) == 2:
+        rows, columns = inputImg.shape
+        img = QImage(inputImg.copy(), columns, rows, columns, QImage.Format.Format_Indexed8)
+    else:
+        rows, columns, channels = inputImg.shape
+        img = QImage(inputImg.copy(), columns, rows, channels * columns, QImage.Format.Format_RGB888).rgbSwapped()
+
+    pixmap = QPixmap(img)
+    obj.setPixmap(pixmap.scaled(obj.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+
+
+def timeIt(func, repeat):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='ndarray to QPixmap conversion benchmark')
+    parser.add_argument('-r', '--repeat', default=50, type=int, help='Repetitions per case')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    rng = np.random.default_rng(0)
+
+    # (说明, 图像, 控件尺寸)
+    cases = [
+        ('hologram 1080x1080 -> SLM 1:1', rng.integers(0, 256, (1080, 1080), dtype=np.uint8), (1080, 1080)),
+        ('hologram 1080x1080 -> 540x540', rng.integers(0, 256, (1080, 1080), dtype=np.uint8), (540, 540)),
+        ('BGR 1216x1824 -> 1:1', rng.integers(0, 256, (1216, 1824, 3), dtype=np.uint8), (1824, 1216)),
+        ('BGR 1216x1824 -> 912x608', rng.integers(0, 256, (1216, 1824, 3), dtype=np.uint8), (912, 608)),
+    ]
+
+    print(f"{'case':<32}{'legacy ms':>12}{'new ms':>12}{'speedup':>10}")
+    for name, image, size in cases:
+        label = QLabel()
+        label.resize(*size)
+        legacy = timeIt(lambda: legacyCvImg2QPixmap(label, image), args.repeat)
+        new = timeIt(lambda: ImgProcess.cvImg2QPixmap(label, image), args.repeat)
+        print(f"{name:<32}{legacy * 1e3:>12.2f}{new * 1e3:>12.2f}{legacy / new:>10.1f}")
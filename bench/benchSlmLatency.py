@@ -0,0 +1,85 @@
+"""
+SLM显示到相机成像的延迟与液晶稳定时间测量
+
+交替显示两幅测试全息图，统计从发出全息图到副屏重绘、相机光强开始变化及稳定的时间分布。
+默认使用仿真相机，可设定其模拟的显示延迟与液晶响应时间以检验测量结果；
+使用实际相机时，测试全息图全屏显示在 --screen 指定的显示器 (SLM) 上。
+
+用法: python bench/benchSlmLatency.py [-c sim|nncam] [-n 切换次数] [--hold 保持时间 s] [--opengl]
+"""
+import sys
+import argparse
+from pathlib import Path
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QLabel
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lib.cam.camAPI import CameraMiddleware
+from lib.utils.utils import ImgProcess
+from lib.utils.slmLatency import SlmLatencyProbe
+from lib.utils.slmPresenter import SlmPresenter
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='SLM to camera latency measurement')
+    parser.add_argument('-c', '--camera', default='sim', choices=['sim', 'nncam'], help='Camera backend')
+    parser.add_argument('-n', '--trials', default=20, type=int, help='Number of pattern switches')
+    parser.add_argument('--hold', default=0.6, type=float, help='Hold time of each pattern (s)')
+    parser.add_argument('--screen', default=1, type=int, help='Index of the SLM screen')
+    parser.add_argument('--opengl', action='store_true', help='Display through the OpenGL presenter instead of QPixmap')
+    parser.add_argument('--sim-delay', default=0.15, type=float, help='Simulated display latency (s)')
+    parser.add_argument('--sim-response', default=0.03, type=float, help='Simulated LC response time constant (s)')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    if args.camera == 'sim':
+        from lib.cam.simCamera import SimCamera
+        SimCamera.beadCount = 0
+        SimCamera.responseDelay = args.sim_delay
+        SimCamera.responseTime = args.sim_response
+        CameraMiddleware.backend = SimCamera
+
+    cam = CameraMiddleware()
+    if cam.openCamera() == -1:
+        sys.exit("Unable to open camera")
+
+    if args.opengl:
+        slmWin = SlmPresenter()
+    else:
+        slmWin = QLabel()
+        slmWin.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    slmWin.setStyleSheet("background-color: #000")
+    screens = QApplication.screens()
+    if args.camera == 'nncam' and args.screen < len(screens):
+        slmWin.setGeometry(screens[args.screen].geometry())
+        slmWin.showFullScreen()
+    else:
+        slmWin.resize(540, 540)
+        slmWin.show()
+
+    def display(holoImg):
+        if args.opengl:
+            slmWin.present(holoImg)
+        else:
+            ImgProcess.cvImg2QPixmap(slmWin, holoImg)
+        cam.hologramDisplayed(holoImg)
+
+    def finished(result):
+        cam.closeCamera()
+        if isinstance(result, Exception):
+            print(f"Measurement failed: {result}")
+        else:
+            print(result.summary())
+        if args.opengl:
+            queue = slmWin.queue
+            print(f"presented {queue.presented}, dropped {queue.dropped}, repeated {queue.repeated}")
+        app.quit()
+
+    probe = SlmLatencyProbe(cam, display, slmWin, trials=args.trials, hold=args.hold)
+    probe.progress.connect(lambda done, total: print(f"\rswitch {done + 1}/{total}", end='', flush=True))
+    probe.finished.connect(lambda result: (print(), finished(result)))
+    probe.start()
+
+    sys.exit(app.exec())
@@ -0,0 +1,92 @@
+"""
+光斑检测后端的速度与精度对比
+
+在合成光斑图像上比较 Hough 与连通域检测后端的耗时、召回率、误检数与定位误差
+
+用法: python bench/benchSpotDetect.py [-n 光斑数] [-r 重复次数]
+"""
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lib.utils.spotDetect import HoughDetector, ComponentsDetector
+
+
+def synthSpots(num, size=1080, radius=8, noise=6, seed=0):
+    """
+    生成合成光斑图像
+
+    :return: (图像, 光斑真实中心 (N, 2))
+    """
+    rng = np.random.default_rng(seed)
+    centers = []
+    # 保证光斑之间互不重叠
+    while len(centers) < num:
+        c = rng.uniform(3 * radius, size - 3 * radius, 2)
+        if all(np.hypot(*(c - p)) > 4 * radius for p in centers):
+            centers.append(c)
+    centers = np.array(centers)
+
+    # 边缘柔化的圆盘光斑，近似显微镜下的微球
+    yy, xx = np.mgrid[0:size, 0:size]
+    img = np.zeros((size, size), dtype=np.float64)
+    for cx, cy in centers:
+        x0, x1 = int(cx - 2 * radius), int(cx + 2 * radius) + 1
+        y0, y1 = int(cy - 2 * radius), int(cy + 2 * radius) + 1
+        disk = (xx[y0:y1, x0:x1] - cx) ** 2 + (yy[y0:y1, x0:x1] - cy) ** 2 <= radius ** 2
+        img[y0:y1, x0:x1][disk] = 200
+    img = cv2.GaussianBlur(img, (0, 0), 1.5)
+    # 不均匀背景与噪声
+    img += 20 * xx / size + rng.normal(0, noise, img.shape)
+
+    return np.clip(img, 0, 255).astype(np.uint8), centers
+
+
+def evaluate(detected, truth, tol=3.0):
+    """
+    :return: (召回率, 误检数, 平均定位误差)
+    """
+    if len(detected) == 0:
+        return 0.0, 0, float('nan')
+    dist = np.linalg.norm(truth[:, None, :] - detected[None, :, :2], axis=2)
+    nearest = dist.min(axis=1)
+    hit = nearest <= tol
+    falsePos = int(np.sum(dist.min(axis=0) > tol))
+
+    return float(hit.mean()), falsePos, float(nearest[hit].mean()) if hit.any() else float('nan')
+
+
+def bench(detector, img, repeat):
+    detector.detect(img)  # 预热
+    tStart = time.perf_counter()
+    for _ in range(repeat):
+        spots = detector.detect(img)
+    duration = (time.perf_counter() - tStart) / repeat
+
+    return spots, duration
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Spot detector benchmark')
+    parser.add_argument('-n', '--num', default=200, type=int, help='Number of synthetic spots')
+    parser.add_argument('-r', '--repeat', default=20, type=int, help='Repetitions per detector')
+    args = parser.parse_args()
+
+    img, truth = synthSpots(args.num)
+
+    detectors = {
+        'hough': HoughDetector(),
+        'components': ComponentsDetector(),
+        'components x4 tiles': ComponentsDetector(tiles=4),
+    }
+
+    print(f"{'detector':<22}{'time (ms)':>12}{'recall':>10}{'false +':>10}{'error (px)':>12}")
+    for name, detector in detectors.items():
+        spots, duration = bench(detector, img, args.repeat)
+        recall, falsePos, err = evaluate(spots, truth)
+        print(f"{name:<22}{duration * 1e3:>12.2f}{recall:>10.3f}{falsePos:>10d}{err:>12.3f}")
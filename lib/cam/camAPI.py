@@ -1,8 +1,14 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 from PyQt6.QtCore import QObject, pyqtSignal
-from PyQt6.QtGui import QImage
 from lib.cam.nncam import nncam
+from lib.cam.frameRing import FrameRing
+from lib.cam.preview import PreviewBuffer
+from lib.cam.streamStats import StreamStats
+from lib.cam.snapshot import SnapRequest
 
 
 class CameraMiddleware(QObject):
@@ -14,13 +20,40 @@ class CameraMiddleware(QObject):
     :type imgWidth: int
     :var imgHeight: 图像高度
     :type imgHeight: int
-    :var frame: 向UI线程推送的图像帧
+    :var ring: 动态帧环形缓冲区，SDK直接写入，消费者借用最新帧
+    :var preview: 在相机线程中限频缩放的预览帧，有新预览帧时发出 frameUpdate
+    :var stats: 视频流的帧率、抖动与丢帧统计
+    :var mode: 当前相机模式，见 MODES
+    :var roi: 硬件ROI (x, y, 宽, 高)，预览分辨率坐标，仅 'roi' 模式有效
+    :var previewShape: 预览分辨率 (高, 宽)，零级光位置与跟踪结果均以此为坐标系
     :var snapshot: 向UI线程推送的已抓取静态帧
+    :var frameConsumers: 在相机线程中接收动态帧的回调列表，签名为 callback(slot)。
+        回调不可阻塞，需在回调之外使用该帧时应先 slot.acquire()。借用槽位的消费者应以
+        addFrameConsumer() 注册，帧缓冲区随之扩大
     """
 
+    # 8位灰度采集：黑白相机直接输出灰度数据，彩色相机由SDK转换，带宽与转换开销约为RGB24的1/3
+    mono = False
+    # 相机后端，需提供 nncam.Nncam 的接口，可替换为仿真相机 lib.cam.simCamera.SimCamera
+    backend = nncam.Nncam
+    # 预览刷新率上限，0为跟随显示器刷新率
+    previewFps = 0
+    # snap() 默认平均的静态帧数与超时 (s)
+    snapFrames = 1
+    snapTimeout = 5.0
+
+    # 相机模式: (分辨率序号，None为预览分辨率 RESOLUTION；NNCAM_OPTION_BINNING 取值；是否使用硬件ROI)
+    MODES = {
+        'preview': (None, 0x01, False),  # 预览分辨率，默认
+        'full': (0, 0x01, False),  # 全分辨率
+        'binned': (0, 0x82, False),  # 全分辨率2x2平均合并，信噪比更高
+        'roi': (None, 0x01, True),  # 预览分辨率下的硬件ROI，用于高帧率跟踪
+    }
+
     frameUpdate = pyqtSignal()
     snapUpdate = pyqtSignal()
     expoUpdate = pyqtSignal()
+    modeChanged = pyqtSignal()
 
     def __init__(self):
         super().__init__()
@@ -28,13 +61,30 @@ class CameraMiddleware(QObject):
         self.device = None
         self.imgWidth = 0
         self.imgHeight = 0
-        self.frame = None
+        self.ring = None
+        self.preview = PreviewBuffer()
+        self.stats = StreamStats()
         self.snapshot = None
         self.targetFromSnap = False
+        self.frameConsumers = []
+        self._consumerSlots = {}
+        self.mode = 'preview'
+        self.roi = None
+        self.previewShape = (0, 0)
 
-        self._streamBuf = None
+        self._slotBufs = []
         self._snapBuf = None
+        self._snapTarget = None
+        self._snapRequest = None
+        # 已作废请求仍在途的静态帧数及其丢弃期限，防止被新请求领取
+        self._staleStills = 0
+        self._staleDeadline = 0.0
+        self._snapLock = threading.Lock()
+        self._snapExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='snap')
+        self._bits = 24
         self.RESOLUTION = 2  # 1824x1216
+        # 消费者借用之外的槽位数：最新帧、写入中各一个，其余为余量
+        self.FRAME_SLOTS = 4
 
     def openCamera(self):
         """
@@ -42,18 +92,20 @@ class CameraMiddleware(QObject):
 
         返回 0 为成功，-1 为失败
         """
-        self.device = nncam.Nncam.Open(None)
+        self.device = self.backend.Open(None)
 
         if self.device:
-            # 分辨率
-            self.device.put_eSize(self.RESOLUTION)
-
-            self.imgWidth, self.imgHeight = self.device.get_Size()
             self.device.put_Option(nncam.NNCAM_OPTION_BYTEORDER, 0)  # Qimage use RGB byte order
             self.device.put_AutoExpoEnable(0)
 
-            self._streamBuf = bytes(nncam.TDIBWIDTHBYTES(self.imgWidth * 24) * self.imgHeight)
-            self._snapBuf = bytes(nncam.TDIBWIDTHBYTES(self.imgWidth * 24) * self.imgHeight)
+            if self.mono:
+                if self.device.MonoMode():
+                    self.device.put_Option(nncam.NNCAM_OPTION_RGB, 3)  # 8 Bits Grey
+                self._bits = 8
+            else:
+                self._bits = 24
+
+            self._applyMode()
             self.expoUpdateEvt()
 
             try:
@@ -66,6 +118,176 @@ class CameraMiddleware(QObject):
         else:
             return -1
 
+    def _applyMode(self):
+        """
+        [相机类] 按当前模式设置分辨率、合并与ROI，并重新分配帧缓冲区，需在取流开始前调用
+        """
+        resolution, binning, useRoi = self.MODES[self.mode]
+        previewWidth, previewHeight = self.device.get_Resolution(self.RESOLUTION)
+        self.previewShape = (previewHeight, previewWidth)
+
+        self.device.put_eSize(self.RESOLUTION if resolution is None else resolution)
+        self.device.put_Option(nncam.NNCAM_OPTION_BINNING, binning)
+
+        if useRoi and self.roi is not None:
+            # 偏移与尺寸须为偶数
+            x, y, w, h = (int(v) // 2 * 2 for v in self.roi)
+            self.roi = (x, y, w, h)
+            self.device.put_Roi(x, y, w, h)
+        else:
+            self.device.put_Roi(0, 0, 0, 0)  # 全视场
+
+        self.imgWidth, self.imgHeight = self.device.get_FinalSize()
+
+        # 帧缓冲区随图像尺寸重新分配，消费者仍持有的旧槽位归还给旧缓冲区
+        pitch = nncam.TDIBWIDTHBYTES(self.imgWidth * self._bits)
+        self.ring = FrameRing(self.ringSize(), self.imgHeight, self.imgWidth, self._bits // 8, pitch)
+        self._slotBufs = []
+        self._prepareSlots(self.ring.slots)
+        self._snapBuf = np.zeros(pitch * self.imgHeight, dtype=np.uint8)
+        self._snapTarget = None
+        self.stats.reset()
+
+    def _prepareSlots(self, slots):
+        """
+        [相机类] 各槽位的SDK写入目标只校验一次，取流时直接写入槽位内存
+        """
+        ring = self.ring
+        self._slotBufs.extend(
+            nncam.NncamImageBuffer(slot.raw, ring.width, ring.height, self._bits, ring.pitch) for slot in slots
+        )
+
+    def ringSize(self):
+        """
+        [相机类] 帧缓冲区所需槽位数：FRAME_SLOTS 加上已注册消费者最多借用的槽位数
+        """
+        return self.FRAME_SLOTS + sum(self._consumerSlots.values())
+
+    def addFrameConsumer(self, callback, slots=0):
+        """
+        [相机类] 注册动态帧消费者，帧缓冲区不足时在取流期间扩大，不停止取流
+
+        :param callback: 在相机线程中调用的 callback(slot)
+        :param slots: 该消费者最多同时借用的槽位数
+        """
+        self._consumerSlots[callback] = slots
+        if self.ring is not None and len(self.ring) < self.ringSize():
+            self.ring.grow(self.ringSize() - len(self.ring), self._prepareSlots)
+        self.frameConsumers.append(callback)
+
+    def removeFrameConsumer(self, callback):
+        """
+        [相机类] 移除动态帧消费者，帧缓冲区在下次切换模式时按需重新分配
+        """
+        if callback in self.frameConsumers:
+            self.frameConsumers.remove(callback)
+        self._consumerSlots.pop(callback, None)
+
+    def setMode(self, mode, roi=None):
+        """
+        [相机类] 运行时切换相机模式，期间短暂停止取流
+
+        :param mode: 模式名称，见 MODES
+        :param roi: 'roi' 模式下的ROI (x, y, 宽, 高)，预览分辨率坐标
+        :return: 0 为成功，-1 为失败
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown camera mode '{mode}', expected one of {tuple(self.MODES)}")
+        if self.MODES[mode][2] and roi is None:
+            raise ValueError(f"Camera mode '{mode}' requires a ROI")
+
+        self.mode = mode
+        self.roi = roi if self.MODES[mode][2] else None
+
+        if self.device:
+            try:
+                self.device.Stop()
+                self._applyMode()
+                self.device.StartPullModeWithCallback(self.eventCallBack, self)
+            except nncam.HRESULTException:
+                self.closeCamera()
+                return -1
+
+        self.modeChanged.emit()
+        return 0
+
+    @property
+    def origin(self):
+        """
+        [相机类] 当前图像左上角在预览分辨率坐标中的位置
+        """
+        return (self.roi[0], self.roi[1]) if self.roi is not None else (0, 0)
+
+    def hologramDisplayed(self, holoImg):
+        """
+        [相机类] 副屏显示的全息图更新，仿真相机据此渲染光阱
+        """
+        if self.device and hasattr(self.device, 'setHologram'):
+            self.device.setHologram(holoImg)
+
+    def snap(self, count=None, resolution=None, timeout=None):
+        """
+        [相机类] 异步抓取灰度静态帧
+
+        count 大于1时以 SnapN 连续抓取，在后台线程中平均以降低噪声。新的请求会取消尚未完成的请求。
+
+        :param count: 平均的帧数，默认 snapFrames
+        :param resolution: 分辨率序号，默认预览分辨率 RESOLUTION
+        :param timeout: 超时 (s)，超时后 Future 以 TimeoutError 结束，默认 snapTimeout
+        :return: concurrent.futures.Future，结果为 (高, 宽) uint8 灰度图
+        """
+        request = SnapRequest(
+            self.snapFrames if count is None else count,
+            self.RESOLUTION if resolution is None else resolution
+        )
+        if not self.device:
+            request.fail(RuntimeError("Camera is not opened"))
+            return request.future
+
+        with self._snapLock:
+            if self._snapRequest is not None:
+                self._snapRequest.future.cancel()
+                self._retireSnapRequest(self._snapRequest)
+            self._snapRequest = request
+
+        try:
+            if request.count == 1:
+                self.device.Snap(request.resolution)
+            else:
+                self.device.SnapN(request.resolution, request.count)
+        except nncam.HRESULTException as e:
+            self._dropSnapRequest(request, e)
+            return request.future
+
+        timer = threading.Timer(
+            self.snapTimeout if timeout is None else timeout, self._dropSnapRequest,
+            (request, TimeoutError(f"Snapshot of {request.count} frame(s) timed out"))
+        )
+        timer.daemon = True
+        timer.start()
+        request.future.add_done_callback(lambda _: timer.cancel())
+
+        return request.future
+
+    def _dropSnapRequest(self, request, exception):
+        """
+        [相机类] 以异常结束抓图请求，用于超时与关闭相机
+        """
+        with self._snapLock:
+            if self._snapRequest is request:
+                self._snapRequest = None
+                self._retireSnapRequest(request)
+        request.fail(exception)
+
+    def _retireSnapRequest(self, request):
+        """
+        [相机类] 记录作废请求尚未送达的静态帧，须持有 _snapLock 调用
+
+        相机不会中止已发出的 Snap/SnapN，其余帧在 snapTimeout 内到达时一律丢弃
+        """
+        self._staleStills += request.remaining
+        self._staleDeadline = time.perf_counter() + self.snapTimeout
+
     def closeCamera(self):
         """
         [相机类] 关闭相机硬件
@@ -74,7 +296,10 @@ class CameraMiddleware(QObject):
             self.device.Close()
 
         self.device = None
-        self._streamBuf = None
+
+        request = self._snapRequest
+        if request is not None:
+            self._dropSnapRequest(request, RuntimeError("Camera closed"))
 
     @staticmethod
     def eventCallBack(nEvent, self):
@@ -97,36 +322,69 @@ class CameraMiddleware(QObject):
 
     def dynamicFramesEvt(self):
         """
-        [相机类] 向UI线程推送动态帧
+        [相机类] 将动态帧直接拉取到环形缓冲区，分发给消费者，并限频生成预览帧
         """
+        slot = self.ring.claim()
+        if slot is None:
+            # 所有槽位均被借用，丢弃本帧
+            self.stats.countDrop('overrun')
+            return
+
         try:
-            self.device.PullImageV3(self._streamBuf, 0, 24, 0, None)
+            info = self.device.PullImageInto(self._slotBufs[slot.index], 0)
         except nncam.HRESULTException:
-            pass
+            self.ring.discard(slot)
+            self.stats.countDrop('pullError')
         else:
-            self.frame = QImage(
-                self._streamBuf, self.imgWidth, self.imgHeight, QImage.Format.Format_RGB888
-            )
-            self.frameUpdate.emit()
+            timestamp = info.timestamp / 1e6
+            self.ring.publish(slot, info.seq, timestamp, info.expotime, info.expogain)
+            self.stats.update(info.seq, timestamp, info.expotime, info.expogain)
+            for consumer in tuple(self.frameConsumers):
+                consumer(slot)
+            if self.preview.render(slot.image, time.perf_counter()):
+                self.frameUpdate.emit()
 
     def stillFrameEvt(self):
         """
-        [相机类] 向UI线程推送已抓取静态帧
+        [相机类] 静态帧交给未完成的抓图请求，否则向UI线程推送
         """
         info = nncam.NncamFrameInfoV3()
         try:
-            self.device.PullImageV3(None, 1, 24, 0, info)  # peek
+            self.device.PullImageV3(None, 1, self._bits, 0, info)  # peek
         except nncam.HRESULTException:
             pass
         else:
             if info.width > 0 and info.height > 0:
+                target = self._snapTarget
+                if target is None or (target.width, target.height) != (info.width, info.height):
+                    # 静态帧尺寸变化时才重新分配并校验
+                    pitch = nncam.TDIBWIDTHBYTES(info.width * self._bits)
+                    if self._snapBuf.size < pitch * info.height:
+                        self._snapBuf = np.zeros(pitch * info.height, dtype=np.uint8)
+                    target = self._snapTarget = nncam.NncamImageBuffer(
+                        self._snapBuf, info.width, info.height, self._bits, pitch
+                    )
                 try:
-                    self.device.PullImageV3(self._snapBuf, 1, 24, 0, info)
+                    self.device.PullImageInto(target, 1)
                 except nncam.HRESULTException:
                     pass
                 else:
-                    self.snapshot = np.frombuffer(self._snapBuf, np.uint8).reshape((info.height, info.width, 3))
-                    self.snapUpdate.emit()
+                    with self._snapLock:
+                        if self._staleStills > 0 and time.perf_counter() < self._staleDeadline:
+                            # 已作废请求的剩余帧，丢弃
+                            self._staleStills -= 1
+                            return
+                        self._staleStills = 0
+                        request = self._snapRequest
+                        if request is not None and request.take():
+                            self._snapRequest = None
+
+                    # 静态帧缓冲区会被下一帧覆盖，复制后交给后台线程或UI线程
+                    if request is not None:
+                        self._snapExecutor.submit(request.accumulate, target.image.copy())
+                    else:
+                        self.snapshot = target.image.copy()
+                        self.snapUpdate.emit()
 
     def expoUpdateEvt(self):
         """
@@ -0,0 +1,165 @@
+import threading
+import numpy as np
+
+
+class FrameSlot:
+    """
+    [帧缓冲] 环形缓冲区中的一帧
+
+    raw 为相机SDK直接写入的连续内存，image 为去除行填充后的 (高, 宽, 通道) 视图，二者共享内存。
+    消费者在回调之外继续使用本帧时需先 acquire()，用完后 release()，期间生产者不会覆盖本帧。
+
+    :var index: 槽位编号
+    :var raw: 按行距排列的原始缓冲区
+    :var image: 图像视图
+    :var seq: 帧序号，由相机给出
+    :var timestamp: 帧时间戳 (s)
+    :var expoTime: 曝光时间 (us)
+    :var expoGain: 增益
+    """
+
+    def __init__(self, ring, index, height, width, channels, pitch):
+        self.ring = ring
+        self.index = index
+        self.pitch = pitch
+        self.raw = np.zeros(height * pitch, dtype=np.uint8)
+        self.image = self.raw.reshape((height, pitch))[:, :width * channels].reshape((height, width, channels))
+        if channels == 1:
+            self.image = self.image[:, :, 0]
+
+        self.seq = -1
+        self.timestamp = 0.0
+        self.expoTime = 0
+        self.expoGain = 0
+        self._refs = 0
+
+    def __repr__(self):
+        return f"FrameSlot(index={self.index}, seq={self.seq})"
+
+    def acquire(self):
+        """
+        [帧缓冲] 借用本帧，借用期间不会被覆盖
+        """
+        self.ring.acquire(self)
+
+    def release(self):
+        """
+        [帧缓冲] 归还本帧
+        """
+        self.ring.release(self)
+
+
+class FrameRing:
+    """
+    [帧缓冲] 预分配的环形帧缓冲区
+
+    生产者 (相机线程) 以 claim() 取得空闲槽位，SDK写入后 publish() 发布为最新帧；
+    被借用或为最新帧的槽位不会被选中，所有槽位均不可用时丢弃该帧，生产者从不阻塞。
+    消费者以 borrow() 借用最新帧，无需复制。
+
+    :var slots: 槽位列表
+    :var overruns: 因无空闲槽位而丢弃的帧数
+    """
+
+    def __init__(self, size, height, width, channels=3, pitch=None):
+        if size < 2:
+            raise ValueError(f"Frame ring needs at least 2 slots, got {size}")
+
+        self.height = height
+        self.width = width
+        self.channels = channels
+        self.pitch = width * channels if pitch is None else pitch
+        self.slots = [FrameSlot(self, i, height, width, channels, self.pitch) for i in range(size)]
+        self.overruns = 0
+
+        self._lock = threading.Lock()
+        self._latest = None
+        self._next = 0
+
+    def __len__(self):
+        return len(self.slots)
+
+    def claim(self):
+        """
+        [帧缓冲] 取得一个可写入的空闲槽位
+
+        :return: 槽位，无空闲槽位时为None
+        """
+        with self._lock:
+            size = len(self.slots)
+            for k in range(size):
+                slot = self.slots[(self._next + k) % size]
+                if slot._refs == 0 and slot is not self._latest:
+                    self._next = (slot.index + 1) % size
+                    slot._refs = -1  # 写入中
+                    return slot
+
+            self.overruns += 1
+            return None
+
+    def publish(self, slot, seq, timestamp, expoTime=0, expoGain=0):
+        """
+        [帧缓冲] 写入完成，发布为最新帧
+        """
+        with self._lock:
+            slot.seq = seq
+            slot.timestamp = timestamp
+            slot.expoTime = expoTime
+            slot.expoGain = expoGain
+            slot._refs = 0
+            self._latest = slot
+
+    def discard(self, slot):
+        """
+        [帧缓冲] 放弃写入失败的槽位
+        """
+        with self._lock:
+            slot._refs = 0
+
+    def grow(self, count, prepare=None):
+        """
+        [帧缓冲] 增加槽位，可在取流期间调用
+
+        :param count: 增加的槽位数
+        :param prepare: 新槽位可被 claim() 选中之前的回调 prepare(slots)，用于准备SDK写入目标
+        :return: 新槽位列表
+        """
+        start = len(self.slots)
+        slots = [
+            FrameSlot(self, start + i, self.height, self.width, self.channels, self.pitch) for i in range(count)
+        ]
+        if prepare is not None:
+            prepare(slots)
+        with self._lock:
+            self.slots.extend(slots)
+        return slots
+
+    def latest(self):
+        """
+        [帧缓冲] 最新帧，不借用，仅可在相机线程的回调中直接使用
+        """
+        return self._latest
+
+    def borrow(self):
+        """
+        [帧缓冲] 借用最新帧，用完后需 release()
+
+        :return: 槽位，尚无帧时为None
+        """
+        with self._lock:
+            slot = self._latest
+            if slot is not None:
+                slot._refs += 1
+            return slot
+
+    def acquire(self, slot):
+        with self._lock:
+            if slot._refs < 0:
+                raise RuntimeError(f"{slot} is being written")
+            slot._refs += 1
+
+    def release(self, slot):
+        with self._lock:
+            if slot._refs <= 0:
+                raise RuntimeError(f"{slot} released more times than borrowed")
+            slot._refs -= 1
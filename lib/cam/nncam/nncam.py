@@ -7,6 +7,7 @@ See them in the 'doc' directory:
    (2) hans.html, Simplified Chinese
 """
 import sys, ctypes, os.path
+import numpy
 
 NNCAM_MAX = 128
 
@@ -493,6 +494,64 @@ class NncamFrameInfoV2:
         self.seq = 0                     # frame sequence number
         self.timestamp = 0               # microsecond
 
+class NncamImageBuffer:
+    """
+    Destination of Nncam.PullImageInto(): any writable buffer-protocol object (numpy.ndarray, bytearray, mmap,
+    multiprocessing.shared_memory.SharedMemory.buf, ...), validated once for a fixed image geometry and reused for every pull.
+    Accepted layouts:
+        (1) 1-D bytes, rows are rowPitch apart. rowPitch = 0 means TDIBWIDTHBYTES(width * bits), -1 means zero padding
+        (2) (height, width) for Grey8/Grey16, or (height, width, channels) for RGB,
+            pixels packed inside each row, rows strides[0] apart (rowPitch is ignored)
+    image: (height, width) or (height, width, bytes per pixel) view of the pixels, sharing memory with the buffer
+    """
+    def __init__(self, buf, width, height, bits, rowPitch=0):
+        try:
+            view = numpy.asarray(memoryview(buf))
+        except TypeError:
+            raise TypeError('buffer must support the buffer protocol, got {}'.format(type(buf).__name__)) from None
+        if not view.flags.writeable:
+            raise ValueError('buffer is read-only')
+        if width <= 0 or height <= 0 or bits % 8 != 0 or bits <= 0:
+            raise ValueError('invalid image geometry {}x{}, {} bits'.format(width, height, bits))
+
+        pixelBytes = bits // 8
+        rowBytes = width * pixelBytes
+        if view.ndim == 1:
+            if view.strides[0] != view.itemsize:
+                raise ValueError('1-D buffer must be contiguous')
+            if rowPitch == 0:
+                rowPitch = TDIBWIDTHBYTES(width * bits)
+            elif rowPitch == -1:
+                rowPitch = rowBytes
+            if rowPitch < rowBytes:
+                raise ValueError('row pitch {} is smaller than a row of {} bytes'.format(rowPitch, rowBytes))
+            if view.nbytes < rowPitch * (height - 1) + rowBytes:
+                raise ValueError('buffer of {} bytes is too small for {}x{} at row pitch {}'.format(view.nbytes, width, height, rowPitch))
+            raw = view.view(numpy.uint8)[:rowPitch * (height - 1) + rowBytes]
+            image = numpy.lib.stride_tricks.as_strided(raw, (height, width, pixelBytes), (rowPitch, pixelBytes, 1), writeable=True)
+            if pixelBytes == 1:
+                image = image[:, :, 0]
+        elif view.ndim in (2, 3):
+            if view.shape[:2] != (height, width):
+                raise ValueError('buffer shape {} does not match {}x{}'.format(view.shape, width, height))
+            packed = view.itemsize if view.ndim == 2 else view.shape[2] * view.itemsize
+            if packed != pixelBytes or view.strides[1] != packed or (view.ndim == 3 and view.strides[2] != view.itemsize):
+                raise ValueError('pixels of a {} bits image must be packed in each row, got shape {} strides {}'.format(bits, view.shape, view.strides))
+            rowPitch = view.strides[0]
+            if rowPitch < rowBytes:
+                raise ValueError('row stride {} is smaller than a row of {} bytes'.format(rowPitch, rowBytes))
+            image = view
+        else:
+            raise ValueError('buffer must be 1-D, 2-D or 3-D, got {}-D'.format(view.ndim))
+
+        self.obj = buf                   # keep the exporter alive
+        self.image = image
+        self.width = width
+        self.height = height
+        self.bits = bits
+        self.rowPitch = rowPitch
+        self.ptr = ctypes.c_void_p(view.ctypes.data)
+
 class NncamModelV2:                    # camera model v2
     def __init__(self, name, flag, maxspeed, preview, still, maxfanspeed, ioctrol, xpixsz, ypixsz, res):
         self.name = name                 # model name, in Windows, we use unicode
@@ -682,6 +741,8 @@ class Nncam:
         self.__fun = None
         self.__ctx = None
         self.__cb = None
+        self.__frameInfoV3 = self.__FrameInfoV3()
+        self.__pFrameInfoV3 = ctypes.pointer(self.__frameInfoV3)
 
     def __del__(self):
         self.Close()
@@ -819,6 +880,15 @@ class Nncam:
             self.__lib.Nncam_PullImageV3(self.__h, pImageData, bStill, bits, rowPitch, ctypes.byref(x))
             self.__convertFrameInfoV3(pInfo, x)
 
+    def PullImageInto(self, buffer, bStill=0):
+        """
+        Pull an image straight into a NncamImageBuffer, no allocation per call.
+        Make sure the buffer matches the size of the image to pull: get_FinalSize() for video, the still resolution for still images.
+        Returns the frame info (same fields as NncamFrameInfoV3), owned by this object and overwritten by the next call.
+        """
+        self.__lib.Nncam_PullImageV3(self.__h, buffer.ptr, bStill, buffer.bits, buffer.rowPitch, self.__pFrameInfoV3)
+        return self.__frameInfoV3
+
     def PullImageV2(self, pImageData, bits, pInfo):
         if pInfo is None:
             self.__lib.Nncam_PullImageV2(self.__h, pImageData, bits, None)
@@ -1589,7 +1659,7 @@ class Nncam:
             cls.__lib.Nncam_StartPullModeWithCallback.argtypes = [ctypes.c_void_p, cls.__EVENT_CALLBACK, ctypes.py_object]
             cls.__lib.Nncam_PullImageV3.restype = ctypes.c_int
             cls.__lib.Nncam_PullImageV3.errcheck = cls.__errcheck
-            cls.__lib.Nncam_PullImageV3.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.POINTER(cls.__FrameInfoV3)]
+            cls.__lib.Nncam_PullImageV3.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.POINTER(cls.__FrameInfoV3)]
             cls.__lib.Nncam_PullImageV2.restype = ctypes.c_int
             cls.__lib.Nncam_PullImageV2.errcheck = cls.__errcheck
             cls.__lib.Nncam_PullImageV2.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int, ctypes.POINTER(cls.__FrameInfoV2)]
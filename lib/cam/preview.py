@@ -0,0 +1,83 @@
+import threading
+import cv2
+import numpy as np
+
+
+class PreviewBuffer:
+    """
+    [预览] 相机线程缩放、UI线程显示的三缓冲预览帧
+
+    相机线程按设定间隔将帧缩放到预览尺寸，写入复用的后台缓冲区后与待显示缓冲区交换；
+    UI线程以 take() 取走最新的待显示帧。UI线程未及时取走时，新帧直接替换旧帧，不会排队。
+
+    :var interval: 最小刷新间隔 (s)
+    :var rendered: 已缩放的帧数
+    :var replaced: 未被显示即被替换的帧数
+    """
+
+    def __init__(self, interval=1 / 30, interpolation=cv2.INTER_NEAREST):
+        self.interval = interval
+        self.interpolation = interpolation
+        self.rendered = 0
+        self.replaced = 0
+
+        self._target = None
+        self._bufs = [None, None, None]
+        self._back, self._ready, self._front = 0, 1, 2
+        self._fresh = False
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def setTarget(self, width, height):
+        """
+        [预览] 设置预览区域尺寸，图像按比例缩放至其中
+        """
+        self._target = (width, height) if width > 0 and height > 0 else None
+
+    def render(self, image, timestamp) -> bool:
+        """
+        [预览] 缩放一帧，由相机线程调用
+
+        :param image: 相机图像，灰度或RGB
+        :param timestamp: 当前时间 (s)
+        :return: 是否需要通知UI线程，已有未取走的帧时不再重复通知
+        """
+        target = self._target
+        if target is None or timestamp - self._last < self.interval:
+            return False
+        self._last = timestamp
+
+        height, width = image.shape[:2]
+        k = min(target[0] / width, target[1] / height)
+        size = (max(int(width * k), 1), max(int(height * k), 1))
+        shape = (size[1], size[0]) + image.shape[2:]
+
+        back = self._bufs[self._back]
+        if back is None or back.shape != shape:
+            back = self._bufs[self._back] = np.empty(shape, dtype=np.uint8)
+        cv2.resize(image, size, dst=back, interpolation=self.interpolation)
+        self.rendered += 1
+
+        with self._lock:
+            self._back, self._ready = self._ready, self._back
+            notify = not self._fresh
+            if self._fresh:
+                self.replaced += 1
+            self._fresh = True
+
+        return notify
+
+    def take(self):
+        """
+        [预览] 取走最新的预览帧，由UI线程调用
+
+        返回的数组在下一次 take() 前保持有效
+
+        :return: 预览图像，无新帧时为None
+        """
+        with self._lock:
+            if not self._fresh:
+                return None
+            self._ready, self._front = self._front, self._ready
+            self._fresh = False
+            return self._bufs[self._front]
@@ -0,0 +1,159 @@
+import os
+import struct
+import threading
+from collections import deque
+import numpy as np
+from PyQt6.QtCore import QThread
+
+
+MAGIC = b'HOTREC01'
+# 文件头：标识、高、宽、通道数、容量、已写帧数，补齐到64字节
+HEADER = struct.Struct('<8sIIIQQ')
+HEADER_SIZE = 64
+
+
+def recordDtype(height, width, channels):
+    """
+    [录制] 单帧记录的结构：帧头 (序号、时间戳 us) + 像素数据
+    """
+    shape = (height, width) if channels == 1 else (height, width, channels)
+    return np.dtype([('seq', '<i8'), ('timestamp', '<i8'), ('pixels', np.uint8, shape)])
+
+
+class FrameRecorder(QThread):
+    """
+    [录制] 相机视频流的异步原始格式录制
+
+    录制文件按容量预分配并以内存映射方式写入。相机线程通过 submit() 借用帧缓冲槽位后立即返回，
+    写入线程将像素复制到映射区域后归还槽位，不阻塞相机线程与UI线程。
+    待写入的槽位超过 maxPending 或文件写满时丢弃新帧并计数。
+
+    :var path: 录制文件路径
+    :var capacity: 最大帧数
+    :var written: 已写入帧数
+    :var dropped: 丢弃帧数
+    :var stats: 因写入不及时丢弃的帧同时计入的视频流统计 (lib.cam.streamStats.StreamStats)，None为不计入
+    """
+
+    dropSource = 'recorder'
+
+    def __init__(self, path, height, width, channels, capacity, maxPending=3):
+        super().__init__()
+        self.path = path
+        self.capacity = capacity
+        self.maxPending = maxPending
+        self.written = 0
+        self.dropped = 0
+        self.stats = None
+
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, height, width, channels, capacity, 0).ljust(HEADER_SIZE, b'\0'))
+        self._records = np.memmap(
+            path, dtype=recordDtype(height, width, channels), mode='r+', offset=HEADER_SIZE, shape=(capacity,)
+        )
+        self._itemsize = self._records.dtype.itemsize
+
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._running = True
+
+    @property
+    def maxSlots(self):
+        """
+        [录制] 最多同时借用的帧缓冲槽位数：待写入的 maxPending 个与写入中的一个
+        """
+        return self.maxPending + 1
+
+    def submit(self, slot):
+        """
+        [录制] 提交一帧，由相机线程调用
+        """
+        with self._cond:
+            if not self._running or len(self._queue) >= self.maxPending or \
+                    self.written + len(self._queue) >= self.capacity:
+                self.dropped += 1
+                # 文件写满或已停止不算视频流丢帧
+                if self.stats is not None and self._running and len(self._queue) >= self.maxPending:
+                    self.stats.countDrop(self.dropSource)
+                return
+
+            slot.acquire()
+            self._queue.append(slot)
+            self._cond.notify()
+
+    def requestStop(self):
+        """
+        [录制] 停止接收新帧，写完已提交的帧后退出
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+    def stop(self):
+        """
+        [录制] 停止录制并等待文件写完
+        """
+        self.requestStop()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._queue and self._running:
+                    self._cond.wait()
+                if not self._queue:
+                    break
+                slot = self._queue.popleft()
+
+            try:
+                i = self.written
+                self._records['seq'][i] = slot.seq
+                self._records['timestamp'][i] = int(slot.timestamp * 1e6)
+                np.copyto(self._records['pixels'][i], slot.image)
+            finally:
+                slot.release()
+            self.written += 1
+
+        self._finalize()
+
+    def _finalize(self):
+        """
+        写入帧数，截去未使用的预分配空间
+        """
+        self._records.flush()
+        # 释放映射后才能在Windows下截断文件
+        del self._records
+
+        with open(self.path, 'r+b') as f:
+            f.seek(HEADER.size - 8)
+            f.write(struct.pack('<Q', self.written))
+        os.truncate(self.path, HEADER_SIZE + self.written * self._itemsize)
+
+
+class RawRecording:
+    """
+    [录制] 读取原始格式录制文件，以内存映射的NumPy视图访问
+
+    :var frames: (N, 高, 宽[, 通道]) 帧视图
+    :var seq: (N,) 帧序号
+    :var timestamps: (N,) 时间戳 (s)
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            magic, height, width, channels, capacity, count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a raw recording")
+
+        self.path = path
+        dtype = recordDtype(height, width, channels)
+        if count > 0:
+            self.records = np.memmap(path, dtype=dtype, mode='r', offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=dtype)
+        self.frames = self.records['pixels']
+        self.seq = self.records['seq']
+        self.timestamps = self.records['timestamp'] / 1e6
+
+    def __len__(self):
+        return len(self.records)
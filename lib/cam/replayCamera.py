@@ -0,0 +1,130 @@
+import time
+from pathlib import Path
+import cv2
+import numpy as np
+from lib.cam.virtualCamera import VirtualCamera
+from lib.cam.recorder import RawRecording
+
+
+class ReplayCamera(VirtualCamera):
+    """
+    [回放相机] 从录制文件回放相机帧
+
+    以 CameraMiddleware 的接口推送录制的帧，用于在相同输入上反复测试识别、跟踪与规划。
+    realtime 为True时按录制时间戳的间隔推送，否则尽快推送；loop 为True时循环回放。
+    录制时丢弃的帧在回放时同样表现为帧序号的间断。
+
+    支持的文件：
+    .npy (N, 高, 宽[, 3]) 帧序列，以内存映射方式读取，按 fps 生成时间戳；
+    .npz 含 frames 与可选的 timestamps (s)、seq；
+    .rec 原始格式录制文件，见 lib.cam.recorder，帧序号与时间戳均为录制值；
+    图像目录，按文件名排序，按 fps 生成时间戳。
+
+    :var source: 录制文件路径
+    :var realtime: 是否按录制时间推送
+    :var loop: 是否循环回放
+    :var fps: 无时间戳时使用的帧率
+    """
+
+    IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+    source = None
+    realtime = True
+    loop = False
+    fps = 30
+
+    def __init__(self):
+        super().__init__()
+        self._frames, self._timestamps, self._seq = self.load(self.source, self.fps)
+        height, width = self._frames[0].shape[:2]
+        # 各分辨率序号均为录制尺寸，与 CameraMiddleware 的分辨率设置兼容
+        self.RESOLUTIONS = [(width, height)] * 3
+        self.PREVIEW = 2
+        self._eSize = self.PREVIEW
+
+        self._index = 0
+        self._startTime = None
+
+    @classmethod
+    def load(cls, source, fps=30):
+        """
+        [回放相机] 读取录制文件
+
+        :param source: 录制文件或图像目录
+        :param fps: 无时间戳时使用的帧率
+        :return: (可按序号索引的帧序列, (N,) 时间戳 s, (N,) 帧序号)，无记录时帧序号为连续编号
+        """
+        if source is None:
+            raise ValueError("No replay source given")
+
+        path = Path(source)
+        timestamps = None
+        seq = None
+        if path.is_dir():
+            files = sorted(p for p in path.iterdir() if p.suffix.lower() in cls.IMAGE_SUFFIXES)
+            frames = _ImageSequence(files)
+        elif path.suffix == '.npy':
+            frames = np.load(path, mmap_mode='r')
+        elif path.suffix == '.rec':
+            recording = RawRecording(path)
+            frames, timestamps, seq = recording.frames, recording.timestamps, recording.seq
+        elif path.suffix == '.npz':
+            data = np.load(path)
+            frames = data['frames']
+            if 'timestamps' in data:
+                timestamps = np.asarray(data['timestamps'], dtype=np.float64)
+            if 'seq' in data:
+                seq = np.asarray(data['seq'], dtype=np.int64)
+        else:
+            raise ValueError(f"Unsupported replay source '{source}'")
+
+        if len(frames) == 0:
+            raise ValueError(f"Replay source '{source}' contains no frames")
+        if timestamps is None:
+            timestamps = np.arange(len(frames)) / fps
+        if seq is None:
+            seq = np.arange(len(frames))
+
+        return frames, timestamps, seq
+
+    def _nextFrame(self):
+        if self._index >= len(self._frames):
+            if not self.loop:
+                return None
+            self._index = 0
+            self._startTime = None
+
+        index = self._index
+        self._index += 1
+        timestamp = self._timestamps[index]
+
+        due = None
+        if self.realtime:
+            # 以录制时间戳的相对间隔推送，切换模式后从当前帧重新计时
+            if self._startTime is None:
+                self._startTime = time.perf_counter() - (timestamp - self._timestamps[0])
+            due = self._startTime + (timestamp - self._timestamps[0])
+
+        return np.asarray(self._frames[index]), int(self._seq[index]), int(timestamp * 1e6), due
+
+    def Stop(self):
+        super().Stop()
+        self._startTime = None
+
+
+class _ImageSequence:
+    """
+    按需读取的图像文件序列
+    """
+
+    def __init__(self, files):
+        self.files = files
+
+    def __len__(self):
+        return len(self.files)
+
+    def __getitem__(self, index):
+        image = cv2.imread(str(self.files[index]), cv2.IMREAD_UNCHANGED)
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGRA2RGB if image.shape[2] == 4 else cv2.COLOR_BGR2RGB)
+        return image
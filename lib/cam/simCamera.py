@@ -0,0 +1,242 @@
+import time
+import hashlib
+import threading
+import collections
+import cv2
+import numpy as np
+from lib.cam.virtualCamera import VirtualCamera
+from lib.holo.libHoloEssential import Holo
+from lib.utils.camSlmMapping import CamSlmMapping
+from lib.utils.spotDetect import ComponentsDetector
+
+
+class SimCamera(VirtualCamera):
+    """
+    [仿真相机] 以光学正向模型渲染图像的仿真相机
+
+    以 Holo.reconstruct 重建当前显示的全息图得到光阱光强分布，经相机-SLM映射投影到相机平面，
+    叠加粒子、模糊与噪声后按设定帧率推送。光阱捕获范围内的粒子逐帧向光阱中心移动，
+    可在无显微镜的情况下运行 抓图-识别-规划-计算-显示 全流程。
+    全息图的重建在独立线程中进行，只处理最新一帧，不占用UI线程与取流线程；
+    最近重建过的全息图按内容缓存，再次显示时立即换入，交替显示的测试图样不受重建耗时影响。
+
+    :var beadCount: 随机生成的粒子数，beads 为None时使用
+    :var beads: (N, 2) 粒子初始位置，预览分辨率坐标
+    :var fps: 帧率
+    :var noise: 噪声标准差 (灰度级)
+    :var blur: 高斯模糊标准差 (像素)
+    :var responseDelay: 全息图更新到液晶开始响应的延迟 (s)，模拟显示链路延迟
+    :var responseTime: 液晶响应的时间常数 (s)，光阱光强按指数过渡到新全息图，0为立即切换
+    :var cacheSize: 缓存的全息图重建结果数
+    """
+
+    # 分辨率序号 → (宽, 高)，序号2为 CameraMiddleware 的预览分辨率
+    RESOLUTIONS = [(5472, 3648), (2736, 1824), (1824, 1216)]
+    PREVIEW = 2
+
+    beadCount = 30
+    beads = None
+    beadRadius = 8
+    beadLevel = 150
+    backgroundLevel = 40
+    trapLevel = 220
+    fps = 30
+    noise = 3.0
+    blur = 1.5
+    captureRadius = 25
+    trapSpeed = 2.0
+    brownian = 0.3
+    zerothOrder = (844, 674)
+    distance = 50
+    wavelength = 532e-6
+    responseDelay = 0.0
+    responseTime = 0.0
+    cacheSize = 4
+    seed = 0
+
+    def __init__(self):
+        super().__init__()
+        width, height = self.RESOLUTIONS[self.PREVIEW]
+        self._rng = np.random.default_rng(self.seed)
+        if self.beads is None:
+            self._beads = self._rng.uniform((100, 100), (width - 100, height - 100), (self.beadCount, 2))
+        else:
+            self._beads = np.array(self.beads, dtype=np.float64).reshape(-1, 2)
+
+        # 静态场景：背景光照与光阱光强，光阱随全息图更新
+        yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+        r2 = ((xx - width / 2) ** 2 + (yy - height / 2) ** 2) / (width / 2) ** 2
+        self._illumination = (self.backgroundLevel * (1.2 - 0.4 * r2)).astype(np.float32)
+        # 光阱光强的过渡：(切换前光强, 切换后光强, 切换时刻 perf_counter s)
+        self._trap = (None, None, 0)
+        self._traps = np.zeros((0, 2), dtype=np.float64)
+        self._noiseBuf = np.zeros((height, width), dtype=np.float32)
+
+        self._seq = 0
+        self._deadline = None
+
+        # 待重建的全息图：(全息图, 显示时刻 perf_counter s)
+        self._holoCond = threading.Condition()
+        self._holoPending = None
+        self._holoThread = None
+        # 全息图内容摘要 → (光阱光强, 光阱中心)，最近使用的在末尾
+        self._reconstructions = collections.OrderedDict()
+        self._closed = False
+
+    # ==== 场景 ====
+
+    def setHologram(self, holoImg):
+        """
+        [仿真相机] 更新当前显示的全息图，由重建线程重建光阱光强并投影到相机平面
+
+        仅记录全息图与显示时刻后立即返回；重建完成前显示的下一帧会替换尚未重建的全息图。
+
+        :param holoImg: 副屏显示的全息图 (已顺时针旋转90°的8位相位图)，None为关闭光阱
+        """
+        with self._holoCond:
+            if self._closed:
+                return
+            self._holoPending = (holoImg, time.perf_counter())
+            if self._holoThread is None:
+                self._holoThread = threading.Thread(target=self._reconstructLoop, daemon=True)
+                self._holoThread.start()
+            self._holoCond.notify()
+
+    def _reconstructLoop(self):
+        while True:
+            with self._holoCond:
+                while self._holoPending is None and not self._closed:
+                    self._holoCond.wait()
+                if self._closed:
+                    break
+                holoImg, switchTime = self._holoPending
+                self._holoPending = None
+
+            self._applyHologram(holoImg, switchTime)
+
+    def _applyHologram(self, holoImg, switchTime):
+        """
+        重建光阱光强，以显示时刻作为液晶开始切换的时刻换入，在重建线程中调用
+        """
+        if holoImg is None:
+            self._trap = (self._trapAt(switchTime), None, switchTime)
+            self._traps = np.zeros((0, 2), dtype=np.float64)
+            return
+
+        key = hashlib.blake2b(np.ascontiguousarray(holoImg), digest_size=16).digest()
+        cached = self._reconstructions.get(key)
+        if cached is None:
+            cached = self._reconstruct(holoImg)
+            self._reconstructions[key] = cached
+            while len(self._reconstructions) > self.cacheSize:
+                self._reconstructions.popitem(last=False)
+        else:
+            self._reconstructions.move_to_end(key)
+
+        # 重建耗时较长时，重建期间已渲染的帧仍为旧光阱
+        trapImg, traps = cached
+        self._trap = (self._trapAt(switchTime), trapImg, switchTime)
+        self._traps = traps
+
+    def _reconstruct(self, holoImg):
+        """
+        重建全息图的光阱光强并投影到相机平面
+
+        :return: (相机平面光阱光强, (N, 2) 光阱中心)
+        """
+        width, height = self.RESOLUTIONS[self.PREVIEW]
+        phase = cv2.rotate(holoImg, cv2.ROTATE_90_COUNTERCLOCKWISE).astype(np.float64) / 255 * 2 * np.pi
+        reconstructA = np.abs(Holo.reconstruct(np.exp(1j * phase), self.distance, self.wavelength))
+        intensity = (reconstructA / reconstructA.max()) ** 2
+
+        # 目标图平面 → 相机平面
+        mapping = CamSlmMapping(self.zerothOrder, (height, width), slmSize=intensity.shape[0])
+        trapImg = cv2.warpAffine(
+            intensity.astype(np.float32), mapping.matrix, (width, height),
+            flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP
+        )
+        traps = ComponentsDetector(thresh=64, minArea=1).detect((trapImg * 255).astype(np.uint8))
+
+        return trapImg * self.trapLevel, traps[:, :2]
+
+    def Close(self):
+        with self._holoCond:
+            self._closed = True
+            self._holoCond.notify()
+        super().Close()
+
+    def _trapAt(self, t):
+        """
+        t 时刻的光阱光强，液晶响应过程中为新旧光强的指数过渡
+        """
+        previous, current, switchTime = self._trap
+        elapsed = t - switchTime - self.responseDelay
+        if elapsed < 0:
+            return previous
+        if self.responseTime <= 0 or elapsed > 10 * self.responseTime:
+            return current
+
+        k = np.float32(1 - np.exp(-elapsed / self.responseTime))
+        if previous is None and current is None:
+            return None
+        if previous is None:
+            return current * k
+        if current is None:
+            return previous * (1 - k)
+        return previous + (current - previous) * k
+
+    def _step(self, dt):
+        """
+        光阱捕获范围内的粒子向光阱中心移动，并叠加布朗运动
+        """
+        beads = self._beads
+        if len(self._traps) and len(beads):
+            diff = self._traps[None, :, :] - beads[:, None, :]
+            dist = np.linalg.norm(diff, axis=2)
+            nearest = np.argmin(dist, axis=1)
+            rows = np.arange(len(beads))
+            d = dist[rows, nearest]
+            captured = d < self.captureRadius
+            move = np.minimum(d, self.trapSpeed * self.fps * dt) / np.maximum(d, 1e-9)
+            beads[captured] += diff[rows, nearest][captured] * move[captured, None]
+
+        beads += self._rng.normal(0, self.brownian, beads.shape)
+
+    def _render(self, t):
+        """
+        渲染 t 时刻预览分辨率下的灰度图像
+        """
+        image = self._illumination.copy()
+        trapImg = self._trapAt(t)
+        if trapImg is not None:
+            image += trapImg
+
+        # 粒子以亚像素精度绘制
+        shift = 4
+        for x, y in np.round(self._beads * (1 << shift)).astype(int):
+            cv2.circle(image, (int(x), int(y)), self.beadRadius << shift, self.beadLevel, -1, cv2.LINE_AA, shift)
+
+        if self.blur > 0:
+            cv2.GaussianBlur(image, (0, 0), self.blur, dst=image)
+
+        image *= self._expoTime / 20000
+        if self.noise > 0:
+            cv2.randn(self._noiseBuf, 0, self.noise)
+            image += self._noiseBuf
+
+        return np.clip(image, 0, 255).astype(np.uint8)
+
+    def _nextFrame(self):
+        interval = 1 / self.fps
+        now = time.perf_counter()
+        if self._deadline is None:
+            self._deadline = now
+        # 渲染跟不上时不累积欠帧
+        self._deadline = max(self._deadline + interval, now)
+
+        self._step(interval)
+        image = self._render(self._deadline)
+        seq = self._seq
+        self._seq += 1
+
+        return image, seq, int(self._deadline * 1e6), self._deadline
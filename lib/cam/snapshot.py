@@ -0,0 +1,82 @@
+import threading
+from concurrent.futures import Future
+import cv2
+import numpy as np
+
+
+class SnapRequest:
+    """
+    [抓图] 一次异步抓图请求，结果为 count 帧静态帧平均后的8位灰度图
+
+    相机线程以 take() 领取静态帧并复制，平均在后台线程的 accumulate() 中进行；
+    结果、超时与取消均通过 future 通知，可在任意线程等待。
+
+    :var future: concurrent.futures.Future，结果为 (高, 宽) uint8 灰度图
+    :var count: 平均的帧数
+    :var resolution: 分辨率序号
+    """
+
+    def __init__(self, count, resolution):
+        if count < 1:
+            raise ValueError(f"Snapshot needs at least 1 frame, got {count}")
+
+        self.future = Future()
+        self.count = count
+        self.resolution = resolution
+        self._taken = 0
+        self._received = 0
+        self._acc = None
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        """
+        [抓图] 领取一帧，由相机线程调用
+
+        :return: 是否为最后一帧
+        """
+        self._taken += 1
+        return self._taken >= self.count
+
+    @property
+    def remaining(self) -> int:
+        """
+        [抓图] 尚未领取的帧数，即相机仍会送达的本次连拍帧数
+        """
+        return max(self.count - self._taken, 0)
+
+    def accumulate(self, frame):
+        """
+        [抓图] 转换为灰度并累加一帧，在后台线程中调用，收齐后给出结果
+
+        :param frame: 静态帧副本，灰度或RGB
+        """
+        if self.future.done():
+            return
+
+        try:
+            gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+            if self.count == 1:
+                self.finish(gray)
+                return
+
+            if self._acc is None:
+                self._acc = np.zeros(gray.shape, dtype=np.float32)
+            elif self._acc.shape != gray.shape:
+                raise ValueError(f"Snapshot frame size changed from {self._acc.shape} to {gray.shape}")
+            cv2.accumulate(gray, self._acc)
+            self._received += 1
+
+            if self._received == self.count:
+                self.finish(cv2.convertScaleAbs(self._acc, alpha=1 / self.count))
+        except Exception as e:
+            self.fail(e)
+
+    def finish(self, image):
+        with self._lock:
+            if not self.future.done():
+                self.future.set_result(image)
+
+    def fail(self, exception):
+        with self._lock:
+            if not self.future.done():
+                self.future.set_exception(exception)
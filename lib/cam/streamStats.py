@@ -0,0 +1,107 @@
+import threading
+from collections import deque
+import numpy as np
+
+
+class StreamStats:
+    """
+    [相机统计] 视频流的帧率、帧间隔抖动与丢帧统计
+
+    相机线程每收到一帧调用 update()，按相机给出的帧序号与时间戳统计，不受回调调度延迟影响。
+    帧序号不连续的部分计为相机端丢帧 (传输或SDK缓冲区溢出)；程序端因无空闲缓冲区或拉取失败
+    而丢弃的帧分别计入 overruns 与 pullErrors，消费者 (跟踪、背景学习、录制) 处理不及时而丢弃的帧
+    按来源计入 consumerDrops，均由 countDrop() 计数。计数可在任意线程读取。
+
+    :var window: 统计帧率与抖动所用的最近帧间隔数
+    :var frames: 收到的帧数
+    :var skipped: 相机端丢帧数，由帧序号的间断得到
+    :var overruns: 因无空闲缓冲区而丢弃的帧数
+    :var pullErrors: 拉取失败的帧数
+    :var consumerDrops: 各消费者丢弃的帧数 {来源: 帧数}
+    :var expoTime: 最新帧的曝光时间 (us)
+    :var expoGain: 最新帧的增益
+    """
+
+    SEQ_MOD = 1 << 32  # 帧序号为32位无符号整数
+
+    def __init__(self, window=120):
+        self.window = window
+        self._lock = threading.Lock()
+        self._intervals = deque(maxlen=window)
+        self.reset()
+
+    def reset(self):
+        """
+        [相机统计] 清空统计，切换相机模式或重新开始取流时调用
+        """
+        with self._lock:
+            self._intervals.clear()
+            self._lastSeq = None
+            self._lastTime = None
+            self.frames = 0
+            self.skipped = 0
+            self.overruns = 0
+            self.pullErrors = 0
+            self.consumerDrops = {}
+            self.expoTime = 0
+            self.expoGain = 0
+
+    def update(self, seq, timestamp, expoTime=0, expoGain=0):
+        """
+        [相机统计] 记录一帧，由相机线程调用
+
+        :param seq: 帧序号
+        :param timestamp: 帧时间戳 (s)
+        :param expoTime: 曝光时间 (us)
+        :param expoGain: 增益
+        """
+        with self._lock:
+            if self._lastSeq is not None:
+                gap = (seq - self._lastSeq) % self.SEQ_MOD
+                # 序号重新开始 (如回放循环) 时不计丢帧与间隔
+                if 0 < gap < self.SEQ_MOD // 2:
+                    self.skipped += gap - 1
+                    interval = timestamp - self._lastTime
+                    if interval > 0:
+                        self._intervals.append(interval)
+
+            self._lastSeq = seq
+            self._lastTime = timestamp
+            self.frames += 1
+            self.expoTime = expoTime
+            self.expoGain = expoGain
+
+    def countDrop(self, source):
+        """
+        [相机统计] 记录一帧程序端丢帧，可在任意线程调用
+
+        :param source: 'overrun' 为无空闲缓冲区，'pullError' 为拉取失败，其余为消费者名称
+        """
+        with self._lock:
+            if source == 'overrun':
+                self.overruns += 1
+            elif source == 'pullError':
+                self.pullErrors += 1
+            else:
+                self.consumerDrops[source] = self.consumerDrops.get(source, 0) + 1
+
+    def rates(self):
+        """
+        [相机统计] 最近帧间隔的统计
+
+        :return: (帧率 fps, 帧间隔抖动 (标准差) s)，帧数不足时均为0
+        """
+        with self._lock:
+            if len(self._intervals) < 2:
+                return 0, 0
+            intervals = np.fromiter(self._intervals, dtype=np.float64, count=len(self._intervals))
+
+        return 1 / intervals.mean(), intervals.std()
+
+    @property
+    def dropped(self):
+        """
+        [相机统计] 丢帧总数，包括相机端丢帧、无空闲缓冲区、拉取失败与消费者丢帧
+        """
+        with self._lock:
+            return self.skipped + self.overruns + self.pullErrors + sum(self.consumerDrops.values())
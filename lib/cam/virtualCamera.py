@@ -0,0 +1,227 @@
+import abc
+import time
+import collections
+import ctypes
+import threading
+import cv2
+from lib.cam.nncam import nncam
+
+
+class VirtualCamera(abc.ABC):
+    """
+    [虚拟相机] 软件相机的公共部分
+
+    实现 CameraMiddleware 所用的 nncam.Nncam 接口子集 (拉模式回调、PullImageV3、抓图、分辨率/ROI/合并、
+    曝光与帧率统计)，可直接作为 CameraMiddleware.backend 使用。子类实现 _nextFrame() 提供图像。
+
+    :var RESOLUTIONS: 分辨率序号 → (宽, 高)
+    :var PREVIEW: 预览分辨率序号，_nextFrame() 给出的图像为该分辨率
+    :var mono: 是否模拟黑白相机
+    """
+
+    RESOLUTIONS = [(1824, 1216)]
+    PREVIEW = 0
+    mono = False
+
+    def __init__(self):
+        self._eSize = self.PREVIEW
+        self._binning = 1
+        self._roi = None
+        self._options = {}
+        self._expoTime = 20000  # us
+        self._expoGain = 100
+
+        self._frame = None
+        self._frameInfo = nncam.NncamFrameInfoV3()
+        self._still = None
+        # 待输出静态帧的分辨率，每帧一项；与硬件相同，新的 SnapN 排在未完成的连拍之后
+        self._stillQueue = collections.deque()
+        self._lock = threading.Lock()
+
+        self._fun = None
+        self._ctx = None
+        self._thread = None
+        self._running = False
+        self._rateCount = 0
+        self._rateStart = time.perf_counter()
+        self._total = 0
+
+    @classmethod
+    def Open(cls, camId):
+        return cls()
+
+    @abc.abstractmethod
+    def _nextFrame(self):
+        """
+        产生下一帧，在取流线程中调用
+
+        :return: (预览分辨率图像, 序号, 时间戳 us, 发送时刻 perf_counter s 或None为立即发送)，流结束时为None
+        """
+
+    def _finalize(self, image, resolution):
+        """
+        按分辨率、合并与ROI得到输出图像
+        """
+        width, height = self.RESOLUTIONS[resolution]
+        if (width, height) != (image.shape[1], image.shape[0]):
+            image = cv2.resize(image, (width, height), interpolation=cv2.INTER_LINEAR)
+        if self._binning > 1:
+            image = cv2.resize(
+                image, (width // self._binning, height // self._binning), interpolation=cv2.INTER_AREA
+            )
+        if self._roi is not None:
+            x, y, w, h = self._roi
+            image = image[y:y + h, x:x + w]
+
+        return image
+
+    # ==== 取流 ====
+
+    def _loop(self):
+        while self._running:
+            item = self._nextFrame()
+            if item is None:
+                break
+            image, seq, timestamp, due = item
+
+            if due is not None:
+                wait = due - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+            if not self._running:
+                break
+
+            with self._lock:
+                self._frame = (self._finalize(image, self._eSize), seq, timestamp)
+                self._rateCount += 1
+                self._total += 1
+                stillRes = self._stillQueue.popleft() if self._stillQueue else None
+            self._fun(nncam.NNCAM_EVENT_IMAGE, self._ctx)
+
+            if stillRes is not None:
+                with self._lock:
+                    self._still = (self._finalize(image, stillRes), seq, timestamp)
+                self._fun(nncam.NNCAM_EVENT_STILLIMAGE, self._ctx)
+
+    def StartPullModeWithCallback(self, fun, ctx):
+        self._fun = fun
+        self._ctx = ctx
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def Stop(self):
+        self._running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def Close(self):
+        self.Stop()
+
+    def Snap(self, nResolutionIndex):
+        self.SnapN(nResolutionIndex, 1)
+
+    def SnapN(self, nResolutionIndex, nNumber):
+        with self._lock:
+            self._stillQueue.extend([nResolutionIndex] * nNumber)
+
+    def _source(self, bStill, pInfo):
+        with self._lock:
+            source = self._still if bStill else self._frame
+        if source is None:
+            raise nncam.HRESULTException(0x8000ffff)  # E_UNEXPECTED: 尚无图像
+        image, seq, timestamp = source
+
+        if pInfo is not None:
+            pInfo.height, pInfo.width = image.shape[:2]
+            pInfo.seq, pInfo.timestamp = seq, timestamp
+            pInfo.expotime, pInfo.expogain = self._expoTime, self._expoGain
+        return image
+
+    @staticmethod
+    def _copyTo(image, dst):
+        """
+        按目标通道数写入图像，dst 为 (高, 宽) 或 (高, 宽, 通道) 视图
+        """
+        if dst.ndim == 3 and dst.shape[2] == 1:
+            dst = dst[:, :, 0]
+
+        if dst.ndim == 2:
+            dst[:] = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        else:
+            dst[:] = image[:, :, None] if image.ndim == 2 else image
+
+    def PullImageV3(self, pImageData, bStill, bits, rowPitch, pInfo):
+        image = self._source(bStill, pInfo)
+        if pImageData is None:
+            return
+
+        height, width = image.shape[:2]
+        if rowPitch == 0:
+            rowPitch = nncam.TDIBWIDTHBYTES(width * bits)
+        elif rowPitch == -1:
+            rowPitch = width * bits // 8
+        address = ctypes.cast(pImageData, ctypes.c_void_p).value
+        buffer = nncam.NncamImageBuffer(
+            (ctypes.c_ubyte * (height * rowPitch)).from_address(address), width, height, bits, rowPitch
+        )
+        self._copyTo(image, buffer.image)
+
+    def PullImageInto(self, buffer, bStill=0):
+        image = self._source(bStill, self._frameInfo)
+        if image.shape[:2] != (buffer.height, buffer.width):
+            raise nncam.HRESULTException(0x80070057)  # E_INVALIDARG: 缓冲区尺寸与图像不符
+        self._copyTo(image, buffer.image)
+        return self._frameInfo
+
+    # ==== 参数 ====
+
+    def put_eSize(self, nResolutionIndex):
+        self._eSize = nResolutionIndex
+
+    def get_Resolution(self, nResolutionIndex):
+        return self.RESOLUTIONS[nResolutionIndex]
+
+    def get_Size(self):
+        return self.RESOLUTIONS[self._eSize]
+
+    def put_Roi(self, xOffset, yOffset, xWidth, yHeight):
+        self._roi = None if xWidth == 0 or yHeight == 0 else (xOffset, yOffset, xWidth, yHeight)
+
+    def get_FinalSize(self):
+        width, height = self.RESOLUTIONS[self._eSize]
+        width, height = width // self._binning, height // self._binning
+        if self._roi is not None:
+            width, height = self._roi[2], self._roi[3]
+        return width, height
+
+    def put_Option(self, iOption, iValue):
+        self._options[iOption] = iValue
+        if iOption == nncam.NNCAM_OPTION_BINNING:
+            self._binning = iValue & 0x0f
+
+    def MonoMode(self):
+        return self.mono
+
+    def put_AutoExpoEnable(self, bAutoExposure):
+        pass
+
+    def get_ExpTimeRange(self):
+        return 100, 1000000, self._expoTime
+
+    def put_ExpoTime(self, Time):
+        self._expoTime = Time
+
+    def get_ExpoTime(self):
+        return self._expoTime
+
+    def put_ExpoAGain(self, Gain):
+        self._expoGain = Gain
+
+    def get_FrameRate(self):
+        with self._lock:
+            now = time.perf_counter()
+            frames, elapsed = self._rateCount, int((now - self._rateStart) * 1000)
+            self._rateCount, self._rateStart = 0, now
+        return frames, elapsed, self._total
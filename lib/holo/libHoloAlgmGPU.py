@@ -37,8 +37,22 @@ class WCIA(Holo):
     def iterate(self) -> tuple:
         """
         WCIA迭代算法
+
+        :raises CancelledError: 迭代被 cancelToken 取消
         """
+        try:
+            self._iterate()
+        finally:
+            # 显存GC
+            cp._default_memory_pool.free_all_blocks()
+
+        return self.aK, self.phase
+
+    def _iterate(self):
         for n in range(self.maxIterNum):
+            if self.cancelToken is not None:
+                self.cancelToken.check()
+
             self.ak = cp.fft.ifft2(cp.fft.ifftshift(self.Ak))
 
             self.aK = self.Aholo * (self.ak / cp.abs(self.ak))
@@ -60,15 +74,13 @@ class WCIA(Holo):
             if self.iterAnalyze():
                 break
 
-        # 显存GC
-        cp._default_memory_pool.free_all_blocks()
-
-        return self.aK, self.phase
-
     @staticmethod
     def staticIterate(targetImg: cp.ndarray, maxIterNum: int, **kwargs):
         """
         WCIA迭代算法（静态）
+
+        :keyword cancelToken: 取消与暂停令牌，每次迭代前检查 type=CancelToken
+        :raises CancelledError: 迭代被取消
         """
         Atarget = targetImg
         signalRegion = targetImg > 0
@@ -76,6 +88,7 @@ class WCIA(Holo):
         initPhase = kwargs.get('initPhase', (0, None))
         iterTarget = kwargs.get('iterTarget', (0, 0.01))
         RMSEList = kwargs.get('RMSEList', [])
+        cancelToken = kwargs.get('cancelToken', None)
 
         if initPhase[0] == 1:
             # 以目标光场IFFT作为初始迭代相位以增强均匀性 v2
@@ -95,38 +108,42 @@ class WCIA(Holo):
         Aholo = cp.sqrt(Eholo / H)
         Acon = cp.empty_like(Atarget, dtype="complex")
 
-        for n in range(maxIterNum):
-            ak = cp.fft.ifft2(cp.fft.ifftshift(Ak))
-
-            aK = Aholo * (ak / cp.abs(ak))
-
-            AK = cp.fft.fftshift(cp.fft.fft2(aK))
-            # 向像平面光场添加强制振幅约束(See Eq.1)
-            Acon[signalRegion] = (
-                cp.abs(Ak[signalRegion]) *
-                (cp.abs(Atarget[signalRegion]) / cp.abs(AK[signalRegion])) ** bk
-            )
-            Acon[nonSigRegion] = cp.abs(Ak[nonSigRegion])
-            Ak = Acon * (AK / cp.abs(AK))
-            bk = cp.sqrt(bk)
-            phase = cp.angle(aK)
-
-            # 归一化光强
-            normalizedAmp = (cp.abs(AK) - cp.min(cp.abs(AK))) / (cp.max(cp.abs(AK)) - cp.min(cp.abs(AK)))
-
-            retrievedI = cp.abs(normalizedAmp) ** 2
-            targetI = cp.abs(targetImg) ** 2
-            RMSE = cp.sqrt(
-                cp.sum(retrievedI - targetI) ** 2 / cp.sum(targetI) ** 2
-            )
-            RMSEList.append(float(RMSE))
-
-            if iterTarget[0] == 0:
-                # RMSE小于等于设置阈值
-                if RMSEList[-1] <= iterTarget[1]:
-                    break
-
-        # 显存GC
-        cp._default_memory_pool.free_all_blocks()
+        try:
+            for n in range(maxIterNum):
+                if cancelToken is not None:
+                    cancelToken.check()
+
+                ak = cp.fft.ifft2(cp.fft.ifftshift(Ak))
+
+                aK = Aholo * (ak / cp.abs(ak))
+
+                AK = cp.fft.fftshift(cp.fft.fft2(aK))
+                # 向像平面光场添加强制振幅约束(See Eq.1)
+                Acon[signalRegion] = (
+                    cp.abs(Ak[signalRegion]) *
+                    (cp.abs(Atarget[signalRegion]) / cp.abs(AK[signalRegion])) ** bk
+                )
+                Acon[nonSigRegion] = cp.abs(Ak[nonSigRegion])
+                Ak = Acon * (AK / cp.abs(AK))
+                bk = cp.sqrt(bk)
+                phase = cp.angle(aK)
+
+                # 归一化光强
+                normalizedAmp = (cp.abs(AK) - cp.min(cp.abs(AK))) / (cp.max(cp.abs(AK)) - cp.min(cp.abs(AK)))
+
+                retrievedI = cp.abs(normalizedAmp) ** 2
+                targetI = cp.abs(targetImg) ** 2
+                RMSE = cp.sqrt(
+                    cp.sum(retrievedI - targetI) ** 2 / cp.sum(targetI) ** 2
+                )
+                RMSEList.append(float(RMSE))
+
+                if iterTarget[0] == 0:
+                    # RMSE小于等于设置阈值
+                    if RMSEList[-1] <= iterTarget[1]:
+                        break
+        finally:
+            # 显存GC
+            cp._default_memory_pool.free_all_blocks()
 
         return aK, phase
@@ -1,8 +1,74 @@
+import math
+import time
+import threading
+import weakref
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import CancelledError
 import cupy as cp
 import numpy as np
 from PyQt6.QtCore import QThread, pyqtSignal
 
 
+class CancelToken:
+    """
+    [计算控制] 协作式取消与暂停令牌
+
+    计算在每次迭代或每帧之间调用 check()：暂停时阻塞至恢复，已取消时抛出 CancelledError，
+    因此取消或暂停后最多再完成当前一次迭代。基于 multiprocessing.Event，可作为参数传入子进程，
+    在线程与进程间共享。
+
+    :var pausedTime: 本进程中因暂停而阻塞的总时间 (s)
+    """
+
+    def __init__(self):
+        self._cancelled = multiprocessing.Event()
+        self._resumed = multiprocessing.Event()
+        self._resumed.set()
+        self.pausedTime = 0
+
+    def cancel(self):
+        """
+        [计算控制] 取消计算，暂停中的计算随之唤醒并退出
+        """
+        self._cancelled.set()
+        self._resumed.set()
+
+    def pause(self):
+        """
+        [计算控制] 暂停计算，当前一次迭代完成后阻塞
+        """
+        if not self._cancelled.is_set():
+            self._resumed.clear()
+
+    def resume(self):
+        """
+        [计算控制] 恢复计算
+        """
+        self._resumed.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._resumed.is_set()
+
+    def check(self):
+        """
+        [计算控制] 在迭代之间调用，暂停时阻塞至恢复或取消
+
+        :raises CancelledError: 已取消
+        """
+        if not self._resumed.is_set():
+            start = time.perf_counter()
+            self._resumed.wait()
+            self.pausedTime += time.perf_counter() - start
+        if self._cancelled.is_set():
+            raise CancelledError()
+
+
 class Holo:
     def __init__(self, targetImg: cp.ndarray, maxIterNum: int, **kwargs):
         """
@@ -15,6 +81,8 @@ class Holo:
         :keyword uniList: 均匀性记录 type=list
         :keyword effiList: 光场效率记录 type=list
         :keyword RMSEList: 均方根误差记录 type=list
+        :keyword onIteration: 每次迭代评价后的回调 onIteration(holo)，在迭代线程中调用 type=callable
+        :keyword cancelToken: 取消与暂停令牌，每次迭代前检查，取消时 iterate() 抛出 CancelledError type=CancelToken
         """
         self.targetImg = targetImg
         self.maxIterNum = maxIterNum
@@ -24,31 +92,45 @@ class Holo:
         self.uniList = kwargs.get('uniList', [])
         self.effiList = kwargs.get('effiList', [])
         self.RMSEList = kwargs.get('RMSEList', [])
+        self.onIteration = kwargs.get('onIteration', None)
+        self.cancelToken = kwargs.get('cancelToken', None)
 
         self.signalRegion = self.targetImg > 0
         self.nonSigRegion = self.targetImg == 0
 
-    def uniformityCalc(self):
+    def uniformity(self) -> float:
         """
-        均匀性评价
+        当前迭代的均匀性，目标图中无满幅像素时为NaN
         """
-        maxI = cp.max(self.normalizedAmp[self.targetImg == 1])
-        minI = cp.min(self.normalizedAmp[self.targetImg == 1])
+        spots = self.normalizedAmp[self.targetImg == 1]
+        if spots.size == 0:
+            return math.nan
 
-        uniformity = 1 - (maxI - minI) / (maxI + minI)
+        maxI = cp.max(spots)
+        minI = cp.min(spots)
 
-        self.uniList.append(float(uniformity))
+        return float(1 - (maxI - minI) / (maxI + minI))
 
-    def efficiencyCalc(self):
+    def uniformityCalc(self):
         """
-        光场利用率评价
+        均匀性评价
+        """
+        self.uniList.append(self.uniformity())
+
+    def efficiency(self) -> float:
+        """
+        当前迭代的光场利用率
         """
         currentA = cp.sum(self.normalizedAmp[self.targetImg > 0])
         targetA = cp.sum(self.targetImg[self.targetImg > 0])
 
-        efficiency = currentA / targetA
+        return float(currentA / targetA)
 
-        self.effiList.append(float(efficiency))
+    def efficiencyCalc(self):
+        """
+        光场利用率评价
+        """
+        self.effiList.append(self.efficiency())
 
     def RMSECalc(self):
         """
@@ -76,6 +158,9 @@ class Holo:
         # 检查相位恢复结果的RMSE
         self.RMSECalc()
 
+        if self.onIteration is not None:
+            self.onIteration(self)
+
         if self.iterTarget[0] == 0:
             # RMSE小于等于设置阈值
             if self.RMSEList[-1] <= self.iterTarget[1]:
@@ -151,16 +236,244 @@ class Holo:
         )
         return cp.asnumpy(H * uFFT)
 
+    @staticmethod
+    def reconstructPreview(holoU: cp.ndarray, size: int):
+        """
+        低分辨率重建光场振幅，用于预览
+
+        重建光场每隔 m 点的取样等于将全息图光场按 N/m 周期折叠求和后的 (N/m) 点FFT，
+        计算量与传输量均降为约 1/m²。传播因子 H 的模为1，振幅与衍射距离、波长无关。
+
+        :param holoU: 全息图光场
+        :param size: 预览边长，取样间隔 m 为能整除光场尺寸且结果不小于 size 的最大整数
+        :return: 8位重建振幅图 (numpy)
+        """
+        u = cp.fft.fftshift(cp.asarray(holoU))
+        height, width = u.shape
+        m = max((k for k in range(1, min(height, width) // max(size, 1) + 1)
+                 if height % k == 0 and width % k == 0), default=1)
+        if m > 1:
+            u = u.reshape(m, height // m, m, width // m).sum(axis=(0, 2))
+
+        reconstructA = Holo.normalize(cp.abs(cp.fft.fftshift(cp.fft.fft2(u)))) * 255
+        return cp.asnumpy(reconstructA.astype("uint8"))
+
+
+class IterTelemetry:
+    """
+    [迭代遥测] 限频汇总迭代指标，估计迭代速度与到达终止条件的剩余时间
+
+    在迭代线程中每次迭代后调用 update()，距上次输出不足 interval 时只做一次时间比较；
+    到期时才计算均匀性与光场利用率并给出一条记录，不拖慢迭代。
+    剩余迭代次数取到达最大迭代次数，与按最近 window 次迭代 log(RMSE) 的下降趋势外推至RMSE阈值二者的较小值。
+
+    记录为字典：iteration 已完成迭代数，RMSE、uniformity、efficiency 当前指标，
+    RMSENew 自上条记录以来的全部RMSE，rate 迭代速度 (次/s)，remaining 预计剩余迭代数，
+    eta 预计剩余时间 (s)，progress 预计进度 (0~1)，done 是否为迭代结束后的最后一条。
+    """
+
+    def __init__(self, maxIterNum, iterTarget=(0, 0.01), interval=0.1, window=10, cancelToken=None):
+        """
+        :param cancelToken: 计算所用的取消与暂停令牌，暂停时间不计入迭代速度，可为None
+        """
+        self.maxIterNum = maxIterNum
+        self.iterTarget = iterTarget
+        self.interval = interval
+        self.window = window
+        self.cancelToken = cancelToken
+        self.start()
+
+    def start(self):
+        """
+        [迭代遥测] 开始计时，在第一次迭代前调用
+        """
+        self._start = time.perf_counter()
+        self._last = self._start
+        self._sent = 0
+        self._paused = self.cancelToken.pausedTime if self.cancelToken is not None else 0
+
+    def remaining(self, RMSEList) -> int:
+        """
+        [迭代遥测] 预计剩余迭代次数
+        """
+        n = len(RMSEList)
+        remaining = max(self.maxIterNum - n, 0)
+        if self.iterTarget[0] != 0 or n < 2 or remaining == 0:
+            return remaining
+
+        recent = np.array(RMSEList[-self.window:], dtype=np.float64)
+        recent = recent[recent > 0]
+        target = self.iterTarget[1]
+        if len(recent) < 2 or target <= 0:
+            return remaining
+        if recent[-1] <= target:
+            return 0
+
+        slope = np.polyfit(np.arange(len(recent)), np.log(recent), 1)[0]
+        if slope < 0:
+            remaining = min(remaining, math.ceil((math.log(target) - math.log(recent[-1])) / slope))
+        return remaining
+
+    def update(self, holo, done=False):
+        """
+        [迭代遥测] 记录一次迭代
+
+        :param holo: 迭代中的 Holo 实例
+        :param done: 迭代已结束，不限频
+        :return: 到期时为记录字典，否则为None
+        """
+        now = time.perf_counter()
+        if not done and now - self._last < self.interval:
+            return None
+
+        n = len(holo.RMSEList)
+        if n == 0 or holo.normalizedAmp is None:
+            return None
+        self._last = now
+
+        elapsed = now - self._start
+        if self.cancelToken is not None:
+            elapsed -= self.cancelToken.pausedTime - self._paused
+        rate = n / elapsed if elapsed > 0 else 0
+        remaining = 0 if done else self.remaining(holo.RMSEList)
+        record = {
+            'iteration': n,
+            'RMSE': holo.RMSEList[-1],
+            'uniformity': holo.uniformity(),
+            'efficiency': holo.efficiency(),
+            'RMSENew': holo.RMSEList[self._sent:],
+            'rate': rate,
+            'remaining': remaining,
+            'eta': remaining / rate if rate > 0 else math.nan,
+            'progress': n / (n + remaining),
+            'done': done,
+        }
+        self._sent = n
+        return record
+
 
 class HoloCalcWorker(QThread):
+    """
+    [全息图计算] 在后台线程中迭代计算全息图
+
+    可随时暂停、恢复或取消，最多再完成当前一次迭代；取消后发出 cancelledSig 而非 resultSig。
+
+    :var resultSig: 计算结果信号 (全息图光场, 相位)
+    :var telemetrySig: 限频的迭代遥测信号，记录见 IterTelemetry
+    :var cancelledSig: 计算已取消
+    :var cancelToken: 计算实例所用的取消与暂停令牌
+    """
+
     resultSig = pyqtSignal(cp.ndarray, cp.ndarray)
+    telemetrySig = pyqtSignal(object)
+    cancelledSig = pyqtSignal()
 
-    def __init__(self, instance):
+    def __init__(self, instance, telemetryInterval=0.1):
         super().__init__()
         self.instance = instance  # 存储传入的实例
+        if self.instance.cancelToken is None:
+            self.instance.cancelToken = CancelToken()
+        self.cancelToken = self.instance.cancelToken
+        self.telemetry = IterTelemetry(
+            instance.maxIterNum, instance.iterTarget, telemetryInterval, cancelToken=self.cancelToken
+        )
+        self.instance.onIteration = self._onIteration
+
+    def cancel(self):
+        """
+        [全息图计算] 取消计算，不等待
+        """
+        self.cancelToken.cancel()
+
+    def pause(self):
+        self.cancelToken.pause()
+
+    def resume(self):
+        self.cancelToken.resume()
+
+    def _onIteration(self, holo):
+        record = self.telemetry.update(holo)
+        if record is not None:
+            self.telemetrySig.emit(record)
 
     def run(self):
+        self.telemetry.start()
         # 执行一些耗时的任务
-        u, phase = self.instance.iterate()
+        try:
+            u, phase = self.instance.iterate()
+        except CancelledError:
+            self.cancelledSig.emit()
+            return
+        record = self.telemetry.update(self.instance, done=True)
+        if record is not None:
+            self.telemetrySig.emit(record)
         # 发送结果信号
         self.resultSig.emit(u, phase)
+
+
+class ReconstructPreviewWorker(QThread):
+    """
+    [全息图重建] 在后台线程中计算低分辨率重建预览，按全息图缓存
+
+    只计算最新一次请求，未开始计算的旧请求被替换；已缓存的全息图直接发出结果。
+    缓存以全息图光场数组本身为键，数组被释放或替换后失效。
+
+    :var previewReady: 预览就绪信号 (全息图光场, 8位重建振幅图)
+    :var cacheSize: 缓存的预览数
+    """
+
+    previewReady = pyqtSignal(object, object)
+
+    def __init__(self, cacheSize=8):
+        super().__init__()
+        self.cacheSize = cacheSize
+        self._cache = OrderedDict()
+        self._cond = threading.Condition()
+        self._pending = None
+        self._running = True
+
+    def request(self, holoU, size):
+        """
+        [全息图重建] 请求一幅全息图的重建预览，结果由 previewReady 发出
+
+        :param holoU: 全息图光场
+        :param size: 预览边长
+        """
+        key = (id(holoU), size)
+        with self._cond:
+            entry = self._cache.get(key)
+            if entry is None or entry[0]() is not holoU:
+                self._pending = (holoU, size)
+                self._cond.notify()
+                return
+            self._cache.move_to_end(key)
+
+        self.previewReady.emit(holoU, entry[1])
+
+    def stop(self):
+        """
+        [全息图重建] 停止计算线程并等待退出
+        """
+        with self._cond:
+            self._running = False
+            self._pending = None
+            self._cond.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self._cond:
+                while self._running and self._pending is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                (holoU, size), self._pending = self._pending, None
+
+            preview = Holo.reconstructPreview(holoU, size)
+
+            with self._cond:
+                self._cache[(id(holoU), size)] = (weakref.ref(holoU), preview)
+                while len(self._cache) > self.cacheSize:
+                    self._cache.popitem(last=False)
+
+            self.previewReady.emit(holoU, preview)
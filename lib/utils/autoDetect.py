@@ -3,258 +3,226 @@ import cv2
 import math
 import numpy as np
 import cupy as cp
-from scipy.spatial import distance
 from sklearn.cluster import KMeans
 import matplotlib.pyplot as plt
-from collections import defaultdict, deque
+from collections import deque
 from multiprocessing import Process
+from concurrent.futures import CancelledError
 from lib.holo.libHoloAlgmGPU import WCIA
-from lib.utils.utils import Utils
+from lib.holo.libHoloEssential import Holo
+from lib.utils.pathPlanner import PathPlanner
+from lib.utils.spotDetect import HoughDetector
+from lib.utils.camSlmMapping import CamSlmMapping
+from lib.utils.pointSet import PointSet, PointPairs
 
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QTimer, QThread, pyqtSignal
 import time
 
 class FeaturesDetect:
+    # 光斑检测后端，见 lib.utils.spotDetect
+    detector = HoughDetector()
+
     @staticmethod
     def cutImg(image, center):
-        # 计算圆形中心到图片边界的最小距离
-        minDist = min(center[0], center[1], image.shape[1] - center[0] - 1, image.shape[0] - center[1] - 1)
-
-        # 裁剪边长为最小距离的两倍
-        squareSize = minDist * 2
-
-        # 计算裁剪区域的起始点和结束点
-        startPoint = (max(0, center[0] - squareSize // 2), max(0, center[1] - squareSize // 2))
-        endPoint = (
-            min(image.shape[1], center[0] + squareSize // 2), min(image.shape[0], center[1] + squareSize // 2))
-
-        # 裁剪图片
-        croppedImg = image[startPoint[1]:endPoint[1], startPoint[0]:endPoint[0]]
-
-        # 调整图片大小为正方形
-        squareImg = cv2.resize(croppedImg, (squareSize, squareSize))
-
-        # 确保图片是正方形的
-        height, width = squareImg.shape[:2]
-
-        # 缩放图片到610x610
-        resizedImg = cv2.resize(squareImg, (610, 610), interpolation=cv2.INTER_AREA)
+        """
+        以零级光为中心截取视场并映射到1080x1080目标图平面
 
-        # 创建1080x1080的空白图像
-        comboImg = np.zeros((1080, 1080), dtype=np.uint8)
+        需要反复映射时请直接复用 CamSlmMapping 实例
 
-        # 确定缩放后的图片在空白图像中的位置
-        xOffset = (1080 - 610) // 2
-        yOffset = (1080 - 610) // 2
+        :param image: 单通道相机图像
+        :param center: 零级光位置 (x, y)
+        :return: 1080x1080 图像
+        """
+        return CamSlmMapping(center, image.shape).apply(image).copy()
 
-        # 将缩放后的图片粘贴到空白图像的中心
-        comboImg[yOffset:yOffset + 610, xOffset:xOffset + 610] = resizedImg
+    @classmethod
+    def detectSpots(cls, image) -> np.ndarray:
+        """
+        以当前检测后端识别光斑
 
-        return comboImg
+        :param image: 单通道灰度图像
+        :return: (N, 3) 亚像素中心与半径 (x, y, r)，未识别到时为空数组
+        """
+        return cls.detector.detect(image)
 
-    @staticmethod
-    def detectCircles(image) -> np.ndarray:
-        # 应用高斯模糊减少图像噪声
-        blurred = cv2.GaussianBlur(image, (5, 5), 0)
+    @classmethod
+    def detectCircles(cls, image) -> np.ndarray:
+        """
+        识别光斑中心的整数坐标
 
-        # 检测圆形，这里参数可能需要根据实际情况调整
-        circles = cv2.HoughCircles(
-            blurred, cv2.HOUGH_GRADIENT, 1, 20, param1=50, param2=13, minRadius=5, maxRadius=20
-        )
+        :param image: 单通道灰度图像
+        :return: (N, 2) 中心坐标 (x, y)，未识别到时为空数组
+        """
+        return np.round(cls.detectSpots(image)[:, :2]).astype("int")
 
-        # 将检测到的圆形转换为列表形式的坐标
-        circles = np.round(circles[0, :]).astype("int")
+    @classmethod
+    def detectPoints(cls, image) -> PointSet:
+        """
+        以当前检测后端识别光斑，输出点集
 
-        return circles[:, :2]
+        :param image: 单通道灰度图像
+        :return: 带半径列的点集
+        """
+        return PointSet.fromSpots(cls.detectSpots(image))
 
     @staticmethod
     def drawMatches(currImg, targetImg, matches):
         # 创建一个新图像，用于绘制连线
         bgImage = cv2.addWeighted(currImg, 0.5, targetImg, 0.5, 0)
 
-        # 遍历匹配的点对
-        for (currentPoint, targetPoint) in matches:
-
-            # 确保current_point和target_point是长度为2的元组
-            currentLoc = tuple(currentPoint[:2])  # 取前两个元素作为x, y坐标
-            targetLoc = tuple(targetPoint[:2])  # 同上
-
-            # 绘制连线
-            cv2.line(bgImage, currentLoc, targetLoc, (255, 255, 0), 1)
+        # 遍历匹配的点对，绘制连线
+        for i in range(len(matches)):
+            cv2.line(bgImage, matches.starts.point(i), matches.ends.point(i), (255, 255, 0), 1)
 
         return bgImage
 
     @staticmethod
-    def match(currentPts, targetPts, cDist, cAngle):
-        # 计算所有点对之间的距离
-        distMatrix = distance.cdist(targetPts, currentPts, 'euclidean')
-
-        # 初始化匹配列表
-        matches = []
+    def match(currentPts, targetPts, cDist, cAngle) -> PointPairs:
+        """
+        按目标点顺序，为每个目标点就近匹配当前点
 
-        # 初始化一个集合，用于存储已匹配的当前点索引
-        matched_current = set()
+        匹配得分综合距离与偏离目标点法线方向的夹角
 
-        # 计算目标点之间的法线向量
-        targetNormalVecs = []
-        for i in range(len(targetPts)):
-            if i == len(targetPts) - 1:  # 最后一个点
-                nextIdx = i - 1  # 使用第一个点作为下一个点
-            else:
-                nextIdx = i + 1
-            targetVec = np.array(targetPts[nextIdx]) - np.array(targetPts[i])
-            if np.linalg.norm(targetVec) > 0:  # 确保不是零向量
-                targetNormalVecs.append(np.array([-targetVec[1], targetVec[0]]))
-            else:
-                targetNormalVecs.append([0, 0])  # 如果是零向量，使用零向量作为法线
-
-        # 遍历每个目标点
-        for i, targetPt in enumerate(targetPts):
-            # 为当前目标点找到最近的当前点
-            minScore = float('inf')
-            minIndex = -1
-            for j, currentPt in enumerate(currentPts):
-                if j not in matched_current:
-                    dist = distMatrix[i][j]
-                    currTargetVec = np.array(currentPt) - np.array(targetPt)
-                    # 计算两个向量之间的夹角的余弦值
-                    cosAngle = (np.dot(currTargetVec, targetNormalVecs[i]) /
-                                (np.linalg.norm(currTargetVec) * np.linalg.norm(targetNormalVecs[i])))
-                    if cosAngle > 1 or cosAngle < -1:
-                        # 确保cos_angle在-1到1之间
-                        cosAngle = np.abs(np.clip(cosAngle, -1, 1))
-                    # 使用距离和余弦值作为加权因素
-                    # 夹角越大，cos_angle越小，权重越小
-                    score = cDist * dist + cAngle * dist * (1 - cosAngle)
-                    if score < minScore:
-                        minScore = score
-                        minIndex = j
-
-            # 如果找到了最近的点，则添加到匹配列表
-            if minIndex != -1:
-                matches.append((targetPt, currentPts[minIndex]))
-                matched_current.add(minIndex)
-
-        return matches
+        :param PointSet currentPts: 当前点
+        :param PointSet targetPts: 已排序的目标点
+        :param cDist: 距离权重
+        :param cAngle: 夹角权重
+        :return: 匹配点对
+        """
+        targetNum = len(targetPts)
+        if targetNum == 0 or len(currentPts) == 0:
+            return PointPairs(targetPts.take(slice(0, 0)), currentPts.take(slice(0, 0)))
+
+        # 计算所有点对之间的距离 (目标点, 当前点)
+        distMatrix = targetPts.distTo(currentPts)
+
+        # 计算目标点之间的法线向量，最后一个点使用前一个点
+        nextIdx = np.arange(1, targetNum + 1)
+        nextIdx[-1] = targetNum - 2
+        targetVecs = targetPts.xy[nextIdx] - targetPts.xy
+        targetNormalVecs = np.column_stack((-targetVecs[:, 1], targetVecs[:, 0]))
+
+        # 当前点相对目标点的向量与法线夹角的余弦值
+        currTargetVecs = currentPts.xy[None, :, :] - targetPts.xy[:, None, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cosAngle = (np.einsum('tcd,td->tc', currTargetVecs, targetNormalVecs) /
+                        (np.linalg.norm(currTargetVecs, axis=2) * np.linalg.norm(targetNormalVecs, axis=1)[:, None]))
+        # 确保cos_angle在-1到1之间
+        outside = (cosAngle > 1) | (cosAngle < -1)
+        cosAngle[outside] = np.abs(np.clip(cosAngle[outside], -1, 1))
+
+        # 使用距离和余弦值作为加权因素，夹角越大，cos_angle越小，权重越小
+        score = cDist * distMatrix + cAngle * distMatrix * (1 - cosAngle)
+        # 法线为零向量或点重合时无法评分
+        score[np.isnan(score)] = np.inf
+
+        # 遍历每个目标点，在未匹配的当前点中取得分最低者
+        targetIdx, currentIdx = [], []
+        available = np.ones(len(currentPts), dtype=bool)
+        for i in range(targetNum):
+            row = np.where(available, score[i], np.inf)
+            j = int(np.argmin(row))
+            if row[j] < np.inf:
+                targetIdx.append(i)
+                currentIdx.append(j)
+                available[j] = False
+
+        return PointPairs(targetPts.take(np.array(targetIdx, dtype=int)), currentPts.take(np.array(currentIdx, dtype=int)))
 
 
 class FeaturesSort:
     def __init__(self, targetPts, thres):
-        self.maxindexA = 0
-        self.maxindexB = 0
-        self.targetPts = targetPts
-        self.totalOrderA = np.zeros_like(targetPts)
-        self.totalOrderB = np.zeros_like(targetPts)
+        self.targetPts = targetPts if isinstance(targetPts, PointSet) else PointSet(targetPts)
         self.thres = thres
         self.clusterNum = 1
 
-    def detectCluster(self):
+    def detectCluster(self) -> dict:
+        """
+        聚类，并对每个簇内的点按照y坐标排序
+
+        :return: {簇标签: 点索引数组}
+        """
         kmeans = KMeans(n_clusters=self.clusterNum)
-        # 将点转换为numpy数组
-        target_points_array = np.array(self.targetPts)
         # 执行聚类 获取每个点的簇标签
-        kmeans.fit(target_points_array)
+        kmeans.fit(self.targetPts.xy)
 
-        # 聚类排序
-        # 根据簇标签对点进行分组
-        cluster = {i: [] for i in range(self.clusterNum)}
-        for pt, label in zip(target_points_array, kmeans.labels_):
-            cluster[label].append(tuple(pt))
-
-        # 对每个簇内的点按照y坐标排序
-        for label, pts in cluster.items():
-            cluster[label].sort(key=lambda x: x[1])
+        cluster = {}
+        for label in range(self.clusterNum):
+            idx = np.flatnonzero(kmeans.labels_ == label)
+            cluster[label] = idx[np.argsort(self.targetPts.xy[idx, 1], kind='stable')]
 
         return cluster
 
     @staticmethod
-    def findClosestPoints(points) -> dict:
+    def findClosestPoints(xy) -> tuple:
         """
         目标点集中，每个点和余下其他点的距离排序
 
-        :param list points: 目标点集合
-        :return: 点的距离集合
-        """
-        distances = defaultdict(list)
-        for i, p1 in enumerate(points):
-            for j, p2 in enumerate(points):
-                if i != j:
-                    # 计算两点之间的欧几里得距离
-                    dist = Utils.calcEucDist(p1, p2)
-                    distances[p1].append((dist, p2))
-        for k in points:
-            # 根据距离排序
-            distances[k].sort()
-        return distances
+        :param xy: (N, 2) 目标点坐标
+        :return: (近邻索引 (N, N-1), 对应距离 (N, N-1))
+        """
+        dist = np.linalg.norm(xy[:, None, :] - xy[None, :, :], axis=2)
+        np.fill_diagonal(dist, np.inf)
+        order = np.argsort(dist, axis=1, kind='stable')[:, :-1]
+
+        return order, np.take_along_axis(dist, order, axis=1)
 
     # 第一次全连接点
-    def connectPoints(self, points) -> dict:
+    def connectPoints(self, xy) -> list:
         """
-        对点进行初步连接
+        对点进行初步连接，每个点连接最近的两个点
 
-        :param list points: 目标点集合
-        :return: 连接结果
+        :param xy: (N, 2) 目标点坐标
+        :return: 连接结果，第i项为点i所连接的点索引列表
         """
-        connections = defaultdict(list)
-        for point, closest in self.findClosestPoints(points).items():
-            if len(closest) >= 2:
-                connections[point].extend([closest[0][1], closest[1][1]])
-        return connections
+        if len(xy) < 3:
+            return [[] for _ in range(len(xy))]
+
+        order, _ = self.findClosestPoints(xy)
+
+        return [[int(row[0]), int(row[1])] for row in order]
 
     @staticmethod
-    def checkConnections(connections, points, thres):
+    def checkConnections(connections, xy, thres):
         """
         检查连接正确性
 
-        :param dict connections: 点的连接
-        :param list points: 目标点集合
+        :param list connections: 点的连接
+        :param xy: (N, 2) 目标点坐标
         :param thres: 距离差异阈值
         """
-        # 计算所有点对之间的平均距离
-        dist = [Utils.calcEucDist(points[i], points[j]) for i in range(len(points)) for j in range(i + 1, len(points))]
-        if dist:
-            avgDist = sum(dist) / len(dist)
-        else:
+        num = len(xy)
+        if num < 2:
             return  # 如果没有点对，则直接返回
 
+        # 计算所有点对之间的平均距离
+        dist = np.linalg.norm(xy[:, None, :] - xy[None, :, :], axis=2)
+        avgDist = dist[np.triu_indices(num, 1)].mean()
+        np.fill_diagonal(dist, np.inf)
+
         # 对每个点进行处理
-        for point in points:
-            # 如果当前点没有连接，则尝试添加一个连接
-            if not connections[tuple(point)]:
-                closestPt = min(points, key=lambda p: Utils.calcEucDist(p, point))
-                connections[tuple(point)].append(closestPt)
+        for i, conn in enumerate(connections):
+            # 如果当前点没有连接，则连接最近的点
+            if not conn:
+                conn.append(int(np.argmin(dist[i])))
 
             # 如果当前点有两个连接，检查它们之间的距离是否相近
-            if len(connections[tuple(point)]) == 2:
-                twoConnDist = sorted(
-                    [Utils.calcEucDist(point, connPt) for connPt in connections[tuple(point)]]
-                )
+            if len(conn) == 2:
+                twoConnDist = np.sort(dist[i, conn])
                 # 如果两个连接的距离相差超过平均距离的某个倍数，删除较大的连接
                 if twoConnDist[1] - twoConnDist[0] > avgDist * thres:
-                    connections[tuple(point)].pop()
-
-        # 检查是否有需要重新添加连接的情况
-        for point, conn in connections.items():
-            if len(conn) == 0:
-                # 重新添加连接，选择最近的点
-                closest = sorted(points, key=lambda p: Utils.calcEucDist(p, point))
-                connections[point] = [closest[1]]
-
+                    conn.pop()
 
     @staticmethod
-    def sortCluster(connections, points):
+    def sortCluster(connections):
         """
         聚类排序结果输出
 
-        :param dict connections: 连接结果
-        :param list points:
-        :return: retCode，起始点，排列顺序
+        :param list connections: 连接结果
+        :return: retCode，起始点索引，排列顺序
         """
-        # 根据聚类ID获取该聚类的连接信息
-        connect = {tuple(point): conn for point, conn in connections.items() if tuple(point) in {tuple(p) for p in points}}
-
         # 找到只有一个连接的点作为起点
-        startPoints = [point for point, connections in connect.items() if len(connections) == 1]
+        startPoints = [i for i, conn in enumerate(connections) if len(conn) == 1]
 
         # 找不到则直接返回
         if not startPoints:
@@ -264,65 +232,73 @@ class FeaturesSort:
         # 对每个只有一个连接的点，执行一次广度优先搜索
         linkOrders = []
         for startPoint in startPoints:
-            visited = set()
+            visited = np.zeros(len(connections), dtype=bool)
             linkOrder = []
             que = deque([startPoint])
 
             while que:
                 currentPoint = que.popleft()
-                if currentPoint not in visited:
-                    visited.add(currentPoint)
+                if not visited[currentPoint]:
+                    visited[currentPoint] = True
                     linkOrder.append(currentPoint)
                     # 将当前点的所有连接点加入队列
-                    for connPoint in connect.get(currentPoint, []):
-                        que.append(connPoint)
+                    que.extend(connections[currentPoint])
 
-            # 将输出顺序中的点元组转换回原始点的格式
-            linkOrder = [tuple(point) for point in linkOrder]
-            linkOrders.append(linkOrder)
+            linkOrders.append(np.array(linkOrder, dtype=int))
 
         return 0, startPoints, linkOrders
 
+    @staticmethod
+    def _completeOrder(order, num) -> np.ndarray:
+        """
+        未被遍历到的点按y坐标顺序补在末尾
+        """
+        return np.concatenate((order, np.setdiff1d(np.arange(num), order))).astype(int)
+
     def calc(self):
         """
         计算最优连接
 
-        :return: 顺序A，顺序B
+        :return: 顺序A，顺序B (PointSet)
         """
         cluster = self.detectCluster()
+        orderA, orderB = [], []
+
         # 寻找每个簇的最优连接
-        connnected = defaultdict(dict)
         for cid, group in cluster.items():
-            # 连接点
-            connnected[cid] = self.connectPoints(group)
-
-        for cid, ptConnections in connnected.items():
-            # 检查连接规则
-            for group in cluster.values():
-                self.checkConnections(ptConnections, group, self.thres)
+            xy = self.targetPts.xy[group]
+            # 连接点并检查连接规则
+            connections = self.connectPoints(xy)
+            self.checkConnections(connections, xy, self.thres)
 
-            # 输出排序后点
-            ret, startPts, orders = self.sortCluster(connnected[cid], cluster[cid])
+            # 输出排序后点，无端点时按y坐标顺序
+            ret, startPts, orders = self.sortCluster(connections)
+            if ret != 0:
+                orders = [np.arange(len(group))]
 
-            for index, order in enumerate(orders[0]):
-                self.totalOrderA[self.maxindexA] = order
-                self.maxindexA += 1
+            orderA.append(group[self._completeOrder(orders[0], len(group))])
+            orderB.append(group[self._completeOrder(orders[-1] if len(orders) < 2 else orders[1], len(group))])
 
-            for index, order in enumerate(orders[1]):
-                self.totalOrderB[self.maxindexB] = order
-                self.maxindexB += 1
-
-            return self.totalOrderA, self.totalOrderB
+        return self.targetPts.take(np.concatenate(orderA)), self.targetPts.take(np.concatenate(orderB))
 
 
 class FrameGeneratorWorker(Process):
-    def __init__(self, matchedPairs, framePipeSender):
+    def __init__(self, matchedPairs, framePipeSender, paths=None, startFrame=0, cancelToken=None):
         Process.__init__(self)
         self.matchedPairs = matchedPairs
         self.framePipeSender = framePipeSender
-        # 初始化未启动点列表和已结束点列表
-        self.unstartedPoints = [start for _, start in self.matchedPairs]
-        self.endedPoints = []
+        # 取消与暂停令牌，每帧之前检查
+        self.cancelToken = cancelToken
+        # 与matchedPairs对应的折线路径，None时沿直线移动
+        self.paths = paths
+        # 重规划时跳过已计算的帧
+        self.startFrame = startFrame
+        # 起点与终点的整数坐标
+        self.starts = matchedPairs.starts.asInt()
+        self.ends = matchedPairs.ends.asInt()
+        # 未启动点和已结束点的掩码
+        self.unstarted = np.ones(len(matchedPairs), dtype=bool)
+        self.ended = np.zeros(len(matchedPairs), dtype=bool)
         # 当前总帧数
         self.currentFrame = 0
         self.currentPoint = 0
@@ -334,72 +310,162 @@ class FrameGeneratorWorker(Process):
     def calcSteps(self, dist):
         return max(1, int(math.ceil(dist / self.stepLength)))
 
+    def drawStatic(self) -> np.ndarray:
+        """
+        绘制当前点移动期间保持不动的点：所有未启动的起点与已结束的终点
+        """
+        frame = np.zeros((self.height, self.width), dtype=np.uint8)
+        for x, y in np.vstack((self.starts[self.unstarted], self.ends[self.ended])):
+            cv2.circle(frame, (int(x), int(y)), 5, (255, 255, 255), -1)
+
+        return frame
+
     def run(self):
+        try:
+            self.generate()
+        except (CancelledError, EOFError, OSError):
+            # 被取消或下游已关闭，不再发送
+            pass
+        finally:
+            self.framePipeSender.close()
+        sys.exit(0)
+
+    def generate(self):
+        """
+        逐帧绘制路径帧并发送
+        """
         while self.currentPoint < len(self.matchedPairs):
-            end, start = self.matchedPairs[self.currentPoint]
-            # 从未启动点列表中移除当前点
-            self.unstartedPoints.remove(start)
+            k = self.currentPoint
+            start, end = self.starts[k], self.ends[k]
+            # 从未启动点中移除当前点
+            self.unstarted[k] = False
+
+            if self.paths is not None:
+                path = np.asarray(self.paths[k], dtype=np.float64)
+            else:
+                path = np.array([start, end], dtype=np.float64)
+
+            # 沿折线的累计长度
+            cumLength = PathPlanner.cumLength(path)
 
             # 计算步数
-            dist = Utils.calcEucDist(start, end)
+            dist = cumLength[-1]
             steps = self.calcSteps(dist)
 
+            # 静止点在本段移动中不变，只绘制一次
+            background = None
+
             # 逐帧绘制并保存
             for i in range(steps + 1):  # 包括起始点和结束点
-                # 创建新的黑色图像
-                frame = np.zeros((self.height, self.width), dtype=np.uint8)
+                if self.currentFrame < self.startFrame:
+                    self.currentFrame += 1
+                    continue
 
-                # 绘制所有未启动的起点
-                for point in self.unstartedPoints:
-                    cv2.circle(frame, point, 5, (255, 255, 255), -1)
+                if self.cancelToken is not None:
+                    self.cancelToken.check()
 
-                # 绘制所有已结束的终点
-                for point in self.endedPoints:
-                    cv2.circle(frame, point, 5, (255, 255, 255), -1)
+                if background is None:
+                    background = self.drawStatic()
+                frame = background.copy()
 
                 # 如果是起始帧，绘制起始点
                 if i == 0:
-                    cv2.circle(frame, start, 5, (255, 255, 255), -1)
+                    cv2.circle(frame, (int(start[0]), int(start[1])), 5, (255, 255, 255), -1)
 
                 # 计算并绘制当前点的移动位置
                 if i > 0:
-                    x = int(start[0] + (end[0] - start[0]) * (i / steps))
-                    y = int(start[1] + (end[1] - start[1]) * (i / steps))
+                    x = int(np.interp(dist * (i / steps), cumLength, path[:, 0]))
+                    y = int(np.interp(dist * (i / steps), cumLength, path[:, 1]))
                     cv2.circle(frame, (x, y), 5, (255, 255, 255), -1)
 
                 # 保存当前帧
                 self.framePipeSender.send((cp.asarray(frame / 255), self.currentFrame))
                 self.currentFrame += 1
 
-            # 移动结束，将终点添加到已结束点列表
-            self.endedPoints.append(end)
+            # 移动结束，将终点标记为已结束
+            self.ended[k] = True
             self.currentPoint += 1
-        else:
-            self.framePipeSender.close()
-            sys.exit(0)
 
 
 class HoloGeneratorWorker(Process):
-    def __init__(self, framePipeReceiver, holoPipeSender, maxIterNum=40, iterTarget=0.01):
+    def __init__(self, framePipeReceiver, holoPipeSender, maxIterNum=40, iterTarget=0.01, cancelToken=None):
         Process.__init__(self)
         self.framePipeReceiver = framePipeReceiver
         self.holoPipeSender = holoPipeSender
         self.maxIterNum = maxIterNum
         self.iterTarget = iterTarget
+        # 取消与暂停令牌，每帧及每次迭代之前检查
+        self.cancelToken = cancelToken
 
     def run(self):
-        while True:
-            try:
+        try:
+            while True:
                 (frame, index) = self.framePipeReceiver.recv()
-            except EOFError:
-                self.framePipeReceiver.close()
-                self.holoPipeSender.close()
-                sys.exit(0)
-            else:
                 u, phase = WCIA.staticIterate(
                     frame,
                     self.maxIterNum,
                     initPhase=(1, None),
-                    iterTarget=(0, self.iterTarget)
+                    iterTarget=(0, self.iterTarget),
+                    cancelToken=self.cancelToken
                 )
+                if self.cancelToken is not None:
+                    self.cancelToken.check()
                 self.holoPipeSender.send((phase, index))
+        except (CancelledError, EOFError, OSError):
+            # 上游发送完毕、被取消或下游已关闭
+            pass
+        finally:
+            self.framePipeReceiver.close()
+            self.holoPipeSender.close()
+        sys.exit(0)
+
+
+class HoloReceiverWorker(QThread):
+    """
+    [全息图计算] 接收全息图计算进程的相位结果，生成旋转后的全息图
+
+    在独立线程中阻塞接收并完成后处理，不占用Qt事件循环。接收以短超时轮询，
+    requestStop() 后最迟一个轮询周期内退出，此后不再发出任何信号。
+
+    :var frameReady: 全息图就绪信号 (针对LCOS旋转后的全息图, 帧序号)
+    :var completed: 计算进程已全部发送完毕
+    """
+
+    frameReady = pyqtSignal(object, int)
+    completed = pyqtSignal()
+
+    def __init__(self, holoPipeReceiver, pollInterval=0.1, parent=None):
+        super().__init__(parent)
+        self.holoPipeReceiver = holoPipeReceiver
+        self.pollInterval = pollInterval
+        self._running = True
+
+    def requestStop(self):
+        """
+        [全息图计算] 通知接收线程退出，不等待
+        """
+        self._running = False
+
+    def stop(self):
+        """
+        [全息图计算] 停止接收线程并等待退出
+        """
+        self.requestStop()
+        self.wait()
+
+    def run(self):
+        try:
+            while self._running:
+                if not self.holoPipeReceiver.poll(self.pollInterval):
+                    continue
+
+                (phase, index) = self.holoPipeReceiver.recv()
+                holoImg = cp.asnumpy(Holo.genHologram(phase))
+                holoImgRotated = cv2.rotate(holoImg, cv2.ROTATE_90_CLOCKWISE)
+                if self._running:
+                    self.frameReady.emit(holoImgRotated, index)
+        except (EOFError, OSError):
+            if self._running:
+                self.completed.emit()
+        finally:
+            self.holoPipeReceiver.close()
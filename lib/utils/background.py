@@ -0,0 +1,124 @@
+import threading
+import cv2
+import numpy as np
+from lib.utils.frameWorker import LatestFrameWorker
+
+
+class BackgroundModel:
+    """
+    [背景模型] 相机背景的增量估计与扣除
+
+    以相机视频流逐帧增量更新，每帧开销 O(像素数)：
+    'median' 为增量中值近似，背景每帧向当前像素值移动 step 个灰度级，收敛于时间中值，对移动粒子不敏感；
+    'mean' 为指数滑动平均。模型以相机全帧坐标存储，抓图与视频流检测共用同一模型。
+
+    :var mode: 'median' 或 'mean'
+    :var alpha: 滑动平均系数
+    :var step: 中值近似每帧的步长 (灰度级)
+    :var warmup: 模型可用前所需的帧数
+    :var absolute: True时取差值绝对值，保留暗于背景的特征
+    :var frames: 已累计的帧数
+    """
+
+    MODES = ('median', 'mean')
+
+    def __init__(self, mode='median', alpha=0.05, step=1.0, warmup=30, absolute=False):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown background mode '{mode}', expected one of {self.MODES}")
+
+        self.mode = mode
+        self.alpha = alpha
+        self.step = step
+        self.warmup = warmup
+        self.absolute = absolute
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        [背景模型] 清空模型
+        """
+        with self._lock:
+            self._bg = None
+            self._bg8 = None
+            self.frames = 0
+
+    @property
+    def shape(self):
+        return None if self._bg is None else self._bg.shape
+
+    @property
+    def ready(self) -> bool:
+        return self.frames >= self.warmup
+
+    def update(self, frame):
+        """
+        [背景模型] 以一帧全幅灰度图像更新背景
+
+        :param frame: 单通道相机图像，尺寸变化时模型重新开始累计
+        """
+        with self._lock:
+            if self._bg is None or self._bg.shape != frame.shape:
+                self._bg = frame.astype(np.float32)
+                self._bg8 = frame.copy()
+                self.frames = 1
+                return
+
+            if self.mode == 'mean':
+                cv2.accumulateWeighted(frame, self._bg, self.alpha)
+            else:
+                # 与取整后的8位背景比较，避免逐帧转换浮点
+                above = cv2.compare(frame, self._bg8, cv2.CMP_GT)
+                below = cv2.compare(frame, self._bg8, cv2.CMP_LT)
+                cv2.add(self._bg, self.step, dst=self._bg, mask=above)
+                cv2.subtract(self._bg, self.step, dst=self._bg, mask=below)
+
+            cv2.convertScaleAbs(self._bg, dst=self._bg8)
+            self.frames += 1
+
+    def subtract(self, image, offset=(0, 0)) -> np.ndarray:
+        """
+        [背景模型] 扣除背景，模型未就绪时原样返回
+
+        :param image: 单通道相机图像，可为全帧的子区域
+        :param offset: 子区域左上角在相机图像中的位置 (x, y)
+        :return: 扣除背景后的新图像
+        """
+        if not self.ready:
+            return image
+
+        x, y = offset
+        height, width = image.shape[:2]
+        with self._lock:
+            if y + height > self._bg8.shape[0] or x + width > self._bg8.shape[1]:
+                raise ValueError(
+                    f"Region {(x, y, width, height)} exceeds background model of shape {self._bg8.shape}"
+                )
+            bg = self._bg8[y:y + height, x:x + width]
+            if self.absolute:
+                return cv2.absdiff(image, bg)
+            return cv2.subtract(image, bg)
+
+
+class BackgroundWorker(LatestFrameWorker):
+    """
+    [背景模型] 从相机视频流学习背景，累计指定帧数后自动停止
+
+    :var model: 被更新的背景模型
+    :var frames: 学习的帧数
+    """
+
+    dropSource = 'background'
+
+    def __init__(self, model: BackgroundModel, frames=100):
+        super().__init__()
+        self.model = model
+        self.frames = frames
+
+    def process(self, patch, offset, timestamp):
+        gray = patch if patch.ndim == 2 else cv2.cvtColor(patch, cv2.COLOR_RGB2GRAY)
+        self.model.update(gray)
+
+        if self.processed + 1 >= self.frames:
+            self.requestStop()
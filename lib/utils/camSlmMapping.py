@@ -0,0 +1,96 @@
+import cv2
+import numpy as np
+
+
+class CamSlmMapping:
+    """
+    [坐标映射] 相机视场到SLM目标图平面的几何映射
+
+    每次校准（零级光位置或相机分辨率变化）时计算一次：以零级光为中心截取最大正方形视场，
+    缩放到 fieldSize 后居中放置于 slmSize 画布。图像映射在一次缩放中直接写入复用的输出缓冲区，
+    点坐标映射使用缓存的仿射矩阵，无需重采样图像。
+
+    :var center: 零级光在相机图像中的位置 (x, y)
+    :var camShape: 相机图像尺寸 (高, 宽)
+    :var matrix: 相机 → SLM 的 2x3 仿射矩阵
+    :var invMatrix: SLM → 相机 的 2x3 仿射矩阵
+    """
+
+    def __init__(self, center, camShape, slmSize=1080, fieldSize=610):
+        self.center = (int(center[0]), int(center[1]))
+        self.camShape = tuple(camShape[:2])
+        self.slmSize = slmSize
+        self.fieldSize = fieldSize
+
+        cx, cy = self.center
+        height, width = self.camShape
+        # 零级光到图像边界的最小距离
+        minDist = min(cx, cy, width - cx - 1, height - cy - 1)
+        if minDist <= 0:
+            raise ValueError(f"Zeroth order position {self.center} is outside the camera field")
+
+        self.roi = (cx - minDist, cy - minDist, 2 * minDist, 2 * minDist)
+        self.offset = (slmSize - fieldSize) // 2
+
+        # 以像素中心对齐，与 cv2.resize 的采样方式一致
+        x0, y0, squareSize, _ = self.roi
+        k = fieldSize / squareSize
+        tx = self.offset + (0.5 - x0) * k - 0.5
+        ty = self.offset + (0.5 - y0) * k - 0.5
+        self.matrix = np.array([[k, 0, tx], [0, k, ty]], dtype=np.float64)
+        self.invMatrix = cv2.invertAffineTransform(self.matrix)
+
+        # 输出缓冲区复用，视场外区域始终为0
+        self._outBuf = np.zeros((slmSize, slmSize), dtype=np.uint8)
+        self._fieldView = self._outBuf[
+            self.offset:self.offset + fieldSize, self.offset:self.offset + fieldSize
+        ]
+
+    def matches(self, center, camShape) -> bool:
+        """
+        [坐标映射] 判断缓存的映射是否仍适用于给定的校准参数
+        """
+        return self.center == (int(center[0]), int(center[1])) and self.camShape == tuple(camShape[:2])
+
+    def apply(self, image) -> np.ndarray:
+        """
+        [坐标映射] 将相机图像映射到SLM目标图平面
+
+        返回的数组为内部复用的缓冲区，下一次调用时会被覆盖，需要保留时请自行 copy()
+
+        :param image: 单通道相机图像
+        :return: slmSize x slmSize 图像
+        """
+        if tuple(image.shape[:2]) != self.camShape:
+            raise ValueError(f"Image shape {image.shape[:2]} does not match calibration {self.camShape}")
+
+        x0, y0, w, h = self.roi
+        cv2.resize(
+            image[y0:y0 + h, x0:x0 + w], (self.fieldSize, self.fieldSize),
+            dst=self._fieldView, interpolation=cv2.INTER_AREA
+        )
+
+        return self._outBuf
+
+    @staticmethod
+    def _transform(points, matrix) -> np.ndarray:
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return pts @ matrix[:, :2].T + matrix[:, 2]
+
+    def camToSlm(self, points) -> np.ndarray:
+        """
+        [坐标映射] 相机像素坐标 → SLM目标图坐标
+
+        :param points: (N, 2) 相机坐标 (x, y)
+        :return: (N, 2) SLM坐标
+        """
+        return self._transform(points, self.matrix)
+
+    def slmToCam(self, points) -> np.ndarray:
+        """
+        [坐标映射] SLM目标图坐标 → 相机像素坐标
+
+        :param points: (N, 2) SLM坐标 (x, y)
+        :return: (N, 2) 相机坐标
+        """
+        return self._transform(points, self.invMatrix)
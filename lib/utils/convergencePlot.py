@@ -0,0 +1,93 @@
+import math
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QPainter, QPen, QColor, QPolygonF
+from PyQt6.QtWidgets import QWidget
+
+
+class ConvergencePlot(QWidget):
+    """
+    [迭代遥测] RMSE收敛曲线，纵轴为对数坐标
+
+    以 QPainter 直接绘制，追加数据后只请求一次重绘，开销与迭代次数成正比且远低于迭代本身。
+
+    :var maxIterNum: 横轴范围，迭代次数超出时随之扩展
+    :var target: RMSE阈值，绘制为虚线，None为不绘制
+    :var values: 已收到的RMSE，每次迭代一项，无法在对数坐标上绘制的值 (非正或非有限) 记为NaN
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.maxIterNum = 1
+        self.target = None
+        self.values = []
+        self.setMinimumHeight(80)
+
+    def reset(self, maxIterNum, target=None):
+        """
+        [迭代遥测] 清空曲线，开始新一次计算
+        """
+        self.maxIterNum = max(maxIterNum, 1)
+        self.target = target
+        self.values = []
+        self.update()
+
+    def append(self, values):
+        """
+        [迭代遥测] 追加RMSE，无效值记为NaN以保持横轴与迭代次数对应
+        """
+        self.values.extend(v if v > 0 and math.isfinite(v) else math.nan for v in values)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = QRectF(self.rect()).adjusted(4, 4, -4, -16)
+        painter.setPen(QPen(QColor("#999")))
+        painter.drawRect(rect)
+
+        # NaN 不满足 v > 0
+        valid = [v for v in self.values if v > 0]
+        levels = valid + ([self.target] if self.target and self.target > 0 else [])
+        if not valid:
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "RMSE 收敛曲线")
+            return
+
+        low, high = math.log10(min(levels)), math.log10(max(levels))
+        if high - low < 1e-6:
+            low, high = low - 0.5, high + 0.5
+        span = max(self.maxIterNum, len(self.values)) - 1 or 1
+
+        def toPoint(i, v):
+            x = rect.left() + rect.width() * i / span
+            y = rect.bottom() - rect.height() * (math.log10(v) - low) / (high - low)
+            return QPointF(x, y)
+
+        if self.target and self.target > 0:
+            pen = QPen(QColor("#c33"))
+            pen.setStyle(Qt.PenStyle.DashLine)
+            painter.setPen(pen)
+            y = toPoint(0, self.target).y()
+            painter.drawLine(QPointF(rect.left(), y), QPointF(rect.right(), y))
+
+        # 曲线在无效值处断开
+        painter.setPen(QPen(QColor("#2a7ad5"), 1.5))
+        segment = []
+        for i, v in enumerate(self.values + [math.nan]):
+            if v > 0:
+                segment.append(toPoint(i, v))
+                continue
+            if len(segment) == 1:
+                painter.drawPoint(segment[0])
+            elif segment:
+                painter.drawPolyline(QPolygonF(segment))
+            segment = []
+
+        painter.setPen(QPen(QColor("#666")))
+        painter.drawText(
+            QRectF(rect.left(), rect.bottom(), rect.width(), 16), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            f"{10 ** low:.2g} ~ {10 ** high:.2g}"
+        )
+        painter.drawText(
+            QRectF(rect.left(), rect.bottom(), rect.width(), 16), Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+            f"RMSE {valid[-1]:.4f}"
+        )
@@ -0,0 +1,123 @@
+import abc
+import threading
+from PyQt6.QtCore import QThread
+
+
+class _QThreadABCMeta(type(QThread), abc.ABCMeta):
+    """
+    QThread 与 abc.ABC 的元类组合，使 QThread 子类可声明抽象方法
+    """
+
+
+class LatestFrameWorker(QThread, metaclass=_QThreadABCMeta):
+    """
+    [视频流处理] 只处理最新一帧的相机视频流处理线程
+
+    相机线程通过 submit() 提交帧，仅借用帧缓冲槽位后立即返回；处理线程每次取出最新一帧，
+    处理不及时的旧帧直接丢弃，不会阻塞相机线程或Qt事件循环。子类实现 process()。
+
+    :var roi: 感兴趣区域 (x, y, 宽, 高)，图像坐标，None为全帧
+    :var origin: 图像左上角在相机预览分辨率坐标中的位置，硬件ROI模式下非零
+    :var processed: 已处理帧数
+    :var dropped: 因处理不及时而丢弃的帧数
+    :var stats: 丢帧同时计入的视频流统计 (lib.cam.streamStats.StreamStats)，None为不计入
+    :var dropSource: 计入视频流统计时的来源名称
+    :var maxSlots: 最多同时借用的帧缓冲槽位数：待处理与处理中各一个
+    """
+
+    dropSource = 'worker'
+    maxSlots = 2
+
+    def __init__(self, roi=None, origin=(0, 0)):
+        super().__init__()
+        self.roi = roi
+        self.origin = origin
+        self.processed = 0
+        self.dropped = 0
+        self.stats = None
+
+        self._cond = threading.Condition()
+        self._pending = None
+        self._running = True
+
+    def setRoi(self, roi):
+        """
+        [视频流处理] 设置感兴趣区域
+        """
+        with self._cond:
+            self.roi = roi
+
+    def submit(self, slot):
+        """
+        [视频流处理] 提交一帧，由相机线程调用
+
+        仅借用帧缓冲槽位，不复制图像；尚未处理的旧帧被替换并归还
+
+        :param slot: 帧缓冲槽位，见 lib.cam.frameRing.FrameSlot
+        """
+        with self._cond:
+            if not self._running:
+                return
+
+            slot.acquire()
+            if self._pending is not None:
+                self._pending.release()
+                self.dropped += 1
+                if self.stats is not None:
+                    self.stats.countDrop(self.dropSource)
+            self._pending = slot
+            self._cond.notify()
+
+    def requestStop(self):
+        """
+        [视频流处理] 通知处理线程退出，不等待
+        """
+        with self._cond:
+            self._running = False
+            if self._pending is not None:
+                self._pending.release()
+                self._pending = None
+            self._cond.notify()
+
+    def stop(self):
+        """
+        [视频流处理] 停止处理线程并等待退出
+        """
+        self.requestStop()
+        self.wait()
+
+    @abc.abstractmethod
+    def process(self, patch, offset, timestamp):
+        """
+        [视频流处理] 处理一帧，在处理线程中执行
+
+        :param patch: 感兴趣区域内的图像视图，只读，返回后即归还
+        :param offset: 感兴趣区域左上角在相机预览分辨率坐标中的位置 (x, y)
+        :param timestamp: 帧时间戳 (s)
+        """
+
+    def run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and self._running:
+                    self._cond.wait()
+                if not self._running:
+                    break
+                slot = self._pending
+                self._pending = None
+                roi = self.roi
+
+            try:
+                ox, oy = self.origin
+                if roi is not None:
+                    x, y, w, h = roi
+                    patch = slot.image[y:y + h, x:x + w]
+                    offset = (ox + x, oy + y)
+                else:
+                    patch = slot.image
+                    offset = (ox, oy)
+
+                self.process(patch, offset, slot.timestamp)
+            finally:
+                slot.release()
+            self.processed += 1
@@ -0,0 +1,450 @@
+import math
+import cv2
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from PyQt6.QtCore import QThread, pyqtSignal
+from lib.utils.pointSet import PointSet, PointPairs
+
+
+class PathPlanner:
+    """
+    [路径规划] 基于占据栅格与距离变换的避障路径规划
+
+    每张快照只构建一次占据栅格、距离变换与粗栅格的带权图，之后所有匹配点对共用该缓存，
+    以 scipy 的 Dijkstra 在粗栅格上搜索避障路径。起终点连线无遮挡时直接返回直线，不进入搜索。
+
+    :var shape: 规划区域尺寸 (高, 宽)
+    :var cellSize: 粗栅格边长 (像素)
+    :var clearance: 与障碍粒子中心的最小距离 (像素)
+    :var margin: 安全距离外的代价过渡带宽度 (像素)
+    :var weight: 靠近障碍时的代价权重
+    :var distMap: 全分辨率距离变换结果
+    """
+
+    # 8邻域 (dy, dx, 步长)
+    NEIGHBOURS = (
+        (-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0),
+        (-1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (1, 1, math.sqrt(2))
+    )
+
+    def __init__(self, shape=(1080, 1080), cellSize=10, clearance=20, margin=15, weight=2.0):
+        self.shape = shape
+        self.cellSize = cellSize
+        self.clearance = clearance
+        self.margin = margin
+        self.weight = weight
+        self.gridH = shape[0] // cellSize
+        self.gridW = shape[1] // cellSize
+        self.distMap = None
+        self._cellCost = None
+        self._graph = None
+
+    def buildMap(self, obstacles):
+        """
+        [路径规划] 由障碍粒子构建占据栅格、距离变换与粗栅格代价
+
+        :param obstacles: 障碍粒子中心坐标 (N, 2)，(x, y)
+        """
+        occupancy = np.full(self.shape, 255, dtype=np.uint8)
+
+        pts = np.round(np.asarray(obstacles, dtype=np.float64).reshape(-1, 2)).astype(np.int64)
+        inside = (pts[:, 0] >= 0) & (pts[:, 0] < self.shape[1]) & (pts[:, 1] >= 0) & (pts[:, 1] < self.shape[0])
+        pts = pts[inside]
+        occupancy[pts[:, 1], pts[:, 0]] = 0
+
+        if len(pts):
+            self.distMap = cv2.distanceTransform(occupancy, cv2.DIST_L2, cv2.DIST_MASK_PRECISE)
+        else:
+            self.distMap = np.full(self.shape, np.inf, dtype=np.float32)
+
+        # 以栅格中心处的距离作为该格的距离
+        half = self.cellSize // 2
+        cellDist = self.distMap[half::self.cellSize, half::self.cellSize][:self.gridH, :self.gridW]
+
+        # 安全距离内不可通行，过渡带内代价线性升高
+        penalty = np.clip((self.clearance + self.margin - cellDist) / max(self.margin, 1), 0, 1)
+        cellCost = 1 + self.weight * penalty
+        cellCost[cellDist < self.clearance] = np.inf
+
+        self._cellCost = cellCost
+        self._graph = self._buildGraph(cellCost)
+
+    def _buildGraph(self, cellCost):
+        """
+        粗栅格8邻域带权图，边权为步长乘以目标格代价，不可通行的格子不可进入
+        """
+        gridH, gridW = cellCost.shape
+        index = np.arange(gridH * gridW).reshape(gridH, gridW)
+        rows, cols, weights = [], [], []
+        for dy, dx, step in self.NEIGHBOURS:
+            src = index[max(-dy, 0):gridH - max(dy, 0), max(-dx, 0):gridW - max(dx, 0)].ravel()
+            dst = index[max(dy, 0):gridH - max(-dy, 0), max(dx, 0):gridW - max(-dx, 0)].ravel()
+            weight = cellCost.ravel()[dst] * step
+            passable = np.isfinite(weight)
+            rows.append(src[passable])
+            cols.append(dst[passable])
+            weights.append(weight[passable])
+
+        size = gridH * gridW
+        return csr_matrix((np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))), shape=(size, size))
+
+    def isClear(self, p1, p2, skipStart=True, skipEnd=True) -> bool:
+        """
+        [路径规划] 判断两点连线是否与障碍保持安全距离
+
+        :param p1: 起点 (x, y)
+        :param p2: 终点 (x, y)
+        :param bool skipStart: 起点为粒子自身位置，不计其附近的障碍
+        :param bool skipEnd: 终点为粒子自身位置，不计其附近的障碍
+        :return: 连线是否无遮挡
+        """
+        x1, y1 = float(p1[0]), float(p1[1])
+        dx, dy = float(p2[0]) - x1, float(p2[1]) - y1
+        length = math.hypot(dx, dy)
+        num = max(2, int(math.ceil(length / (self.cellSize / 2))) + 1)
+
+        # 排除粒子自身起终点附近的采样点
+        t = np.arange(num) / (num - 1)
+        along = t * length
+        check = np.ones(num, dtype=bool)
+        if skipStart:
+            check &= along >= self.clearance
+        if skipEnd:
+            check &= along <= length - self.clearance
+        t = t[check]
+
+        xs = np.rint(x1 + dx * t).astype(np.int64)
+        ys = np.rint(y1 + dy * t).astype(np.int64)
+        np.minimum(np.maximum(xs, 0, out=xs), self.shape[1] - 1, out=xs)
+        np.minimum(np.maximum(ys, 0, out=ys), self.shape[0] - 1, out=ys)
+
+        return bool((self.distMap[ys, xs] >= self.clearance).all())
+
+    def isPathClear(self, path) -> bool:
+        """
+        [路径规划] 判断折线路径是否与当前障碍保持安全距离
+
+        :param path: 折线路径 (K, 2)
+        :return: 路径是否无遮挡
+        """
+        last = len(path) - 2
+        return all(
+            self.isClear(path[i], path[i + 1], i == 0, i == last) for i in range(len(path) - 1)
+        )
+
+    @staticmethod
+    def cumLength(path) -> np.ndarray:
+        """
+        [路径规划] 折线路径的累计长度
+
+        :param path: 折线路径 (K, 2)
+        :return: 各折点处的累计长度 (K,)
+        """
+        path = np.asarray(path, dtype=np.float64)
+        return np.concatenate(([0], np.cumsum(np.hypot(*np.diff(path, axis=0).T))))
+
+    def _toCell(self, point) -> int:
+        cx = min(max(int(point[0]) // self.cellSize, 0), self.gridW - 1)
+        cy = min(max(int(point[1]) // self.cellSize, 0), self.gridH - 1)
+        return cy * self.gridW + cx
+
+    def _freedCells(self, point) -> np.ndarray:
+        """
+        起终点自身粒子周围的栅格，搜索时视为可通行
+        """
+        cx, cy = int(point[0]) // self.cellSize, int(point[1]) // self.cellSize
+        r = int(math.ceil(self.clearance / self.cellSize))
+        ys = np.arange(max(cy - r, 0), min(cy + r + 1, self.gridH))
+        xs = np.arange(max(cx - r, 0), min(cx + r + 1, self.gridW))
+
+        return (ys[:, None] * self.gridW + xs[None, :]).ravel()
+
+    def _search(self, start, end):
+        """
+        粗栅格最短路径搜索
+
+        以起点粒子周围的栅格为多源起点一次求出到各格的最短距离，终点粒子周围的栅格中
+        取距离加到终点格的八方向距离最小者作为出口。
+
+        :return: 栅格索引序列，首尾分别为起点格与终点格，不可达时返回None
+        """
+        startCell, endCell = self._toCell(start), self._toCell(end)
+        dist, predecessors, _ = dijkstra(
+            self._graph, indices=self._freedCells(start), min_only=True, return_predecessors=True
+        )
+
+        exits = self._freedCells(end)
+        ey, ex = divmod(endCell, self.gridW)
+        ys, xs = np.divmod(exits, self.gridW)
+        dy, dx = np.abs(ys - ey), np.abs(xs - ex)
+        total = dist[exits] + dx + dy + (math.sqrt(2) - 2) * np.minimum(dx, dy)
+        best = int(np.argmin(total))
+        if not np.isfinite(total[best]):
+            return None
+
+        cells = [endCell]
+        cur = int(exits[best])
+        while cur >= 0:
+            if cur != cells[-1]:
+                cells.append(cur)
+            cur = int(predecessors[cur])
+        if cells[-1] != startCell:
+            cells.append(startCell)
+
+        return cells[::-1]
+
+    def _smooth(self, waypoints):
+        """
+        视线剪枝，去除栅格路径上多余的折点
+        """
+        last = len(waypoints) - 1
+        smoothed = [waypoints[0]]
+        i = 0
+        while i < last:
+            # 沿路径向前延伸，直到视线被遮挡
+            j = i + 1
+            while j < last and self.isClear(waypoints[i], waypoints[j + 1], i == 0, j + 1 == last):
+                j += 1
+            smoothed.append(waypoints[j])
+            i = j
+
+        return smoothed
+
+    def planPath(self, start, end) -> np.ndarray:
+        """
+        [路径规划] 规划单个粒子从起点到终点的路径
+
+        搜索失败时退化为直线
+
+        :param start: 起点 (x, y)
+        :param end: 终点 (x, y)
+        :return: 折线路径 (K, 2)，首尾分别为起点与终点
+        """
+        if self.distMap is None:
+            raise RuntimeError("Occupancy map not built, call buildMap() first")
+
+        start = (int(start[0]), int(start[1]))
+        end = (int(end[0]), int(end[1]))
+
+        if self.isClear(start, end):
+            return np.array([start, end])
+
+        cells = self._search(start, end)
+        if cells is None:
+            return np.array([start, end])
+
+        half = self.cellSize // 2
+        waypoints = [start]
+        for idx in cells[1:-1]:
+            y, x = divmod(idx, self.gridW)
+            waypoints.append((x * self.cellSize + half, y * self.cellSize + half))
+        waypoints.append(end)
+
+        return np.array(self._smooth(waypoints))
+
+    def planAll(self, matchedPairs) -> list:
+        """
+        [路径规划] 为全部匹配点对规划路径
+
+        :param matchedPairs: 匹配点对，迭代时给出 (终点, 起点)，与 FeaturesDetect.match 输出一致
+        :return: 与matchedPairs一一对应的折线路径列表
+        """
+        return [self.planPath(start, end) for end, start in matchedPairs]
+
+
+class SequencePlanner:
+    """
+    [路径规划] 移动序列规划与粒子漂移后的增量重规划
+
+    记录每个匹配点对在帧序列中的起始帧与帧数。重规划时以上一次的匹配结果为初值关联新识别的粒子，
+    仅对尚未开始移动且受漂移影响的光阱重新规划路径，已计算的帧保持不变。
+
+    :var planner: 路径规划器
+    :var stepLength: 每帧移动步长 (像素)，与 FrameGeneratorWorker 一致
+    :var matchedPairs: 匹配点对
+    :var paths: 与matchedPairs对应的折线路径
+    :var targets: 目标点坐标
+    """
+
+    def __init__(self, planner=None, stepLength=5):
+        self.planner = planner if planner is not None else PathPlanner()
+        self.stepLength = stepLength
+        self.matchedPairs = PointPairs(PointSet(np.zeros((0, 2))), PointSet(np.zeros((0, 2))))
+        self.paths = []
+        self.targets = np.zeros((0, 2))
+        self._frameStarts = np.zeros(0, dtype=np.int64)
+        self._frameCounts = np.zeros(0, dtype=np.int64)
+
+    def frameCount(self, path) -> int:
+        """
+        [路径规划] 单个点对移动所需帧数，包括起始帧与结束帧
+
+        :param path: 折线路径
+        :return: 帧数
+        """
+        return max(1, int(math.ceil(PathPlanner.cumLength(path)[-1] / self.stepLength))) + 1
+
+    def _updateFrameRanges(self):
+        self._frameCounts = np.array([self.frameCount(path) for path in self.paths], dtype=np.int64)
+        self._frameStarts = np.concatenate(([0], np.cumsum(self._frameCounts)[:-1])).astype(np.int64)
+
+    @property
+    def totalFrames(self) -> int:
+        return int(self._frameCounts.sum())
+
+    def plan(self, matchedPairs, particles, targets) -> list:
+        """
+        [路径规划] 首次规划全部点对的路径
+
+        :param PointPairs matchedPairs: 匹配点对
+        :param particles: 视场内全部粒子，含未匹配粒子
+        :param targets: 目标点
+        :return: 折线路径列表
+        """
+        self.matchedPairs = matchedPairs
+        self.targets = np.asarray(targets).reshape(-1, 2)
+        self.planner.buildMap(np.vstack((np.asarray(particles).reshape(-1, 2), self.targets)))
+        self.paths = self.planner.planAll(self.matchedPairs)
+        self._updateFrameRanges()
+
+        return self.paths
+
+    def _positionAt(self, index, frame) -> np.ndarray:
+        """
+        第index个点对在第frame帧时光阱的位置
+        """
+        end, start = self.matchedPairs[index]
+        offset = frame - self._frameStarts[index]
+        if offset >= self._frameCounts[index] - 1:
+            return np.asarray(end, dtype=np.float64)
+        if offset <= 0:
+            return np.asarray(start, dtype=np.float64)
+
+        path = np.asarray(self.paths[index], dtype=np.float64)
+        cumLength = PathPlanner.cumLength(path)
+        s = cumLength[-1] * offset / (self._frameCounts[index] - 1)
+
+        return np.array([np.interp(s, cumLength, path[:, 0]), np.interp(s, cumLength, path[:, 1])])
+
+    @staticmethod
+    def _greedyAssign(refPts, pts, maxDist=np.inf):
+        """
+        按距离由近到远贪心关联两组点
+
+        :return: refPts中每个点关联到的pts索引，未关联为-1
+        """
+        assigned = np.full(len(refPts), -1, dtype=np.int64)
+        if len(refPts) == 0 or len(pts) == 0:
+            return assigned
+
+        dist = np.linalg.norm(refPts[:, None, :] - pts[None, :, :], axis=2)
+        usedPts = np.zeros(len(pts), dtype=bool)
+        for flat in np.argsort(dist, axis=None):
+            i, j = divmod(int(flat), len(pts))
+            if dist[i, j] > maxDist:
+                break
+            if assigned[i] < 0 and not usedPts[j]:
+                assigned[i] = j
+                usedPts[j] = True
+
+        return assigned
+
+    def replan(self, freshPoints, computedFrames, maxDrift=30, tolerance=3):
+        """
+        [路径规划] 根据新识别的粒子位置增量重规划
+
+        已开始移动的光阱（起始帧已计算）保持原路径；其余点对以原起点为初值关联新识别的粒子，
+        漂移超过容差、重新关联或原路径被遮挡的点对重新规划路径。找不到对应粒子的点对被移除，
+        其余点对保留原编号。
+
+        :param freshPoints: 新识别的粒子点集
+        :param int computedFrames: 已计算完成的帧数
+        :param maxDrift: 视为同一粒子的最大漂移距离 (像素)
+        :param tolerance: 无需重规划的漂移容差 (像素)
+        :return: (首个失效帧序号, 重规划的点对索引列表)，无变化时首个失效帧序号为None
+        """
+        fresh = freshPoints if isinstance(freshPoints, PointSet) else PointSet(freshPoints)
+        ends, starts = self.matchedPairs.ends, self.matchedPairs.starts
+        started = self._frameStarts < computedFrames
+
+        # 以上一次匹配时的光阱位置为初值关联新粒子，已开始移动的光阱取其当前位置
+        refPts = starts.xy.copy()
+        for i in np.flatnonzero(started):
+            refPts[i] = self._positionAt(i, computedFrames - 1)
+        assigned = self._greedyAssign(refPts, fresh.xy, maxDrift)
+
+        # 丢失粒子的点对改用剩余的空闲粒子，按就近原则重新匹配
+        orphans = np.flatnonzero((assigned < 0) & ~started)
+        freeIdx = np.setdiff1d(np.arange(len(fresh)), assigned[assigned >= 0])
+        if len(orphans) and len(freeIdx):
+            reassigned = self._greedyAssign(refPts[orphans], fresh.xy[freeIdx])
+            ok = reassigned >= 0
+            assigned[orphans[ok]] = freeIdx[reassigned[ok]]
+
+        self.planner.buildMap(np.vstack((fresh.xy, self.targets)))
+
+        keep = started | (assigned >= 0)
+        startXY = starts.xy.copy()
+        paths, replanned = [], []
+        changed = not keep.all()
+        for i in np.flatnonzero(keep):
+            if started[i]:
+                paths.append(self.paths[i])
+                continue
+
+            j = assigned[i]
+            if np.linalg.norm(fresh.xy[j] - starts.xy[i]) > tolerance:
+                startXY[i] = fresh.xy[j]
+            elif self.planner.isPathClear(self.paths[i]):
+                paths.append(self.paths[i])
+                continue
+
+            changed = True
+            replanned.append(len(paths))
+            paths.append(self.planner.planPath(startXY[i], ends.xy[i]))
+
+        if not changed:
+            return None, []
+
+        self.matchedPairs = PointPairs(ends.take(keep), PointSet(startXY[keep], starts.ids[keep]))
+        self.paths = paths
+        self._updateFrameRanges()
+
+        return computedFrames, replanned
+
+
+class PlanWorker(QThread):
+    """
+    [路径规划] 在后台线程中执行 SequencePlanner 的首次规划或增量重规划，不阻塞UI线程
+
+    规划期间不可访问 sequencePlanner，完成后发出 plannedSig，结果为 plan() 或 replan() 的返回值。
+
+    :var plannedSig: 规划结果信号
+    :var failedSig: 规划失败信号 (错误信息)
+    """
+
+    plannedSig = pyqtSignal(object)
+    failedSig = pyqtSignal(str)
+
+    def __init__(self, sequencePlanner, *args, replan=False, parent=None):
+        """
+        :param SequencePlanner sequencePlanner: 规划器
+        :param args: plan() 或 replan() 的参数
+        :param bool replan: 执行 replan()，否则执行 plan()
+        """
+        super().__init__(parent)
+        self.sequencePlanner = sequencePlanner
+        self.args = args
+        self.replan = replan
+
+    def run(self):
+        try:
+            if self.replan:
+                result = self.sequencePlanner.replan(*self.args)
+            else:
+                result = self.sequencePlanner.plan(*self.args)
+        except Exception as e:
+            self.failedSig.emit(f"{type(e).__name__}: {e}")
+            return
+        self.plannedSig.emit(result)
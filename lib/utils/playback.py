@@ -0,0 +1,174 @@
+import time
+from collections import deque
+import numpy as np
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal
+
+
+class PlaybackScheduler(QObject):
+    """
+    [序列播放] 按截止时刻调度全息图序列的播放
+
+    计算结果由 push() 加入缓冲区，缓冲达到 minBuffer 帧 (或计算已结束) 后开始播放，
+    每帧按上一帧的截止时刻加播放间隔定时发出，定时误差不会累积；落后超过一帧间隔时重新对齐，不补发。
+    缓冲区在计算结束前取空时记为一次欠载，保持当前帧直到缓冲区重新达到 minBuffer 帧。
+    adaptive 为真时播放速率跟随计算速率：缓冲多于 minBuffer 时加快，少于时减慢，不超过 targetFps。
+    全部在UI线程中以单次定时器推进，不阻塞事件循环。
+
+    :var targetFps: 目标播放帧率
+    :var minBuffer: 开始或恢复播放所需的缓冲帧数
+    :var adaptive: 是否按计算速率调整播放速率
+    :var frameDue: 显示信号 (全息图, 帧序号)
+    :var finished: 计算结束且缓冲区播放完毕
+    :var shown: 已播放帧数
+    :var underruns: 欠载次数
+    :var stallTime: 因欠载而保持当前帧的总时间 (s)
+    :var late: 因定时落后超过一帧间隔而重新对齐的次数
+    """
+
+    frameDue = pyqtSignal(object, int)
+    finished = pyqtSignal()
+
+    targetFps = 20
+    minBuffer = 5
+    adaptive = True
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = deque()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+        self._active = False
+        self._reset()
+
+    def _reset(self):
+        self._buffer.clear()
+        self._playing = False
+        self._ended = False
+        self._deadline = 0
+        self._stallStart = None
+        self._lastPush = None
+        self._computeInterval = None
+        self.shown = 0
+        self.underruns = 0
+        self.stallTime = 0
+        self.late = 0
+
+    def isActive(self):
+        return self._active
+
+    @property
+    def depth(self):
+        """
+        [序列播放] 缓冲区中待播放的帧数
+        """
+        return len(self._buffer)
+
+    @property
+    def computeFps(self):
+        """
+        [序列播放] 平滑后的计算速率 (fps)，尚无测量时为0
+        """
+        return 1 / self._computeInterval if self._computeInterval else 0
+
+    def interval(self):
+        """
+        [序列播放] 当前播放间隔 (s)
+        """
+        interval = 1 / self.targetFps
+        if self.adaptive and not self._ended and self._computeInterval is not None:
+            # 缓冲区维持在 minBuffer 帧附近，此时播放速率等于计算速率
+            scale = np.clip(self.minBuffer / max(len(self._buffer), 1), 0.5, 2)
+            interval = max(interval, self._computeInterval * scale)
+        return interval
+
+    def start(self):
+        """
+        [序列播放] 开始接收计算结果，已在播放时 (如重规划) 保留缓冲区继续播放
+        """
+        if self._active:
+            self._ended = False
+            return
+
+        self._reset()
+        self._active = True
+
+    def push(self, holoImg, index):
+        """
+        [序列播放] 加入一帧计算结果
+
+        :param holoImg: 全息图
+        :param int index: 帧序号
+        """
+        if not self._active:
+            return
+
+        now = time.perf_counter()
+        if self._lastPush is not None:
+            interval = now - self._lastPush
+            self._computeInterval = interval if self._computeInterval is None \
+                else 0.8 * self._computeInterval + 0.2 * interval
+        self._lastPush = now
+
+        self._buffer.append((holoImg, index))
+        if not self._playing and len(self._buffer) >= self.minBuffer:
+            self._resume()
+
+    def endOfStream(self):
+        """
+        [序列播放] 计算已结束，播放完缓冲区后发出 finished
+        """
+        if not self._active:
+            return
+
+        self._ended = True
+        if not self._playing:
+            self._resume()
+
+    def stop(self):
+        """
+        [序列播放] 中止播放并清空缓冲区，不发出 finished
+        """
+        self._timer.stop()
+        self._active = False
+        self._reset()
+
+    def _resume(self):
+        now = time.perf_counter()
+        if self._stallStart is not None:
+            self.stallTime += now - self._stallStart
+            self._stallStart = None
+
+        self._playing = True
+        self._deadline = now
+        self._tick()
+
+    def _tick(self):
+        if not self._buffer:
+            if self._ended:
+                self._active = False
+                self._playing = False
+                self.finished.emit()
+            else:
+                # 欠载：保持当前帧，等待缓冲区重新填充
+                self.underruns += 1
+                self._playing = False
+                self._stallStart = time.perf_counter()
+            return
+
+        holoImg, index = self._buffer.popleft()
+        self.shown += 1
+        self.frameDue.emit(holoImg, index)
+
+        # 信号处理中可能已中止播放
+        if not self._playing:
+            return
+
+        interval = self.interval()
+        now = time.perf_counter()
+        if now - self._deadline > interval:
+            self.late += 1
+            self._deadline = now
+        self._deadline += interval
+        self._timer.start(max(round((self._deadline - now) * 1000), 0))
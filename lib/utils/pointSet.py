@@ -0,0 +1,112 @@
+import numpy as np
+
+
+class PointSet:
+    """
+    [点集] 连续数组存储的点集
+
+    识别、排序、匹配与路径帧生成各阶段统一使用本结构，以整数索引和向量化运算代替坐标元组哈希。
+    可直接传入 np.asarray / np.vstack，得到 (N, 2) 坐标数组。
+
+    :var xy: (N, 2) 坐标 (x, y)，float64，C连续
+    :var ids: (N,) 点的整数编号，取子集时保持不变
+    :var radius: (N,) 光斑半径，可为None
+    :var intensity: (N,) 光斑强度，可为None
+    """
+
+    def __init__(self, xy, ids=None, radius=None, intensity=None):
+        self.xy = np.ascontiguousarray(xy, dtype=np.float64).reshape(-1, 2)
+        self.ids = np.arange(len(self.xy), dtype=np.int64) if ids is None else np.asarray(ids, dtype=np.int64)
+        self.radius = None if radius is None else np.asarray(radius, dtype=np.float64)
+        self.intensity = None if intensity is None else np.asarray(intensity, dtype=np.float64)
+
+    @classmethod
+    def fromSpots(cls, spots):
+        """
+        [点集] 由光斑检测结果构建
+
+        :param spots: (N, 3) 光斑中心与半径 (x, y, r)
+        """
+        spots = np.asarray(spots, dtype=np.float64).reshape(-1, 3)
+        return cls(spots[:, :2], radius=spots[:, 2])
+
+    def __len__(self):
+        return len(self.xy)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.xy if dtype is None else self.xy.astype(dtype)
+
+    def __getitem__(self, index):
+        return self.take(index)
+
+    def __repr__(self):
+        return f"PointSet(n={len(self)})"
+
+    def take(self, index):
+        """
+        [点集] 按索引或布尔掩码取子集，编号与附加列随之保留
+
+        :param index: 整数索引数组、切片或布尔掩码
+        :return: 子点集
+        """
+        if isinstance(index, (int, np.integer)):
+            index = [index]
+        return PointSet(
+            self.xy[index],
+            self.ids[index],
+            None if self.radius is None else self.radius[index],
+            None if self.intensity is None else self.intensity[index]
+        )
+
+    def asInt(self) -> np.ndarray:
+        """
+        [点集] 取整后的坐标，用于绘图
+
+        :return: (N, 2) int 坐标
+        """
+        return np.round(self.xy).astype(int)
+
+    def point(self, i) -> tuple:
+        """
+        [点集] 第i个点的整数坐标元组，可直接用于cv2绘图
+        """
+        return int(round(self.xy[i, 0])), int(round(self.xy[i, 1]))
+
+    def distTo(self, other) -> np.ndarray:
+        """
+        [点集] 与另一点集的两两欧氏距离
+
+        :param other: 点集或 (M, 2) 坐标
+        :return: (N, M) 距离矩阵
+        """
+        otherXY = np.asarray(other, dtype=np.float64).reshape(-1, 2)
+        return np.linalg.norm(self.xy[:, None, :] - otherXY[None, :, :], axis=2)
+
+
+class PointPairs:
+    """
+    [点集] 按行对齐的匹配点对
+
+    迭代或索引时返回 (终点坐标, 起点坐标)，与原 [(终点, 起点), ...] 列表用法一致
+
+    :var ends: 终点 (目标点) 点集
+    :var starts: 起点 (当前粒子) 点集
+    """
+
+    def __init__(self, ends: PointSet, starts: PointSet):
+        if len(ends) != len(starts):
+            raise ValueError(f"Unaligned pairs: {len(ends)} ends, {len(starts)} starts")
+        self.ends = ends
+        self.starts = starts
+
+    def __len__(self):
+        return len(self.ends)
+
+    def __getitem__(self, i):
+        return self.ends.xy[i], self.starts.xy[i]
+
+    def __iter__(self):
+        return zip(self.ends.xy, self.starts.xy)
+
+    def __repr__(self):
+        return f"PointPairs(n={len(self)})"
@@ -0,0 +1,304 @@
+import time
+import threading
+import cv2
+import numpy as np
+from PyQt6.QtCore import QObject, QEvent, QTimer, pyqtSignal
+
+
+class LatencyReport:
+    """
+    [延迟测量] SLM显示到相机成像的延迟与液晶稳定时间统计
+
+    每次切换按方向分组 ('rise' 为 A→B，'fall' 为 B→A)，各项均为 (s)，无法测得时为 NaN：
+    display 为发出全息图到副屏重绘，onset 为发出到相机光强变化达 onsetLevel，
+    settling 为 onset 到稳定在 settleLevel 容差内，total 为发出到稳定。
+
+    :var trials: 每次切换的结果字典列表
+    :var frameInterval: 相机帧间隔 (s)，为各项时间的分辨率
+    """
+
+    ITEMS = ('display', 'onset', 'settling', 'total')
+
+    def __init__(self, trials, frameInterval):
+        self.trials = trials
+        self.frameInterval = frameInterval
+
+    def values(self, item, direction=None):
+        """
+        [延迟测量] 某一项的全部有效测量值
+
+        :param item: ITEMS 之一
+        :param direction: 'rise'、'fall'，None为全部
+        :return: (N,) 数组 (s)
+        """
+        values = np.array([
+            trial[item] for trial in self.trials if direction is None or trial['direction'] == direction
+        ], dtype=np.float64)
+        return values[np.isfinite(values)]
+
+    def summary(self):
+        """
+        [延迟测量] 各项的中位数、P90、最小与最大值 (ms) 表格
+        """
+        lines = [
+            f"frame interval {self.frameInterval * 1e3:.1f} ms, {len(self.trials)} switches",
+            f"{'':<18}{'n':>4}{'median':>10}{'p90':>10}{'min':>10}{'max':>10}",
+        ]
+        for direction in ('rise', 'fall'):
+            for item in self.ITEMS:
+                values = self.values(item, direction) * 1e3
+                if len(values) == 0:
+                    lines.append(f"{f'{direction} {item}':<18}{0:>4}{'-':>10}{'-':>10}{'-':>10}{'-':>10}")
+                    continue
+                lines.append(
+                    f"{f'{direction} {item}':<18}{len(values):>4}{np.median(values):>10.1f}"
+                    f"{np.percentile(values, 90):>10.1f}{values.min():>10.1f}{values.max():>10.1f}"
+                )
+
+        return "\n".join(lines)
+
+
+class SlmLatencyProbe(QObject):
+    """
+    [延迟测量] 交替显示两幅测试全息图，测量从发出全息图到相机图像稳定的延迟
+
+    先分别显示两幅图样并取稳定后的平均帧作为参考 A、B，以二者差异 D=B-A 的显著区域为探测区；
+    之后交替切换，每帧以 <帧-A, D>/<D, D> 归一化为 0 (A) 到 1 (B) 的响应，
+    与发出时刻、副屏重绘时刻比较得到延迟与稳定时间。显示控件有 presented 信号 (SlmPresenter) 时，
+    以交换缓冲区的时刻为显示时刻，否则以重绘事件的时刻近似。
+
+    相机时间戳经 min(到达时刻 - 时间戳) 换算为本机时钟，消除回调调度抖动。
+    在UI线程中以定时器推进，帧在相机线程中缩小后计算响应，不阻塞取流。
+
+    :var progress: 进度信号 (已完成切换数, 总切换数)
+    :var finished: 结束信号，参数为 LatencyReport，失败时为异常
+    """
+
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+
+    def __init__(self, cam, display, paintWidget=None, patterns=None,
+                 trials=20, hold=0.5, onsetLevel=0.1, settleLevel=0.9, scale=4):
+        """
+        :param cam: CameraMiddleware，需已打开
+        :param display: 显示全息图的回调，签名为 display(holoImg)
+        :param paintWidget: 显示全息图的控件，用于记录显示时刻，可为None
+        :param patterns: 两幅测试全息图 (A, B)，默认为 testPatterns()
+        :param trials: 切换次数
+        :param hold: 每幅图样的保持时间 (s)，应大于延迟与稳定时间之和
+        :param onsetLevel: 视为开始响应的归一化光强变化
+        :param settleLevel: 视为稳定的归一化光强，此后保持在 [settleLevel, 2 - settleLevel] 内
+        :param scale: 计算响应前的缩小倍数
+        """
+        super().__init__()
+        self.cam = cam
+        self.display = display
+        self.paintWidget = paintWidget
+        self.patterns = testPatterns() if patterns is None else patterns
+        self.trials = trials
+        self.hold = hold
+        self.onsetLevel = onsetLevel
+        self.settleLevel = settleLevel
+        self.scale = scale
+
+        self._lock = threading.Lock()
+        self._offset = np.inf
+        self._collect = None
+        self._probe = None
+        self._samples = []
+        self._paints = []
+        self._switches = []
+        self._refs = []
+        self._running = False
+
+    # ==== 相机线程 ====
+
+    def _onFrame(self, slot):
+        arrival = time.perf_counter()
+        self._offset = min(self._offset, arrival - slot.timestamp)
+
+        image = slot.image
+        small = cv2.resize(
+            image, (image.shape[1] // self.scale, image.shape[0] // self.scale), interpolation=cv2.INTER_AREA
+        )
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+
+        with self._lock:
+            if self._collect is not None:
+                self._collect.append(small.astype(np.float32))
+            elif self._probe is not None:
+                mask, ref, diff, norm = self._probe
+                response = float(np.dot(small[mask].astype(np.float32) - ref, diff)) / norm
+                self._samples.append((slot.timestamp, response))
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            self._paints.append(time.perf_counter())
+        return False
+
+    def _onPresented(self, frameId, timestamp):
+        self._paints.append(timestamp)
+
+    # ==== UI线程 ====
+
+    def start(self):
+        """
+        [延迟测量] 开始测量，结束后发出 finished
+        """
+        if not self.cam.device:
+            raise RuntimeError("Camera is not opened")
+
+        self._running = True
+        self._refs = []
+        self._samples = []
+        self._paints = []
+        self._switches = []
+        self.cam.frameConsumers.append(self._onFrame)
+        if hasattr(self.paintWidget, 'presented'):
+            self.paintWidget.presented.connect(self._onPresented)
+        elif self.paintWidget is not None:
+            self.paintWidget.installEventFilter(self)
+        self._calibrate(0)
+
+    def stop(self):
+        """
+        [延迟测量] 中止测量
+        """
+        if self._running:
+            self._finish(RuntimeError("Latency measurement aborted"))
+
+    def _calibrate(self, index):
+        """
+        显示第 index 幅图样，稳定后取后半段的平均帧作为参考
+        """
+        self.display(self.patterns[index])
+
+        def begin():
+            with self._lock:
+                self._collect = []
+            QTimer.singleShot(int(self.hold * 500), end)
+
+        def end():
+            if not self._running:
+                return
+            with self._lock:
+                frames, self._collect = self._collect, None
+            if not frames:
+                self._finish(RuntimeError("No camera frames received"))
+                return
+
+            self._refs.append(np.mean(frames, axis=0))
+            if index == 0:
+                self._calibrate(1)
+            else:
+                self._prepareProbe()
+
+        QTimer.singleShot(int(self.hold * 1000), lambda: self._running and begin())
+
+    def _prepareProbe(self):
+        """
+        以参考帧之差的显著区域为探测区，开始交替切换
+        """
+        refA, refB = self._refs
+        diff = refB - refA
+        peak = np.abs(diff).max()
+        # 差异需明显高于相机噪声
+        if peak < 10:
+            self._finish(RuntimeError(f"No intensity change between test patterns (peak {peak:.1f})"))
+            return
+
+        mask = np.abs(diff) > 0.2 * peak
+        diffMasked = diff[mask]
+        with self._lock:
+            self._probe = (mask, refA[mask], diffMasked, float(np.dot(diffMasked, diffMasked)))
+
+        self._switch(0)
+
+    def _switch(self, index):
+        if not self._running:
+            return
+        if index >= self.trials:
+            self._finish(self._analyze())
+            return
+
+        # 校准结束时显示B，首次切换为 B→A
+        target = 0 if index % 2 == 0 else 1
+        self._switches.append((time.perf_counter(), 'fall' if target == 0 else 'rise'))
+        self.display(self.patterns[target])
+
+        self.progress.emit(index, self.trials)
+        QTimer.singleShot(int(self.hold * 1000), lambda: self._switch(index + 1))
+
+    def _analyze(self):
+        """
+        逐次切换计算延迟与稳定时间
+        """
+        with self._lock:
+            samples = np.array(self._samples, dtype=np.float64).reshape(-1, 2)
+        if len(samples) < 2:
+            return RuntimeError("No camera frames received")
+
+        # 相机时间戳换算为本机时钟
+        times = samples[:, 0] + self._offset
+        responses = samples[:, 1]
+        paints = np.array(self._paints)
+        frameInterval = float(np.median(np.diff(samples[:, 0])))
+
+        results = []
+        for k, (emitTime, direction) in enumerate(self._switches):
+            end = self._switches[k + 1][0] if k + 1 < len(self._switches) else emitTime + self.hold
+            window = (times >= emitTime) & (times < end)
+            t = times[window]
+            level = responses[window] if direction == 'rise' else 1 - responses[window]
+
+            later = paints[paints >= emitTime]
+            display = later[0] - emitTime if len(later) and later[0] < end else np.nan
+
+            onset = settled = np.nan
+            crossed = np.nonzero(level >= self.onsetLevel)[0]
+            if len(crossed):
+                onset = t[crossed[0]]
+                # 最后一个落在容差外的帧之后即为稳定
+                outside = np.nonzero(np.abs(1 - level) > 1 - self.settleLevel)[0]
+                last = outside[-1] + 1 if len(outside) else 0
+                if last < len(t):
+                    settled = t[max(last, crossed[0])]
+
+            results.append({
+                'direction': direction,
+                'display': display,
+                'onset': onset - emitTime,
+                'settling': settled - onset,
+                'total': settled - emitTime,
+            })
+
+        return LatencyReport(results, frameInterval)
+
+    def _finish(self, result):
+        self._running = False
+        with self._lock:
+            self._collect = None
+            self._probe = None
+        if self._onFrame in self.cam.frameConsumers:
+            self.cam.frameConsumers.remove(self._onFrame)
+        if hasattr(self.paintWidget, 'presented'):
+            self.paintWidget.presented.disconnect(self._onPresented)
+        elif self.paintWidget is not None:
+            self.paintWidget.removeEventFilter(self)
+
+        self.finished.emit(result)
+
+
+def testPatterns(size=1080, period=8):
+    """
+    [延迟测量] 默认测试全息图：平面相位 (光集中于零级) 与闪耀光栅 (光偏折至一级)
+
+    :param size: 全息图边长
+    :param period: 光栅周期 (像素)
+    :return: (A, B) 8位相位图
+    """
+    yy, xx = np.mgrid[0:size, 0:size]
+    blank = np.zeros((size, size), dtype=np.uint8)
+    grating = (((xx + yy) % period) * (256 // period)).astype(np.uint8)
+    return blank, grating
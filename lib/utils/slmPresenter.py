@@ -0,0 +1,243 @@
+import time
+from collections import deque
+import cv2
+import numpy as np
+from PyQt6 import sip
+from PyQt6.QtCore import Qt, QRect, QRectF, pyqtSignal
+from PyQt6.QtGui import QPainter, QColor
+from PyQt6.QtOpenGL import QOpenGLTexture, QOpenGLTextureBlitter, QOpenGLPixelTransferOptions
+from PyQt6.QtOpenGLWidgets import QOpenGLWidget
+
+
+class PresentQueue:
+    """
+    [SLM显示] 待显示全息图队列与逐帧显示统计，与绘制方式无关
+
+    每次垂直同步最多取出一帧显示。队列已满时丢弃最旧的帧；
+    某帧显示时下一帧已在队列中，则两帧应相隔一个刷新周期，多出的周期计为重复显示 (错过垂直同步)。
+
+    :var maxPending: 队列容量
+    :var presented: 已显示帧数
+    :var dropped: 因队列已满未显示即被丢弃的帧数
+    :var repeated: 上一帧因错过垂直同步而多显示的刷新周期数
+    :var presentLog: 最近的 (帧号, 显示时刻 perf_counter s)
+    """
+
+    def __init__(self, maxPending=3, logSize=1000):
+        self.maxPending = maxPending
+        self.presented = 0
+        self.dropped = 0
+        self.repeated = 0
+        self.presentLog = deque(maxlen=logSize)
+
+        self._queue = deque()
+        self._nextId = 0
+        self._lastPresent = None
+        self._backToBack = False
+
+    def __len__(self):
+        return len(self._queue)
+
+    def push(self, image):
+        """
+        [SLM显示] 加入一帧
+
+        :param image: 全息图，None为清空显示
+        :return: 帧号
+        """
+        if len(self._queue) >= self.maxPending:
+            self._queue.popleft()
+            self.dropped += 1
+
+        frameId = self._nextId
+        self._nextId += 1
+        self._queue.append((frameId, image))
+        return frameId
+
+    def pop(self):
+        """
+        [SLM显示] 取出下一帧，在绘制时调用
+
+        :return: (帧号, 全息图)，队列为空时为None
+        """
+        return self._queue.popleft() if self._queue else None
+
+    def swapped(self, frameId, timestamp, period):
+        """
+        [SLM显示] 记录一帧已显示，在交换缓冲区后调用
+
+        :param frameId: 帧号
+        :param timestamp: 显示时刻 (s)
+        :param period: 显示器刷新周期 (s)
+        """
+        if self._backToBack and self._lastPresent is not None and period > 0:
+            self.repeated += max(round((timestamp - self._lastPresent) / period) - 1, 0)
+
+        self.presented += 1
+        self.presentLog.append((frameId, timestamp))
+        self._lastPresent = timestamp
+        self._backToBack = len(self._queue) > 0
+
+    def reset(self):
+        """
+        [SLM显示] 清空统计
+        """
+        self.presented = 0
+        self.dropped = 0
+        self.repeated = 0
+        self.presentLog.clear()
+        self._lastPresent = None
+        self._backToBack = False
+
+
+class SlmPresenter(QOpenGLWidget):
+    """
+    [SLM显示] 以OpenGL纹理显示全息图，每次垂直同步最多显示一帧
+
+    全息图上传到复用的纹理中，以1:1像素居中绘制，不经 QImage/QPixmap 转换与缩放。
+    present() 将全息图加入队列，交换缓冲区后才绘制下一帧，显示节奏由垂直同步决定。
+    传入的数组在显示前不可修改。
+
+    :var queue: 待显示队列与显示统计，见 PresentQueue
+    :var presented: 显示信号 (帧号, 显示时刻 perf_counter s)
+    """
+
+    presented = pyqtSignal(int, float)
+
+    def __init__(self, parent=None, maxPending=3):
+        super().__init__(parent)
+        surfaceFormat = self.format()
+        surfaceFormat.setSwapInterval(1)
+        self.setFormat(surfaceFormat)
+
+        self.queue = PresentQueue(maxPending)
+        self.placeholder = ""
+
+        self._texture = None
+        self._textureKey = None
+        self._blitter = None
+        self._swizzle = False
+        self._transfer = QOpenGLPixelTransferOptions()
+        self._transfer.setAlignment(1)
+        self._imageSize = None
+        self._uploaded = None
+        self._scheduled = False
+
+        self.frameSwapped.connect(self._onSwapped)
+
+    def present(self, image):
+        """
+        [SLM显示] 加入一帧全息图
+
+        :param image: uint8 灰度或BGR全息图，None为清空显示
+        :return: 帧号
+        """
+        if image is not None:
+            image = np.ascontiguousarray(image, dtype=np.uint8)
+        frameId = self.queue.push(image)
+        self._schedule()
+        return frameId
+
+    def _schedule(self):
+        if not self._scheduled:
+            self._scheduled = True
+            self.update()
+
+    def _onSwapped(self):
+        timestamp = time.perf_counter()
+        if self._uploaded is not None:
+            frameId, self._uploaded = self._uploaded, None
+            self.queue.swapped(frameId, timestamp, 1 / self.screen().refreshRate())
+            self.presented.emit(frameId, timestamp)
+
+        self._scheduled = False
+        if len(self.queue):
+            self._schedule()
+
+    # ==== OpenGL ====
+
+    def initializeGL(self):
+        self._blitter = QOpenGLTextureBlitter()
+        self._blitter.create()
+        self._swizzle = QOpenGLTexture.hasFeature(QOpenGLTexture.Feature.Swizzle)
+        self.context().aboutToBeDestroyed.connect(self._cleanup)
+
+    def _cleanup(self):
+        self.makeCurrent()
+        if self._texture is not None:
+            self._texture.destroy()
+            self._texture = None
+            self._textureKey = None
+        if self._blitter is not None:
+            self._blitter.destroy()
+            self._blitter = None
+        self.doneCurrent()
+
+    def _upload(self, image):
+        """
+        上传全息图到纹理，尺寸或通道数变化时才重新分配纹理
+        """
+        height, width = image.shape[:2]
+        gray = image.ndim == 2
+        if gray and not self._swizzle:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+            gray = False
+
+        key = (width, height, gray)
+        if self._textureKey != key:
+            if self._texture is not None:
+                self._texture.destroy()
+            texture = QOpenGLTexture(QOpenGLTexture.Target.Target2D)
+            texture.setFormat(QOpenGLTexture.TextureFormat.R8_UNorm if gray else QOpenGLTexture.TextureFormat.RGB8_UNorm)
+            texture.setSize(width, height)
+            texture.setMinMagFilters(QOpenGLTexture.Filter.Nearest, QOpenGLTexture.Filter.Nearest)
+            texture.setWrapMode(QOpenGLTexture.WrapMode.ClampToEdge)
+            if gray:
+                # 单通道纹理显示为灰度
+                texture.setSwizzleMask(
+                    QOpenGLTexture.SwizzleValue.RedValue, QOpenGLTexture.SwizzleValue.RedValue,
+                    QOpenGLTexture.SwizzleValue.RedValue, QOpenGLTexture.SwizzleValue.OneValue
+                )
+            texture.allocateStorage()
+            self._texture, self._textureKey = texture, key
+
+        self._texture.setData(
+            QOpenGLTexture.PixelFormat.Red if gray else QOpenGLTexture.PixelFormat.BGR,
+            QOpenGLTexture.PixelType.UInt8, sip.voidptr(image), self._transfer
+        )
+        self._imageSize = (width, height)
+
+    def paintGL(self):
+        item = self.queue.pop()
+        if item is not None:
+            frameId, image = item
+            if image is None:
+                self._imageSize = None
+            else:
+                self._upload(image)
+            self._uploaded = frameId
+
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0))
+
+        if self._imageSize is None:
+            if self.placeholder:
+                painter.setPen(QColor(255, 255, 255))
+                painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self.placeholder)
+        else:
+            # 以设备像素1:1居中绘制
+            ratio = self.devicePixelRatioF()
+            viewport = QRect(0, 0, round(self.width() * ratio), round(self.height() * ratio))
+            width, height = self._imageSize
+            target = QRectF((viewport.width() - width) // 2, (viewport.height() - height) // 2, width, height)
+
+            painter.beginNativePainting()
+            self._blitter.bind()
+            self._blitter.blit(
+                self._texture.textureId(), QOpenGLTextureBlitter.targetTransform(target, viewport),
+                QOpenGLTextureBlitter.Origin.OriginTopLeft
+            )
+            self._blitter.release()
+            painter.endNativePainting()
+
+        painter.end()
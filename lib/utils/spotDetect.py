@@ -0,0 +1,147 @@
+import abc
+import cv2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SpotDetector(abc.ABC):
+    """
+    [光斑识别] 光斑检测器接口
+
+    detect() 统一返回 (N, 3) 的 float 数组，每行为 (x, y, r)，未检测到时返回空数组
+    """
+
+    @abc.abstractmethod
+    def detect(self, image) -> np.ndarray:
+        """
+        [光斑识别] 检测光斑
+
+        :param image: 单通道灰度图像
+        :return: (N, 3) 光斑中心与半径
+        """
+
+    @staticmethod
+    def empty() -> np.ndarray:
+        return np.zeros((0, 3), dtype=np.float64)
+
+
+class HoughDetector(SpotDetector):
+    """
+    [光斑识别] 高斯模糊 + 霍夫圆检测
+    """
+
+    def __init__(self, blurSize=5, minDist=20, param1=50, param2=13, minRadius=5, maxRadius=20):
+        self.blurSize = blurSize
+        self.minDist = minDist
+        self.param1 = param1
+        self.param2 = param2
+        self.minRadius = minRadius
+        self.maxRadius = maxRadius
+
+    def detect(self, image) -> np.ndarray:
+        # 应用高斯模糊减少图像噪声
+        blurred = cv2.GaussianBlur(image, (self.blurSize, self.blurSize), 0)
+
+        circles = cv2.HoughCircles(
+            blurred, cv2.HOUGH_GRADIENT, 1, self.minDist,
+            param1=self.param1, param2=self.param2, minRadius=self.minRadius, maxRadius=self.maxRadius
+        )
+
+        if circles is None:
+            return self.empty()
+
+        return circles[0, :, :3].astype(np.float64)
+
+
+class ComponentsDetector(SpotDetector):
+    """
+    [光斑识别] 阈值分割 + 连通域 + 灰度矩
+
+    以灰度加权矩计算亚像素中心，以连通域面积折算半径。可将图像按行分块，在线程池中并行处理。
+
+    :var thresh: 分割阈值，None时使用全图Otsu阈值
+    :var minArea: 最小连通域面积 (像素)
+    :var maxArea: 最大连通域面积 (像素)
+    :var tiles: 分块数，1为不分块
+    :var halo: 分块重叠宽度 (像素)，需大于光斑直径
+    """
+
+    def __init__(self, thresh=None, blurSize=3, minArea=12, maxArea=1600, invert=False, tiles=1, halo=48):
+        self.thresh = thresh
+        self.blurSize = blurSize
+        self.minArea = minArea
+        self.maxArea = maxArea
+        self.invert = invert
+        self.tiles = tiles
+        self.halo = halo
+        self._pool = None
+
+    def _prepare(self, image):
+        if self.invert:
+            image = cv2.bitwise_not(image)
+        if self.blurSize > 1:
+            image = cv2.GaussianBlur(image, (self.blurSize, self.blurSize), 0)
+
+        if self.thresh is None:
+            thresh, _ = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        else:
+            thresh = self.thresh
+
+        return image, float(thresh)
+
+    def _detectTile(self, image, thresh) -> np.ndarray:
+        _, mask = cv2.threshold(image, thresh, 1, cv2.THRESH_BINARY)
+        # 不计算统计量的连通域标记明显更快，面积与矩由前景像素另行累加
+        num, labels = cv2.connectedComponentsWithAlgorithm(mask, 8, cv2.CV_32S, cv2.CCL_GRANA)
+        if num <= 1:
+            return self.empty()
+
+        # 仅对前景像素计算灰度加权矩
+        fg = cv2.findNonZero(mask).reshape(-1, 2)
+        xs, ys = fg[:, 0], fg[:, 1]
+        lab = labels[ys, xs]
+        w = image[ys, xs].astype(np.float64) - thresh
+        area = np.bincount(lab, minlength=num)
+        sumW = np.bincount(lab, weights=w, minlength=num)
+        sumX = np.bincount(lab, weights=w * xs, minlength=num)
+        sumY = np.bincount(lab, weights=w * ys, minlength=num)
+
+        keep = (area >= self.minArea) & (area <= self.maxArea) & (sumW > 0)
+        keep[0] = False  # 背景
+
+        return np.column_stack((
+            sumX[keep] / sumW[keep],
+            sumY[keep] / sumW[keep],
+            np.sqrt(area[keep] / np.pi)
+        ))
+
+    def detect(self, image) -> np.ndarray:
+        image, thresh = self._prepare(image)
+
+        if self.tiles <= 1:
+            return self._detectTile(image, thresh)
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.tiles)
+
+        height = image.shape[0]
+        bounds = np.linspace(0, height, self.tiles + 1).astype(int)
+
+        def work(k):
+            core0, core1 = bounds[k], bounds[k + 1]
+            y0, y1 = max(core0 - self.halo, 0), min(core1 + self.halo, height)
+            spots = self._detectTile(image[y0:y1], thresh)
+            spots[:, 1] += y0
+            # 只保留中心位于本块核心区域的光斑，去除重叠区的重复与残缺光斑
+            return spots[(spots[:, 1] >= core0) & (spots[:, 1] < core1)]
+
+        # OpenCV 在处理期间释放GIL，各分块可并行执行
+        results = list(self._pool.map(work, range(self.tiles)))
+
+        return np.vstack(results)
+
+
+DETECTORS = {
+    'hough': HoughDetector,
+    'components': ComponentsDetector,
+}
@@ -0,0 +1,129 @@
+import logging
+import cv2
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from PyQt6.QtCore import pyqtSignal
+from lib.utils.frameWorker import LatestFrameWorker
+from lib.utils.pointSet import PointSet
+from lib.utils.spotDetect import ComponentsDetector
+
+
+class BeadTracker:
+    """
+    [粒子跟踪] 帧间关联，为粒子分配持久编号
+
+    以匀速模型预测各轨迹位置，与当前帧检测结果按距离做全局最优分配，超出关联门限的视为未匹配。
+    连续丢失超过 maxMissed 帧的轨迹被删除，未匹配的检测结果建立新轨迹。
+
+    :var maxDist: 关联门限 (像素)
+    :var maxMissed: 允许连续丢失的帧数
+    """
+
+    def __init__(self, maxDist=15, maxMissed=5):
+        self.maxDist = maxDist
+        self.maxMissed = maxMissed
+        self.reset()
+
+    def reset(self):
+        """
+        [粒子跟踪] 清空全部轨迹
+        """
+        self.positions = np.zeros((0, 2), dtype=np.float64)
+        self.velocities = np.zeros((0, 2), dtype=np.float64)
+        self.radius = np.zeros(0, dtype=np.float64)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.missed = np.zeros(0, dtype=np.int64)
+        self._nextId = 0
+
+    def update(self, spots) -> PointSet:
+        """
+        [粒子跟踪] 以新一帧检测结果更新轨迹
+
+        :param spots: (N, 3) 光斑中心与半径 (x, y, r)
+        :return: 当前帧可见的粒子，ids为持久编号
+        """
+        spots = np.asarray(spots, dtype=np.float64).reshape(-1, 3)
+        detected = spots[:, :2]
+        trackNum, detNum = len(self.positions), len(detected)
+
+        rows = cols = np.zeros(0, dtype=np.int64)
+        if trackNum and detNum:
+            predicted = self.positions + self.velocities
+            cost = np.linalg.norm(predicted[:, None, :] - detected[None, :, :], axis=2)
+            # 超出门限的配对赋予大代价，分配后剔除
+            gated = np.where(cost <= self.maxDist, cost, self.maxDist * 1e3)
+            rows, cols = linear_sum_assignment(gated)
+            valid = cost[rows, cols] <= self.maxDist
+            rows, cols = rows[valid], cols[valid]
+
+        # 已关联的轨迹
+        self.velocities[rows] = detected[cols] - self.positions[rows]
+        self.positions[rows] = detected[cols]
+        self.radius[rows] = spots[cols, 2]
+        self.missed += 1
+        self.missed[rows] = 0
+
+        # 删除丢失过久的轨迹
+        alive = self.missed <= self.maxMissed
+        self.positions, self.velocities = self.positions[alive], self.velocities[alive]
+        self.radius, self.ids, self.missed = self.radius[alive], self.ids[alive], self.missed[alive]
+
+        # 未关联的检测结果建立新轨迹
+        newDet = np.setdiff1d(np.arange(detNum), cols)
+        newNum = len(newDet)
+        self.positions = np.vstack((self.positions, detected[newDet]))
+        self.velocities = np.vstack((self.velocities, np.zeros((newNum, 2))))
+        self.radius = np.concatenate((self.radius, spots[newDet, 2]))
+        self.ids = np.concatenate((self.ids, np.arange(self._nextId, self._nextId + newNum)))
+        self.missed = np.concatenate((self.missed, np.zeros(newNum, dtype=np.int64)))
+        self._nextId += newNum
+
+        visible = self.missed == 0
+        return PointSet(self.positions[visible], self.ids[visible], self.radius[visible])
+
+
+class TrackingWorker(LatestFrameWorker):
+    """
+    [粒子跟踪] 相机视频流上的实时粒子跟踪线程
+
+    只处理最新一帧，见 LatestFrameWorker。若给定背景模型，检测前先扣除感兴趣区域内的背景；
+    背景模型与当前图像不符 (如相机分辨率已变化) 时记录一次警告，此后不扣除背景继续跟踪。
+
+    :var background: 背景模型，None为不扣除
+    """
+
+    # (可见粒子 PointSet，相机坐标；帧时间戳 s)
+    trackUpdate = pyqtSignal(object, float)
+
+    dropSource = 'tracker'
+
+    def __init__(self, detector=None, tracker=None, roi=None, background=None, origin=(0, 0)):
+        super().__init__(roi, origin)
+        self.detector = detector if detector is not None else ComponentsDetector()
+        self.tracker = tracker if tracker is not None else BeadTracker()
+        self.background = background
+
+    def setRoi(self, roi):
+        """
+        [粒子跟踪] 设置感兴趣区域，轨迹随之重置
+        """
+        with self._cond:
+            super().setRoi(roi)
+            self.tracker.reset()
+
+    def process(self, patch, offset, timestamp):
+        gray = patch if patch.ndim == 2 else cv2.cvtColor(patch, cv2.COLOR_RGB2GRAY)
+        background = self.background
+        if background is not None and background.ready:
+            try:
+                gray = background.subtract(gray, offset)
+            except ValueError as e:
+                logging.getLogger(__name__).warning(f"Background subtraction disabled: {e}")
+                self.background = None
+
+        spots = self.detector.detect(gray)
+        spots[:, 0] += offset[0]
+        spots[:, 1] += offset[1]
+
+        points = self.tracker.update(spots)
+        self.trackUpdate.emit(points, timestamp)
@@ -4,9 +4,11 @@ import logging
 import colorlog
 import math
 import sys
+import weakref
 import cv2
 import numpy as np
 from pathlib import Path
+from PyQt6 import sip
 from PyQt6.QtCore import Qt, QTimer, QDir, pyqtSignal, QObject
 from PyQt6.QtGui import QImage, QPixmap
 from PyQt6.QtWidgets import QMessageBox
@@ -51,6 +53,76 @@ class Utils:
             required=False, help='Bypass LCOS detection (set current monitor as LCOS, for development only)'
         )
 
+        parser.add_argument(
+            '-d', '--detector', default='hough', type=str,
+            choices=('hough', 'components'),
+            required=False, help='Spot detector backend: Hough circles or thresholded connected components'
+        )
+
+        parser.add_argument(
+            '-m', '--mono', default=False, action='store_true',
+            required=False, help='Capture 8-bit greyscale frames instead of RGB24'
+        )
+
+        parser.add_argument(
+            '-pf', '--preview-fps', default=0, type=float,
+            required=False, help='Camera preview refresh rate limit, 0 to follow the display refresh rate'
+        )
+        parser.add_argument(
+            '-sn', '--snap-frames', default=1, type=int,
+            required=False, help='Number of still frames averaged for detection snapshots'
+        )
+
+        parser.add_argument(
+            '-pr', '--play-fps', default=20, type=float,
+            required=False, help='Target playback rate of computed hologram sequences'
+        )
+        parser.add_argument(
+            '-pb', '--play-buffer', default=5, type=int,
+            required=False, help='Frames buffered before hologram sequence playback starts or resumes'
+        )
+        parser.add_argument(
+            '--play-fixed', default=False, action='store_true',
+            required=False, help='Play at the target rate instead of following the computation throughput'
+        )
+
+        parser.add_argument(
+            '-ngl', '--no-opengl', default=False, action='store_true',
+            required=False, help='Display holograms through QPixmap instead of the OpenGL presenter'
+        )
+
+        parser.add_argument(
+            '-cam', '--camera', default='nncam', type=str,
+            choices=('nncam', 'sim', 'replay'),
+            required=False, help='Camera backend: hardware camera, simulated camera rendered from the displayed hologram, '
+                                 'or replay of a recorded session'
+        )
+
+        parser.add_argument(
+            '--sim-beads', default=30, type=int,
+            required=False, help='Number of randomly placed beads for the simulated camera'
+        )
+
+        parser.add_argument(
+            '--sim-fps', default=30, type=float,
+            required=False, help='Frame rate of the simulated camera'
+        )
+
+        parser.add_argument(
+            '--replay', default=None, type=str,
+            required=False, help='Recorded session for the replay camera (.rec, .npy, .npz or a folder of images)'
+        )
+
+        parser.add_argument(
+            '--replay-fast', default=False, action='store_true',
+            required=False, help='Replay as fast as possible instead of honouring recorded timestamps'
+        )
+
+        parser.add_argument(
+            '--replay-loop', default=False, action='store_true',
+            required=False, help='Restart the replay when the recording ends'
+        )
+
         args = parser.parse_args()
         return args
 
@@ -167,36 +239,81 @@ class ImgProcess:
             raise IOError
 
     @staticmethod
-    def cvImg2QPixmap(obj, inputImg):
+    def ndarray2QImage(image, bgr=True) -> QImage:
+        """
+        [图像处理] 将uint8图像数组包装为QImage，不复制数据
+
+        行内连续的数组 (含ROI切片) 直接共享内存，否则先转为连续数组。
+        QImage 持有对数组缓冲区的引用，数组在其使用期间不会被释放，但不应被修改。
+
+        :param image: (高, 宽) 灰度或 (高, 宽, 3) 彩色uint8图像
+        :param bgr: 三通道图像是否为cv2的BGR顺序，否则为RGB
+        :return: Format_Grayscale8、Format_BGR888 或 Format_RGB888 格式的QImage
+        """
+        if image.dtype != np.uint8:
+            raise TypeError(f"Expected a uint8 image, got {image.dtype}")
+
+        if image.ndim == 2:
+            imgFormat = QImage.Format.Format_Grayscale8
+            rowContiguous = image.strides[1] == 1
+        elif image.ndim == 3 and image.shape[2] == 3:
+            imgFormat = QImage.Format.Format_BGR888 if bgr else QImage.Format.Format_RGB888
+            rowContiguous = image.strides[2] == 1 and image.strides[1] == 3
+        else:
+            raise ValueError(f"Unsupported image shape {image.shape}")
+
+        if not rowContiguous or image.strides[0] <= 0:
+            image = np.ascontiguousarray(image)
+
+        rows, columns = image.shape[:2]
+        # 以数组为清理参数，QImage 及其共享副本释放前 PyQt 一直持有对数组的引用
+        return QImage(
+            sip.voidptr(image.ctypes.data), columns, rows, image.strides[0], imgFormat, ImgProcess._releaseArray, image
+        )
+
+    @staticmethod
+    def _releaseArray(image):
+        pass
+
+    # 各控件上一次显示的QPixmap，尺寸不变时原地更新
+    _pixmapCache = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def cvImg2QPixmap(obj, inputImg, bgr=True):
         """
         [图像处理] 加载cv2图像到Qt界面
 
+        图像不经复制直接转换，按比例缩放至控件尺寸 (cv2.resize)，尺寸已符合时不缩放；
+        显示尺寸不变时复用该控件上一次的QPixmap。
+
         :param QObject obj: 目标Qt组件
         :param inputImg: 输入图像
+        :param bgr: 三通道图像是否为cv2的BGR顺序，否则为RGB
         """
-        if inputImg is not None:
-            if len(inputImg.shape) == 2:
-                # 灰度图是单通道，所以需要用Format_Indexed8
-                rows, columns = inputImg.shape
-                bytesPerLine = columns
-                img = QImage(
-                    inputImg.copy(), columns, rows, bytesPerLine, QImage.Format.Format_Indexed8
-                )
-            else:
-                rows, columns, channels = inputImg.shape
-                bytesPerLine = channels * columns
-                img = QImage(
-                    inputImg.copy(), columns, rows, bytesPerLine, QImage.Format.Format_RGB888
-                ).rgbSwapped()
-
-            pixmap = QPixmap(img)
-        else:
+        if inputImg is None:
             # 如果图片未加载，设置透明图为占位符
             pixmap = QPixmap(1, 1)
             pixmap.fill(Qt.GlobalColor.transparent)
+            ImgProcess._pixmapCache.pop(obj, None)
+            obj.setPixmap(pixmap)
+            return
 
-        scaledPixmap = pixmap.scaled(
-            obj.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
-        )
-        obj.setPixmap(scaledPixmap)
+        height, width = inputImg.shape[:2]
+        k = min(obj.width() / width, obj.height() / height)
+        size = (max(int(width * k), 1), max(int(height * k), 1))
+        # 取整造成的1像素差异视为尺寸已符合
+        if abs(size[0] - width) > 1 or abs(size[1] - height) > 1:
+            inputImg = cv2.resize(inputImg, size, interpolation=cv2.INTER_AREA if k < 1 else cv2.INTER_LINEAR)
+
+        img = ImgProcess.ndarray2QImage(inputImg, bgr)
+
+        pixmap = ImgProcess._pixmapCache.get(obj)
+        if pixmap is None or pixmap.size() != img.size():
+            pixmap = QPixmap.fromImage(img)
+            ImgProcess._pixmapCache[obj] = pixmap
+        else:
+            # 先释放控件持有的共享副本，原地更新时无需分离复制
+            obj.clear()
+            pixmap.convertFromImage(img)
+        obj.setPixmap(pixmap)
 
@@ -5,19 +5,28 @@ import cv2
 import cupy as cp
 import numpy as np
 from pathlib import Path
-from queue import Queue
 from PyQt6.QtCore import Qt, QSignalBlocker, pyqtSignal, pyqtSlot, QSize, QRect, qInstallMessageHandler, QTimer
 from PyQt6.QtGui import QGuiApplication, QPixmap, QIcon
 from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QStatusBar, \
     QGridLayout, QVBoxLayout, QHBoxLayout, QGroupBox, \
     QFileDialog, QMessageBox, \
-    QLabel, QPushButton, QComboBox, QSpinBox, QDoubleSpinBox, QProgressBar
+    QLabel, QPushButton, QComboBox, QSpinBox, QDoubleSpinBox, QProgressBar, QCheckBox
 from lib.utils.utils import Utils, ImgProcess
 from lib.utils.autoDetect import FeaturesDetect, FeaturesSort, \
-    FrameGeneratorWorker, HoloGeneratorWorker
+    FrameGeneratorWorker, HoloGeneratorWorker, HoloReceiverWorker
+from lib.utils.pathPlanner import SequencePlanner, PlanWorker
+from lib.utils.spotDetect import DETECTORS
+from lib.utils.camSlmMapping import CamSlmMapping
+from lib.utils.tracker import TrackingWorker
+from lib.utils.background import BackgroundModel, BackgroundWorker
+from lib.utils.slmLatency import SlmLatencyProbe
+from lib.utils.slmPresenter import SlmPresenter
+from lib.utils.playback import PlaybackScheduler
+from lib.utils.convergencePlot import ConvergencePlot
 from lib.holo.libHoloAlgmGPU import WCIA
-from lib.holo.libHoloEssential import Holo, HoloCalcWorker
+from lib.holo.libHoloEssential import Holo, HoloCalcWorker, ReconstructPreviewWorker, CancelToken
 from lib.cam.camAPI import CameraMiddleware
+from lib.cam.recorder import FrameRecorder
 from multiprocessing import Pipe
 
 class MainWindow(QMainWindow):
@@ -32,6 +41,11 @@ class MainWindow(QMainWindow):
     :var zerothOrderPosition: 激光零级位置
     """
     holoImgReady = pyqtSignal(object)
+    # 抓图 Future 完成，由相机的后台线程发出
+    snapDoneSig = pyqtSignal(object)
+
+    # 视频流消费者丢帧来源的显示名称
+    DROP_SOURCES = {'tracker': '跟踪', 'background': '背景学习', 'recorder': '录制'}
 
     def __init__(self):
         super().__init__()
@@ -42,17 +56,47 @@ class MainWindow(QMainWindow):
         self.holoU = None
         self.holoImgRotated = None
         self.zerothOrderPosition = (844, 674)
+        self._camSlmMap = None
         self._frameGenerator = None
         self._holoGenerator = None
+        self._sequencePlanner = None
+        self._holoIterArgs = (40, 0.01)
+        self._computedFrames = 0
+        self._holoReceiver = None
+        self._holoCalcWorker = None
+        self._pipelineToken = None
+        self._planWorker = None
+        # 重规划期间收到的全息图 (全息图, 帧序号)，规划完成后视结果播放或丢弃；None为未在重规划
+        self._heldFrames = None
+        self._heldCompleted = False
+        self._retiredGenerators = {}
+        self._reapTimer = QTimer()
+        self._reapTimer.setInterval(100)
+        self._reapTimer.timeout.connect(self.reapGenerators)
+        self._tracker = None
+        self._bgLearner = None
+        self._recorder = None
+        self.recordFrames = 3000
+        self._latencyProbe = None
+        self.background = BackgroundModel()
+        self._trackInfoTime = 0
+        self.trackedPoints = None
         self._imgSaver = None
         self._framePipeReceiver, self._framePipeSender = Pipe()
         self._holoPipeReceiver, self._holoPipeSender = Pipe()
-        self._imgQueue = Queue()
-        self._imgPlayTimer = QTimer()
-        self._imgPlayTimer.timeout.connect(self.showNext)
-        self._snapAsTarget = False
-        self._snapIsSave = False
-        self._snapIsDisp = False
+        self._reconstructor = ReconstructPreviewWorker()
+        self._reconstructor.previewReady.connect(self.reconstructReadyEvent)
+        self._reconstructor.start()
+        self._player = PlaybackScheduler()
+        self._player.frameDue.connect(self.showNext)
+        self._player.finished.connect(self.playbackFinishedEvent)
+        self._camStatTimer = QTimer()
+        self._camStatTimer.timeout.connect(self.camStatEvent)
+        self._snapFuture = None
+        self._snapHandler = None
+        self._snapTargetSave = False
+        self._saveFuture = None
+        self.snapDoneSig.connect(self.snapFinishedEvent, Qt.ConnectionType.QueuedConnection)
         self._uniList = []
         self._effiList = []
         self._RMSEList = []
@@ -60,12 +104,14 @@ class MainWindow(QMainWindow):
         # 相机实例通信
         self.cam = CameraMiddleware()
         self.cam.frameUpdate.connect(self.frameRefreshEvent)
-        self.cam.snapUpdate.connect(self.snapEvent)
         self.cam.expoUpdate.connect(self.expTimeUpdatedEvent)
+        previewFps = self.cam.previewFps or QGuiApplication.primaryScreen().refreshRate()
+        self.cam.preview.interval = 1 / previewFps
 
         # 副屏实例通信
         self.secondWin = SecondMonitorWindow()
         self.holoImgReady.connect(self.secondWin.displayHoloImg)
+        self.holoImgReady.connect(self.cam.hologramDisplayed)
 
         self._initUI()
 
@@ -92,10 +138,61 @@ class MainWindow(QMainWindow):
         self.expTimeInput.setEnabled(False)
         self.expTimeInput.textChanged.connect(self.expTimeSet)
 
+        self.trackInfo = QLabel()
+
+        self.trackBtn = QPushButton('粒子跟踪')
+        self.trackBtn.setCheckable(True)
+        self.trackBtn.toggled.connect(self.toggleTracking)
+        self.trackBtn.setEnabled(False)
+
+        self.bgSubCheck = QCheckBox("识别前扣除背景")
+        self.bgSubCheck.toggled.connect(self.toggleBgSubtraction)
+        self.bgSubCheck.setEnabled(False)
+
+        self.learnBgBtn = QPushButton('学习背景')
+        self.learnBgBtn.clicked.connect(self.learnBackground)
+        self.learnBgBtn.setEnabled(False)
+
+        camModeText = QLabel("相机模式")
+
+        self.camModeSel = QComboBox()
+        self.camModeSel.addItem(f"预览", 'preview')
+        self.camModeSel.addItem(f"全分辨率", 'full')
+        self.camModeSel.addItem(f"2x2合并", 'binned')
+        self.camModeSel.addItem(f"SLM视场ROI", 'roi')
+        self.camModeSel.currentIndexChanged.connect(self.camModeSet)
+        self.camModeSel.setEnabled(False)
+
+        self.camFpsInfo = QLabel()
+
+        self.recordInfo = QLabel()
+
+        self.recordBtn = QPushButton('录制')
+        self.recordBtn.setCheckable(True)
+        self.recordBtn.toggled.connect(self.toggleRecording)
+        self.recordBtn.setEnabled(False)
+
+        self.latencyInfo = QLabel()
+
+        self.latencyBtn = QPushButton('测量SLM延迟')
+        self.latencyBtn.clicked.connect(self.measureSlmLatency)
+        self.latencyBtn.setEnabled(False)
+
         camCtrlLayout = QGridLayout()
         camCtrlLayout.addWidget(expTimeText, 0, 0, 1, 2)
         camCtrlLayout.addWidget(self.expTimeInput, 0, 2, 1, 2)
         camCtrlLayout.addWidget(self.snapBtn, 0, 4, 1, 2)
+        camCtrlLayout.addWidget(self.trackInfo, 1, 0, 1, 4)
+        camCtrlLayout.addWidget(self.trackBtn, 1, 4, 1, 2)
+        camCtrlLayout.addWidget(self.bgSubCheck, 2, 0, 1, 4)
+        camCtrlLayout.addWidget(self.learnBgBtn, 2, 4, 1, 2)
+        camCtrlLayout.addWidget(camModeText, 3, 0, 1, 2)
+        camCtrlLayout.addWidget(self.camModeSel, 3, 2, 1, 2)
+        camCtrlLayout.addWidget(self.camFpsInfo, 3, 4, 1, 2)
+        camCtrlLayout.addWidget(self.recordInfo, 4, 0, 1, 4)
+        camCtrlLayout.addWidget(self.recordBtn, 4, 4, 1, 2)
+        camCtrlLayout.addWidget(self.latencyInfo, 5, 0, 1, 4)
+        camCtrlLayout.addWidget(self.latencyBtn, 5, 4, 1, 2)
         camCtrlLayout.setColumnStretch(0, 1)
         camCtrlLayout.setColumnStretch(1, 1)
         camCtrlLayout.setColumnStretch(2, 1)
@@ -135,6 +232,11 @@ class MainWindow(QMainWindow):
         self.iterTargetInput.setValue(1)
         self.iterTargetInput.setEnabled(False)
 
+        self.convergencePlot = ConvergencePlot()
+
+        self.iterInfo = QLabel("")
+        self.iterInfo.setStyleSheet("color:#666")
+
         holoSetLayout = QGridLayout()
         holoSetLayout.addWidget(holoAlgmText, 0, 0, 1, 2)
         holoSetLayout.addWidget(self.holoAlgmSel, 0, 2, 1, 4)
@@ -145,6 +247,8 @@ class MainWindow(QMainWindow):
         holoSetLayout.addWidget(iterTargetText, 3, 0, 1, 2)
         holoSetLayout.addWidget(iterTargetText2, 3, 2, 1, 2)
         holoSetLayout.addWidget(self.iterTargetInput, 3, 4, 1, 2)
+        holoSetLayout.addWidget(self.convergencePlot, 4, 0, 1, 6)
+        holoSetLayout.addWidget(self.iterInfo, 5, 0, 1, 6)
         holoSetLayout.setColumnStretch(0, 1)
         holoSetLayout.setColumnStretch(1, 1)
         holoSetLayout.setColumnStretch(2, 1)
@@ -182,6 +286,15 @@ class MainWindow(QMainWindow):
         self.autoCalcBtn.clicked.connect(self.autoCalcHoloImg)
         self.autoCalcBtn.setEnabled(False)
 
+        self.replanBtn = QPushButton('重新规划')
+        self.replanBtn.clicked.connect(self.replanHoloImg)
+        self.replanBtn.setEnabled(False)
+
+        self.pauseCalcBtn = QPushButton('暂停计算')
+        self.pauseCalcBtn.setCheckable(True)
+        self.pauseCalcBtn.toggled.connect(self.togglePauseCalc)
+        self.pauseCalcBtn.setEnabled(False)
+
         calcLayout = QGridLayout()
         calcLayout.addWidget(openTargetFileBtn, 0, 0, 1, 1)
         calcLayout.addWidget(openHoloFileBtn, 0, 1, 1, 1)
@@ -190,7 +303,9 @@ class MainWindow(QMainWindow):
         calcLayout.addWidget(self.calcHoloBtn, 3, 0, 1, 1)
         calcLayout.addWidget(self.saveHoloBtn, 3, 1, 1, 1)
         calcLayout.addWidget(autoCalcText, 4, 0, 1, 2)
-        calcLayout.addWidget(self.autoCalcBtn, 5, 0, 1, 2)
+        calcLayout.addWidget(self.autoCalcBtn, 5, 0, 1, 1)
+        calcLayout.addWidget(self.replanBtn, 5, 1, 1, 1)
+        calcLayout.addWidget(self.pauseCalcBtn, 6, 0, 1, 2)
         calcLayout.setColumnStretch(0, 1)
         calcLayout.setColumnStretch(1, 1)
 
@@ -239,6 +354,10 @@ class MainWindow(QMainWindow):
         self.progressBar.setStyleSheet("QProgressBar {min-width: 100px; max-width: 300px; margin-right:5px}")
         self.progressBar.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
+        self.camStatInfo = QLabel()
+        self.camStatInfo.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.camStatInfo.setStyleSheet("QLabel {margin-right:5px}")
+
         self.secondStatusInfo = QLabel()
         self.secondStatusInfo.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
         self.secondStatusInfo.setStyleSheet("QLabel {min-width: 100px; margin-right:5px}")
@@ -248,6 +367,7 @@ class MainWindow(QMainWindow):
         self.setZerothOrderBtn.setEnabled(False)
 
         self.statusBar = QStatusBar()
+        self.statusBar.addPermanentWidget(self.camStatInfo)
         self.statusBar.addPermanentWidget(self.secondStatusInfo)
         self.statusBar.addPermanentWidget(self.progressBar)
         self.statusBar.addPermanentWidget(self.setZerothOrderBtn)
@@ -278,8 +398,19 @@ class MainWindow(QMainWindow):
             if isinstance(widget, QWidget) and widget != self:
                 widget.close()
 
+        self.stopTracking()
+        self.stopBgLearning()
+        self.stopRecording()
+        self.stopLatencyProbe()
         self.cam.closeCamera()
         self.stopThreads()
+        self.reapGenerators(wait=True)
+        for worker in self.findChildren(PlanWorker):
+            worker.wait()
+        if self._holoCalcWorker is not None:
+            self._holoCalcWorker.cancel()
+            self._holoCalcWorker.wait()
+        self._reconstructor.stop()
         logHandler.info(f"Bye.")
         event.accept()
 
@@ -288,6 +419,10 @@ class MainWindow(QMainWindow):
         [UI操作] 点击打开相机
         """
         if self.cam.device:
+            self.stopTracking()
+            self.stopBgLearning()
+            self.stopRecording()
+            self.stopLatencyProbe()
             self.cam.closeCamera()
 
             logHandler.info(f"Camara closed.")
@@ -315,27 +450,170 @@ class MainWindow(QMainWindow):
 
         self.setZerothOrderBtn.setEnabled(not self.setZerothOrderBtn.isEnabled())
         self.snapBtn.setEnabled(not self.snapBtn.isEnabled())
+        self.trackBtn.setEnabled(not self.trackBtn.isEnabled())
+        self.recordBtn.setEnabled(not self.recordBtn.isEnabled())
+        self.latencyBtn.setEnabled(self.snapBtn.isEnabled() and self._latencyProbe is None)
+        self.learnBgBtn.setEnabled(self.snapBtn.isEnabled() and self._bgLearner is None)
         self.expTimeInput.setEnabled(not self.expTimeInput.isEnabled())
+        self.camModeSel.setEnabled(not self.camModeSel.isEnabled())
+
+        if self.cam.device:
+            self._camStatTimer.start(1000)
+        else:
+            self._camStatTimer.stop()
+            self.camFpsInfo.setText("")
+            self.camStatInfo.setText("")
+            self.camStatInfo.setToolTip("")
+
+    def camModeSet(self, index):
+        """
+        [UI操作] 切换相机模式，跟踪、背景学习、录制与延迟测量随之停止
+        """
+        mode = self.camModeSel.itemData(index)
+        roi = None
+        if mode == 'roi':
+            roi = self.getTrackingRoi()
+            if roi is None:
+                self.statusBar.showMessage(f"零级光位置无效，无法设置SLM视场ROI，请先校准SLM中心坐标")
+                with QSignalBlocker(self.camModeSel):
+                    self.camModeSel.setCurrentIndex(self.camModeSel.findData(self.cam.mode))
+                return
+
+        self.stopTracking()
+        self.stopBgLearning()
+        self.stopRecording()
+        self.stopLatencyProbe()
+        if self.cam.setMode(mode, roi) == -1:
+            logHandler.error(f"Unable to switch camera mode to '{mode}'")
+            self.statusBar.showMessage(f"相机模式切换失败，相机已停止")
+            return
+
+        logHandler.info(f"Camera mode '{mode}', {self.cam.imgWidth}x{self.cam.imgHeight}, ROI={self.cam.roi}")
+        self.statusBar.showMessage(f"相机模式：{self.camModeSel.currentText()}，分辨率 {self.cam.imgWidth}x{self.cam.imgHeight}")
+
+    def camStatEvent(self):
+        """
+        [UI事件] 定时刷新相机帧率、丢帧统计与录制进度
+        """
+        stats = self.cam.stats
+        fps, jitter = stats.rates()
+        self.camFpsInfo.setText(f"{fps:.1f} fps")
+        self.camStatInfo.setText(f"帧间隔抖动 {jitter * 1000:.1f} ms，丢帧 {stats.dropped}")
+        lines = [
+            f"已接收 {stats.frames} 帧",
+            f"相机端丢帧 {stats.skipped}",
+            f"缓冲区占满丢帧 {stats.overruns}",
+            f"拉取失败 {stats.pullErrors}",
+        ]
+        lines += [f"{self.DROP_SOURCES.get(k, k)}处理不及时丢帧 {n}" for k, n in dict(stats.consumerDrops).items()]
+        lines += [
+            f"预览跳过 {self.cam.preview.replaced}",
+            f"曝光 {stats.expoTime / 1000:.1f} ms，增益 {stats.expoGain}",
+        ]
+        self.camStatInfo.setToolTip("\n".join(lines))
+
+        if self._recorder is not None:
+            recorder = self._recorder
+            self.recordInfo.setText(f"已录制 {recorder.written}/{recorder.capacity} 帧，丢帧 {recorder.dropped}")
+            if recorder.written >= recorder.capacity:
+                self.stopRecording()
+
+    def ensurePreviewMode(self):
+        """
+        [UI事件] 抓图用于识别前切回预览模式，保证与零级光位置处于同一坐标系
+        """
+        if self.cam.mode != 'preview':
+            with QSignalBlocker(self.camModeSel):
+                self.camModeSel.setCurrentIndex(self.camModeSel.findData('preview'))
+            self.camModeSet(self.camModeSel.currentIndex())
+
+    def requestSnap(self, count=None):
+        """
+        [UI操作] 发起异步抓图，完成、失败或超时后由 snapFinishedEvent 在UI线程处理
+
+        :param count: 平均的帧数，默认 snapFrames
+        :return: concurrent.futures.Future
+        """
+        future = self.cam.snap(count)
+        future.add_done_callback(self.snapDoneSig.emit)
+        return future
 
     def snapAndSave(self):
         """
         [UI操作] 点击抓图
         """
         if self.cam.device:
-            self.cam.device.Snap(self.cam.RESOLUTION)
-            self._snapIsSave = True
-            self._snapAsTarget = False
-            self._snapIsDisp = False
+            self._saveFuture = self.requestSnap(count=1)
 
     def snapAsTarget(self, isSave):
         """
-        [UI操作] 点击从相机捕获
+        [UI操作] 抓取用于识别的灰度图，以 waitSnapImg() 取得结果
         """
+        self._snapFuture = None
+        self._snapHandler = None
         if self.cam.device:
-            self.cam.device.Snap(self.cam.RESOLUTION)
-            self._snapAsTarget = True
-            self._snapIsSave = isSave
-            self._snapIsDisp = False
+            self.ensurePreviewMode()
+            if not self.cam.device:
+                return
+            self._snapFuture = self.requestSnap()
+            self._snapTargetSave = isSave
+
+    def waitSnapImg(self, handler):
+        """
+        [UI事件] snapAsTarget() 发起的抓图完成后调用 handler，结果存入 snapImg；不阻塞UI线程
+
+        :param handler: 以状态为参数调用，0 为成功，-1 为相机未打开、抓图失败或超时
+        """
+        if self._snapFuture is None:
+            handler(-1)
+            return
+
+        self._snapHandler = handler
+        if self._snapFuture.done():
+            self.finishSnapImg()
+
+    def snapFinishedEvent(self, future):
+        """
+        [UI事件] 抓图 Future 完成；识别用抓图在 waitSnapImg() 之前完成时留待其处理
+        """
+        if future is self._saveFuture:
+            self._saveFuture = None
+            try:
+                image = future.result()
+            except Exception as e:
+                logHandler.error(f"Snapshot failed: {e!r}")
+                self.statusBar.showMessage(f"抓图失败")
+                return
+
+            filepath = f"../pics/snap/{time.strftime('%Y%m%d%H%M%S')}.jpg"
+            Utils.folderPathCheck(filepath)
+            cv2.imwrite(f"{filepath}", image)
+            logHandler.info(f"Snapshot saved as '{filepath}'")
+            self.statusBar.showMessage(f"截图已保存至 '{filepath}'")
+        elif future is self._snapFuture and self._snapHandler is not None:
+            self.finishSnapImg()
+
+    def finishSnapImg(self):
+        """
+        [UI事件] 取出识别用抓图的结果并交给 waitSnapImg() 的 handler
+        """
+        future, self._snapFuture = self._snapFuture, None
+        handler, self._snapHandler = self._snapHandler, None
+
+        try:
+            self.snapImg = future.result()
+        except Exception as e:
+            logHandler.error(f"Snapshot failed: {e!r}")
+            handler(-1)
+            return
+
+        if self._snapTargetSave:
+            filepath = f"../pics/snap/{time.strftime('%Y%m%d%H%M%S')}-asTarget.jpg"
+            Utils.folderPathCheck(filepath)
+            cv2.imwrite(f"{filepath}", self.snapImg)
+            logHandler.info(f"Snapshot saved as '{filepath}'")
+
+        handler(0)
 
     def expTimeSet(self, value):
         """
@@ -460,10 +738,19 @@ class MainWindow(QMainWindow):
 
                 self.secondStatusInfo.setText(f"开始迭代...")
                 self.progressBar.setRange(0, 0)
-
-                self.thread = HoloCalcWorker(self.algorithm)
-                self.thread.resultSig.connect(self.calcResultUpdateEvent)
-                self.thread.start()
+                self.convergencePlot.reset(maxIterNum, iterTarget)
+                self.iterInfo.setText("")
+
+                self._holoCalcWorker = HoloCalcWorker(self.algorithm)
+                self._holoCalcWorker.telemetrySig.connect(self.iterTelemetryEvent)
+                self._holoCalcWorker.resultSig.connect(self.calcResultUpdateEvent)
+                self._holoCalcWorker.cancelledSig.connect(self.calcCancelledEvent)
+                self._holoCalcWorker.start()
+
+                self.calcHoloBtn.setText("中止计算")
+                self.calcHoloBtn.clicked.disconnect()
+                self.calcHoloBtn.clicked.connect(self.cancelHoloCalc)
+                self.pauseCalcBtn.setEnabled(True)
             except Exception as err:
                 logHandler.error(f"Err in iteration: {err}")
                 QMessageBox.critical(self, '错误', f'迭代过程中发生异常：\n{err}')
@@ -480,6 +767,89 @@ class MainWindow(QMainWindow):
         else:
             self.saveHoloBtn.setEnabled(False)
 
+    def cancelHoloCalc(self):
+        """
+        [UI操作] 中止全息图计算，当前一次迭代完成后停止
+        """
+        if self._holoCalcWorker is not None:
+            self._holoCalcWorker.cancel()
+            self.calcHoloBtn.setEnabled(False)
+            self.secondStatusInfo.setText(f"正在中止...")
+
+    def calcCancelledEvent(self):
+        """
+        [UI事件] 全息图计算已中止
+        """
+        del self.algorithm
+        self._holoCalcWorker = None
+        self.resetCalcBtn()
+        self.progressBar.setRange(0, 100)
+        self.progressBar.setValue(0)
+        self.secondStatusInfo.setText(f"计算已中止")
+        self.statusBar.showMessage(f"计算已中止，迭代{len(self._RMSEList)}次")
+        logHandler.warning(f"Calculation cancelled after {len(self._RMSEList)} iterations")
+
+    def resetCalcBtn(self):
+        """
+        [UI操作] 单次计算结束后恢复计算与暂停按钮
+        """
+        self.calcHoloBtn.setText("计算全息图")
+        self.calcHoloBtn.clicked.disconnect()
+        self.calcHoloBtn.clicked.connect(self.calcHoloImg)
+        self.calcHoloBtn.setEnabled(True)
+        self.updatePauseBtn()
+
+    def togglePauseCalc(self, paused):
+        """
+        [UI操作] 暂停或恢复正在进行的单次计算与自动计算
+        """
+        tokens = [self._pipelineToken]
+        if self._holoCalcWorker is not None:
+            tokens.append(self._holoCalcWorker.cancelToken)
+
+        for token in tokens:
+            if token is None:
+                continue
+            if paused:
+                token.pause()
+            else:
+                token.resume()
+
+        self.pauseCalcBtn.setText("继续计算" if paused else "暂停计算")
+        if paused:
+            self.statusBar.showMessage(f"计算已暂停")
+
+    def updatePauseBtn(self):
+        """
+        [UI操作] 没有进行中的计算时复位并禁用暂停按钮
+        """
+        running = self._holoCalcWorker is not None or self._pipelineToken is not None
+        if not running:
+            with QSignalBlocker(self.pauseCalcBtn):
+                self.pauseCalcBtn.setChecked(False)
+            self.pauseCalcBtn.setText("暂停计算")
+        self.pauseCalcBtn.setEnabled(running)
+
+    def iterTelemetryEvent(self, record):
+        """
+        [UI事件] 刷新迭代收敛曲线与进度估计
+
+        :param dict record: 迭代遥测记录，见 IterTelemetry
+        """
+        self.convergencePlot.append(record['RMSENew'])
+        info = (
+            f"迭代{record['iteration']}次，{record['rate']:.1f}次/s，"
+            f"均匀性{record['uniformity']:.3f}，光场利用率{record['efficiency']:.3f}"
+        )
+        if record['done']:
+            self.iterInfo.setText(info)
+            return
+
+        self.iterInfo.setText(f"{info}，预计剩余{record['eta']:.1f}s")
+        self.progressBar.setRange(0, 1000)
+        self.progressBar.setValue(round(record['progress'] * 1000))
+        self.secondStatusInfo.setText(f"迭代中，RMSE={record['RMSE']:.4f}")
+
     def calcResultUpdateEvent(self, u, phase):
         """
         [UI事件] 全息图计算结果后处理
@@ -496,6 +866,8 @@ class MainWindow(QMainWindow):
         tEnd = time.time()
 
         del self.algorithm
+        self._holoCalcWorker = None
+        self.resetCalcBtn()
 
         self.secondStatusInfo.setText(f"发送全息图...")
         self.progressBar.setValue(7)
@@ -523,37 +895,23 @@ class MainWindow(QMainWindow):
             f"RMSE={round(RMSE, 4)}"
         )
 
-    def snapEvent(self):
+    def frameRefreshEvent(self):
         """
-        [UI事件] 抓图
+        [UI事件] 刷新相机预览窗口，预览帧已在相机线程中缩放
         """
-        if self._snapAsTarget:
-            self.snapImg = cv2.cvtColor(self.cam.snapshot, cv2.COLOR_RGB2GRAY)
+        preview = self.cam.preview.take()
+        self.cam.preview.setTarget(self.camPreview.width(), self.camPreview.height())
+        if preview is None:
+            return
 
-            if self._snapIsDisp:
-                self.imgLoadedEvent('Snap', None)
-            self._snapAsTarget = False
+        ImgProcess.cvImg2QPixmap(self.camPreview, preview, bgr=False)
 
-            filepath = f"../pics/snap/{time.strftime('%Y%m%d%H%M%S')}-asTarget.jpg"
-        else:
-            filepath = f"../pics/snap/{time.strftime('%Y%m%d%H%M%S')}.jpg"
-
-        Utils.folderPathCheck(filepath)
-
-        if self._snapIsSave:
-            cv2.imwrite(f"{filepath}", self.cam.snapshot)
-            logHandler.info(f"Snapshot saved as '{filepath}'")
-            self.statusBar.showMessage(f"截图已保存至 '{filepath}'")
-
-    def frameRefreshEvent(self):
+    def resizeEvent(self, event):
         """
-        [UI事件] 刷新相机预览窗口
+        [UI事件] 窗口尺寸变化时更新相机预览尺寸
         """
-        preview = self.cam.frame.scaled(
-            self.camPreview.width(), self.camPreview.height(),
-            Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation
-        )
-        self.camPreview.setPixmap(QPixmap.fromImage(preview))
+        super().resizeEvent(event)
+        self.cam.preview.setTarget(self.camPreview.width(), self.camPreview.height())
 
     def imgLoadedEvent(self, targetDir, holoDir):
         """
@@ -604,40 +962,61 @@ class MainWindow(QMainWindow):
         else:
             logHandler.warning(f"No image loaded. ")
 
-    def showNext(self):
-        try:
-            (holoImg, index) = self._imgQueue.get()
-        except Exception as e:
-            print(e)
-        else:
-            if self._imgQueue.qsize() == 0:
-                self._imgPlayTimer.stop()
-                self._framePipeReceiver = None
-                self._framePipeSender = None
-                self._holoPipeReceiver = None
-                self._holoPipeSender = None
-                self.statusBar.showMessage(f"显示完成")
-                self.autoCalcBtn.setText("从相机捕获")
-                self.autoCalcBtn.clicked.disconnect()
-                self.autoCalcBtn.clicked.connect(self.autoCalcHoloImg)
-            else:
-                self.holoImgReady.emit(holoImg)
-                self.statusBar.showMessage(f"正在显示第{index}帧")
-                QApplication.processEvents()
+    def showNext(self, holoImg, index):
+        """
+        [UI事件] 按播放调度显示全息图序列中的一帧
+
+        :param holoImg: 全息图
+        :param int index: 帧序号
+        """
+        self.holoImgReady.emit(holoImg)
+        player = self._player
+        self.statusBar.showMessage(
+            f"正在显示第{index}帧，缓冲{player.depth}帧，{1 / player.interval():.1f}fps，欠载{player.underruns}次"
+        )
+
+    def playbackFinishedEvent(self):
+        """
+        [UI事件] 全息图序列计算完成且播放完毕
+        """
+        self._framePipeReceiver = None
+        self._framePipeSender = None
+        self._holoPipeReceiver = None
+        self._holoPipeSender = None
+        self.statusBar.showMessage(f"显示完成")
+        player = self._player
+        logHandler.info(
+            f"Playback finished. Shown={player.shown}, Underruns={player.underruns}, "
+            f"Stalled={player.stallTime:.2f}s, Late={player.late}"
+        )
+        presentStats = self.secondWin.presentStats()
+        if presentStats is not None:
+            logHandler.info(
+                f"Presenter: Presented={presentStats[0]}, Dropped={presentStats[1]}, "
+                f"Repeated={presentStats[2]}"
+            )
+        self.replanBtn.setEnabled(False)
+        self.autoCalcBtn.setText("从相机捕获")
+        self.autoCalcBtn.clicked.disconnect()
+        self.autoCalcBtn.clicked.connect(self.autoCalcHoloImg)
 
     def reconstructResult(self, holoU, d: int, wavelength: float):
         """
-        [UI事件] 重建光场和相位
+        [UI事件] 在后台线程中按预览尺寸重建光场振幅，完成后显示
         :param holoU: 全息光场
         :param d: 像面距离
         :param wavelength: 激光波长
         """
+        # 预览仅显示振幅，与像面距离和波长无关
+        size = min(self.targetImgPreview.width(), self.targetImgPreview.height())
+        self._reconstructor.request(holoU, size)
 
-        # 重建光场
-        reconstructU = Holo.reconstruct(holoU, d, wavelength)
-        reconstructA = Holo.normalize(np.abs(reconstructU)) * 255
-
-        ImgProcess.cvImg2QPixmap(self.targetImgPreview, reconstructA.astype("uint8"))
+    def reconstructReadyEvent(self, holoU, reconstructA):
+        """
+        [UI事件] 显示重建预览，全息图已更换时丢弃
+        """
+        if holoU is self.holoU:
+            ImgProcess.cvImg2QPixmap(self.targetImgPreview, reconstructA)
 
     def expTimeUpdatedEvent(self):
         """
@@ -671,60 +1050,376 @@ class MainWindow(QMainWindow):
                 f'程序即将开始识别中心坐标。识别期间请保持平台稳定，勿操作平台。\n'
                 f'准备好后点击 [OK]'
             )
-            if self.snapImg is not None:
-                try:
-                    circles = FeaturesDetect.detectCircles(self.snapImg)
-                except TypeError:
-                    QMessageBox.critical(
-                        self,
-                        '错误',
-                        f'未识别到零级光斑'
-                    )
-                    return -1
-                else:
-                    self.zerothOrderPosition = circles[0][:2]
-                    QMessageBox.information(
-                        self,
-                        '成功',
-                        f'中心坐标更新为{self.zerothOrderPosition}'
-                    )
-                    logHandler.info(f"zerothOrderPosition at {self.zerothOrderPosition}")
-                    return 0
-            else:
+            self.waitSnapImg(self.zerothOrderSnapEvent)
+
+    def zerothOrderSnapEvent(self, status):
+        """
+        [UI事件] 校准用抓图完成，识别零级光斑
+        """
+        if status == 0:
+            circles = FeaturesDetect.detectPoints(self.snapImg)
+            if len(circles) == 0:
                 QMessageBox.critical(
                     self,
                     '错误',
                     f'未识别到零级光斑'
                 )
-                return -1
+            else:
+                self.zerothOrderPosition = circles.point(0)
+                QMessageBox.information(
+                    self,
+                    '成功',
+                    f'中心坐标更新为{self.zerothOrderPosition}'
+                )
+                logHandler.info(f"zerothOrderPosition at {self.zerothOrderPosition}")
+                if self._tracker is not None:
+                    self._tracker.setRoi(self.getTrackingRoi())
+        else:
+            QMessageBox.critical(
+                self,
+                '错误',
+                f'未能从相机抓取图像'
+            )
 
-    def autoCalcHoloImg(self):
+    def getCamSlmMapping(self, camShape=None):
+        """
+        [UI事件] 获取相机-SLM映射，仅在零级光位置或相机分辨率变化后重新计算
 
-        def startThreads():
-            self._frameGenerator.start()
-            self._holoGenerator.start()
+        :param camShape: 相机图像尺寸 (高, 宽)，默认取已抓取静态帧的尺寸
+        """
+        if camShape is None:
+            camShape = self.snapImg.shape
+        if self._camSlmMap is None or not self._camSlmMap.matches(self.zerothOrderPosition, camShape):
+            self._camSlmMap = CamSlmMapping(self.zerothOrderPosition, camShape)
+            logHandler.info(f"Camera to SLM mapping updated, ROI={self._camSlmMap.roi}")
 
-            self._imgPlayTimer.start(50)
+        return self._camSlmMap
 
-            self._framePipeSender.close()
-            self._framePipeReceiver.close()
-            self._holoPipeSender.close()
+    def getTrackingRoi(self):
+        """
+        [UI事件] 粒子跟踪的感兴趣区域，取SLM可操作的视场；零级光位置无效时跟踪全帧
+        """
+        try:
+            return self.getCamSlmMapping(self.cam.previewShape).roi
+        except ValueError:
+            return None
 
-            while True:
-                try:
-                    (phase, index) = self._holoPipeReceiver.recv()
-                    holoImg = cp.asnumpy(Holo.genHologram(phase))
-                    holoImgRotated = cv2.rotate(holoImg, cv2.ROTATE_90_CLOCKWISE)
-                    self._imgQueue.put((holoImgRotated, index))
-                    self.secondStatusInfo.setText(f"计算第{index}帧")
-                    QApplication.processEvents()
-                except EOFError:
-                    self._holoPipeReceiver.close()
-                    self.progressBar.setRange(0, 100)
-                    self.progressBar.setValue(100)
-                    self.secondStatusInfo.setText(f"计算已完成")
-                    break
+    def toggleTracking(self, checked):
+        """
+        [UI操作] 开关相机视频流上的实时粒子跟踪
+        """
+        if not checked:
+            self.stopTracking()
+            return
+
+        if self._tracker is None:
+            # 硬件ROI模式下整帧即为跟踪区域；全分辨率与合并模式下坐标系不同，不扣除背景
+            if self.cam.mode == 'preview':
+                roi = self.getTrackingRoi()
+            else:
+                roi = None
+            inPreviewCoords = self.cam.mode in ('preview', 'roi')
+
+            self._tracker = TrackingWorker(
+                roi=roi,
+                background=self.background if self.bgSubCheck.isChecked() and inPreviewCoords else None,
+                origin=self.cam.origin
+            )
+            self._tracker.stats = self.cam.stats
+            self._tracker.trackUpdate.connect(self.trackUpdateEvent)
+            self._tracker.start()
+            self.cam.addFrameConsumer(self._tracker.submit, self._tracker.maxSlots)
+            logHandler.info(f"Tracking started, ROI={self._tracker.roi}")
+
+    def stopTracking(self):
+        """
+        [UI操作] 停止粒子跟踪
+        """
+        if self._tracker is not None:
+            self.cam.removeFrameConsumer(self._tracker.submit)
+            self._tracker.stop()
+            logHandler.info(
+                f"Tracking stopped, {self._tracker.processed} frames processed, {self._tracker.dropped} dropped"
+            )
+            self._tracker = None
+
+        self.trackedPoints = None
+        self.trackInfo.setText("")
+        with QSignalBlocker(self.trackBtn):
+            self.trackBtn.setChecked(False)
+
+    def toggleRecording(self, checked):
+        """
+        [UI操作] 开始/停止录制相机视频流
+        """
+        if not checked:
+            self.stopRecording()
+            return
+        if self._recorder is not None:
+            return
+
+        filepath = f"../pics/record/{time.strftime('%Y%m%d%H%M%S')}.rec"
+        Utils.folderPathCheck(filepath)
+        ring = self.cam.ring
+        try:
+            self._recorder = FrameRecorder(filepath, ring.height, ring.width, ring.channels, self.recordFrames)
+        except OSError as e:
+            logHandler.error(f"Unable to create recording '{filepath}': {e}")
+            self.statusBar.showMessage(f"无法创建录制文件")
+            with QSignalBlocker(self.recordBtn):
+                self.recordBtn.setChecked(False)
+            return
+
+        self._recorder.stats = self.cam.stats
+        self._recorder.start()
+        self.cam.addFrameConsumer(self._recorder.submit, self._recorder.maxSlots)
+        logHandler.info(f"Recording to '{filepath}', {ring.width}x{ring.height}x{ring.channels}")
+        self.statusBar.showMessage(f"正在录制到 {filepath}")
+
+    def stopRecording(self):
+        """
+        [UI操作] 停止录制，等待已提交的帧写完
+        """
+        if self._recorder is not None:
+            self.cam.removeFrameConsumer(self._recorder.submit)
+            self._recorder.stop()
+            logHandler.info(
+                f"Recording '{self._recorder.path}' saved, {self._recorder.written} frames written, "
+                f"{self._recorder.dropped} dropped"
+            )
+            self.statusBar.showMessage(f"录制已保存到 {self._recorder.path}，共 {self._recorder.written} 帧")
+            self._recorder = None
+
+        self.recordInfo.setText("")
+        with QSignalBlocker(self.recordBtn):
+            self.recordBtn.setChecked(False)
+
+    def measureSlmLatency(self):
+        """
+        [UI操作] 在副屏交替显示测试全息图，测量从发出全息图到相机图像稳定的延迟
+        """
+        if self._latencyProbe is not None:
+            return
+        if self._player.isActive():
+            self.statusBar.showMessage(f"请在全息图序列播放结束后测量SLM延迟")
+            return
+
+        message = QMessageBox.warning(
+            self,
+            '测量SLM延迟',
+            f'测量期间副屏将交替显示测试全息图，约需30秒。\n'
+            f'请打开激光，使零级光在视场内可见，测量期间保持光路不变。\n\n'
+            f'准备好后点击 [OK]',
+            (QMessageBox.StandardButton.Cancel | QMessageBox.StandardButton.Ok),
+            QMessageBox.StandardButton.Ok
+        )
+        if message != QMessageBox.StandardButton.Ok or not self.cam.device:
+            return
+
+        self._latencyProbe = SlmLatencyProbe(self.cam, self.holoImgReady.emit, self.secondWin.holoImgFullScn)
+        self._latencyProbe.progress.connect(self.latencyProgressEvent)
+        self._latencyProbe.finished.connect(self.latencyMeasuredEvent)
+        self._latencyProbe.start()
+
+        self.latencyBtn.setEnabled(False)
+        self.progressBar.setRange(0, self._latencyProbe.trials)
+        self.progressBar.setValue(0)
+        self.statusBar.showMessage(f"正在测量SLM延迟...")
+
+    def stopLatencyProbe(self):
+        """
+        [UI操作] 中止SLM延迟测量
+        """
+        if self._latencyProbe is not None:
+            self._latencyProbe.stop()
+
+    def latencyProgressEvent(self, done, total):
+        """
+        [UI事件] SLM延迟测量进度
+        """
+        self.progressBar.setValue(done)
+        self.secondStatusInfo.setText(f"测量SLM延迟 {done + 1}/{total}")
+
+    def latencyMeasuredEvent(self, result):
+        """
+        [UI事件] SLM延迟测量结束，恢复测量前的全息图
+        """
+        self._latencyProbe = None
+        self.latencyBtn.setEnabled(self.cam.device is not None)
+        self.holoImgReady.emit(self.holoImgRotated)
+        self.secondStatusInfo.setText(f"")
+
+        if isinstance(result, Exception):
+            logHandler.warning(f"SLM latency measurement failed: {result}")
+            self.statusBar.showMessage(f"SLM延迟测量失败：{result}")
+            return
+
+        self.progressBar.setValue(self.progressBar.maximum())
+        logHandler.info(f"SLM latency measured:\n{result.summary()}")
+        total = result.values('total')
+        if len(total) == 0:
+            self.latencyInfo.setText(f"未测得稳定时间")
+            self.statusBar.showMessage(f"SLM延迟测量完成，但相机图像未能稳定，请增加保持时间")
+            return
+
+        self.latencyInfo.setText(f"显示到稳定 中位 {np.median(total) * 1e3:.0f} ms")
+        self.statusBar.showMessage(f"SLM延迟测量完成，详见日志")
+
+    def learnBackground(self):
+        """
+        [UI操作] 从视频流学习背景，学习期间应使粒子移动或移出视场
+        """
+        if self._bgLearner is not None:
+            return
+        if self.cam.mode != 'preview':
+            self.statusBar.showMessage(f"请在预览模式下学习背景")
+            return
+
+        self.background.reset()
+        self._bgLearner = BackgroundWorker(self.background)
+        self._bgLearner.stats = self.cam.stats
+        self._bgLearner.finished.connect(self.bgLearnedEvent)
+        self._bgLearner.start()
+        self.cam.addFrameConsumer(self._bgLearner.submit, self._bgLearner.maxSlots)
+
+        self.learnBgBtn.setEnabled(False)
+        self.bgSubCheck.setEnabled(False)
+        self.statusBar.showMessage(f"正在学习背景，请保持光路不变...")
+
+    def stopBgLearning(self):
+        """
+        [UI操作] 中止背景学习
+        """
+        if self._bgLearner is not None:
+            self._bgLearner.stop()
+
+    def bgLearnedEvent(self):
+        """
+        [UI事件] 背景学习结束
+        """
+        self.cam.removeFrameConsumer(self._bgLearner.submit)
+        self._bgLearner = None
+        self.learnBgBtn.setEnabled(self.cam.device is not None)
+
+        if self.background.ready:
+            logHandler.info(f"Background learned from {self.background.frames} frames")
+            self.statusBar.showMessage(f"背景学习完成")
+            self.bgSubCheck.setEnabled(True)
+            self.bgSubCheck.setChecked(True)
+        else:
+            self.statusBar.showMessage(f"背景学习中止，帧数不足")
+            self.bgSubCheck.setChecked(False)
+
+    def toggleBgSubtraction(self, checked):
+        """
+        [UI操作] 开关识别前的背景扣除，同时作用于抓图识别与粒子跟踪
+        """
+        if self._tracker is not None and self.cam.mode in ('preview', 'roi'):
+            self._tracker.background = self.background if checked else None
+
+    def getDetectImg(self):
+        """
+        [UI事件] 用于识别的现场图像，按设置扣除背景
+        """
+        if self.bgSubCheck.isChecked() and self.background.shape == self.snapImg.shape:
+            return self.background.subtract(self.snapImg)
+
+        return self.snapImg
+
+    def trackUpdateEvent(self, points, timestamp):
+        """
+        [UI事件] 接收跟踪结果，界面信息限频刷新
+        """
+        if self._tracker is None:
+            return
+
+        self.trackedPoints = points
+        if timestamp - self._trackInfoTime >= 0.2:
+            self._trackInfoTime = timestamp
+            self.trackInfo.setText(f"跟踪中：{len(points)}个粒子")
 
+    def startThreads(self):
+        """
+        [UI事件] 启动路径帧与全息图计算进程，并在接收线程中接收计算结果
+        """
+        self.stopHoloReceiver()
+
+        self._frameGenerator.start()
+        self._holoGenerator.start()
+
+        self._player.start()
+
+        self._framePipeSender.close()
+        self._framePipeReceiver.close()
+        self._holoPipeSender.close()
+
+        self.progressBar.setRange(0, max(self._sequencePlanner.totalFrames, 1))
+        self.progressBar.setValue(self._computedFrames)
+
+        # 由Qt管理生命周期，退出后已排队的结果仍可由 sender() 识别
+        self._holoReceiver = HoloReceiverWorker(self._holoPipeReceiver, parent=self)
+        self._holoReceiver.finished.connect(self._holoReceiver.deleteLater)
+        self._holoReceiver.frameReady.connect(self.holoComputedEvent)
+        self._holoReceiver.completed.connect(self.holoCompletedEvent)
+        self._holoReceiver.start()
+        self.updatePauseBtn()
+
+    def stopHoloReceiver(self):
+        """
+        [UI操作] 停止全息图接收线程，已排队未处理的结果随之作废
+        """
+        if self._holoReceiver is not None:
+            self._holoReceiver.stop()
+            self._holoReceiver = None
+
+    def holoComputedEvent(self, holoImgRotated, index):
+        """
+        [UI事件] 接收线程给出一帧全息图，加入播放队列
+        """
+        # 重规划或中止前已发出的结果
+        if self.sender() is not self._holoReceiver:
+            return
+
+        if self._heldFrames is not None:
+            self._heldFrames.append((holoImgRotated, index))
+            return
+        self.acceptHoloFrame(holoImgRotated, index)
+
+    def acceptHoloFrame(self, holoImgRotated, index):
+        """
+        [UI操作] 将一帧全息图加入播放队列并更新进度
+        """
+        self._player.push(holoImgRotated, index)
+        self._computedFrames = index + 1
+        self.progressBar.setValue(self._computedFrames)
+        self.secondStatusInfo.setText(f"计算第{index}帧")
+
+    def holoCompletedEvent(self):
+        """
+        [UI事件] 全息图序列计算完成
+        """
+        if self.sender() is not self._holoReceiver:
+            return
+
+        if self._heldFrames is not None:
+            self._heldCompleted = True
+            return
+        self.pipelineCompleted()
+
+    def pipelineCompleted(self):
+        """
+        [UI操作] 全息图序列已全部计算并加入播放队列
+        """
+        self._holoReceiver = None
+        self._pipelineToken = None
+        self.progressBar.setRange(0, 100)
+        self.progressBar.setValue(100)
+        self.secondStatusInfo.setText(f"计算已完成")
+        self.replanBtn.setEnabled(False)
+        self.updatePauseBtn()
+        self._player.endOfStream()
+
+    def autoCalcHoloImg(self):
         self.snapAsTarget(False)
 
         message = QMessageBox.warning(
@@ -737,70 +1432,302 @@ class MainWindow(QMainWindow):
         )
 
         if message == QMessageBox.StandardButton.Ok:
-            if all([self._framePipeReceiver, self._framePipeSender, self._holoPipeReceiver, self._holoPipeSender]):
-                pass
-            else:
-                self._framePipeReceiver, self._framePipeSender = Pipe()
-                self._holoPipeReceiver, self._holoPipeSender = Pipe()
+            self.waitSnapImg(self.autoCalcSnapEvent)
 
-            self.progressBar.setRange(0, 100)
-            self.progressBar.setValue(0)
-            self.autoCalcBtn.setText("中止")
-            self.autoCalcBtn.clicked.disconnect()
-            self.autoCalcBtn.clicked.connect(self.stopThreads)
+    def autoCalcSnapEvent(self, status):
+        """
+        [UI事件] 识别用抓图完成，识别、匹配粒子并开始规划路径
+        """
+        if status == -1:
+            QMessageBox.critical(
+                self,
+                '错误',
+                f'未能从相机抓取图像\n'
+            )
+            return
 
-            center = self.zerothOrderPosition
+        if all([self._framePipeReceiver, self._framePipeSender, self._holoPipeReceiver, self._holoPipeSender]):
+            pass
+        else:
+            self._framePipeReceiver, self._framePipeSender = Pipe()
+            self._holoPipeReceiver, self._holoPipeSender = Pipe()
 
-            currentImg = FeaturesDetect.cutImg(self.snapImg, center)
-            # currentImg = FeaturesDetect.cutImg(cv2.imread('3.jpg', cv2.IMREAD_GRAYSCALE), center)
+        self.progressBar.setRange(0, 100)
+        self.progressBar.setValue(0)
+        self.autoCalcBtn.setText("中止")
+        self.autoCalcBtn.clicked.disconnect()
+        self.autoCalcBtn.clicked.connect(self.stopThreads)
 
-            # 检测特征点
-            try:
-                currentPoints = FeaturesDetect.detectCircles(currentImg)
-                targetPoints = FeaturesDetect.detectCircles(self.targetImg)
+        currentImg = self.getCamSlmMapping().apply(self.getDetectImg())
+        # currentImg = FeaturesDetect.cutImg(cv2.imread('3.jpg', cv2.IMREAD_GRAYSCALE), center)
 
-            except TypeError:
-                QMessageBox.critical(
-                    self,
-                    '错误',
-                    f'未能识别到目标点或图像点\n'
-                )
-                self.stopThreads()
-                return -1
+        # 检测特征点
+        currentPoints = FeaturesDetect.detectPoints(currentImg)
+        targetPoints = FeaturesDetect.detectPoints(self.targetImg)
 
-            self.secondStatusInfo.setText("识别目标点...")
-            totalOrderA, _ = FeaturesSort(targetPoints, 0.1).calc()
+        if len(currentPoints) == 0 or len(targetPoints) == 0:
+            QMessageBox.critical(
+                self,
+                '错误',
+                f'未能识别到目标点或图像点\n'
+            )
+            self.stopThreads()
+            return
 
-            self.secondStatusInfo.setText("匹配目标点...")
-            matchedPairs = FeaturesDetect.match(currentPoints, totalOrderA, 0.55, 2.2)
+        self.secondStatusInfo.setText("识别目标点...")
+        totalOrderA, _ = FeaturesSort(targetPoints, 0.1).calc()
 
-            if len(currentPoints) < len(targetPoints):
-                self.statusBar.showMessage(f"{len(targetPoints)}个目标点，但视场中仅识别到{len(currentPoints)}个点，仅对上述点进行就近匹配")
-            else:
-                self.statusBar.showMessage(f"{len(targetPoints)}个目标点已全部完成就近匹配")
+        self.secondStatusInfo.setText("匹配目标点...")
+        matchedPairs = FeaturesDetect.match(currentPoints, totalOrderA, 0.55, 2.2)
 
-            maxIterNum = self.maxIterNumInput.value()
-            iterTarget = self.iterTargetInput.value() * 0.01
+        if len(currentPoints) < len(targetPoints):
+            self.statusBar.showMessage(f"{len(targetPoints)}个目标点，但视场中仅识别到{len(currentPoints)}个点，仅对上述点进行就近匹配")
+        else:
+            self.statusBar.showMessage(f"{len(targetPoints)}个目标点已全部完成就近匹配")
+
+        maxIterNum = self.maxIterNumInput.value()
+        iterTarget = self.iterTargetInput.value() * 0.01
+
+        self.secondStatusInfo.setText("规划避障路径...")
+        self._holoIterArgs = (maxIterNum, iterTarget)
+
+        # 视场内全部粒子（含未匹配粒子）与目标位置均视为障碍
+        self._sequencePlanner = SequencePlanner()
+        self.startPlanWorker(
+            PlanWorker(self._sequencePlanner, matchedPairs, currentPoints, targetPoints, parent=self),
+            self.planFinishedEvent
+        )
+
+    def startPlanWorker(self, worker, slot):
+        """
+        [UI操作] 在后台线程中规划路径，完成后由 slot 处理结果
+        """
+        worker.plannedSig.connect(slot)
+        worker.failedSig.connect(self.planFailedEvent)
+        worker.finished.connect(worker.deleteLater)
+        self._planWorker = worker
+        worker.start()
+
+    def planFinishedEvent(self, paths):
+        """
+        [UI事件] 首次路径规划完成，启动路径帧与全息图计算进程
+        """
+        # 规划期间已中止
+        if self.sender() is not self._planWorker:
+            return
+        self._planWorker = None
+
+        self.secondStatusInfo.setText("计算路径帧...")
+
+        self._pipelineToken = CancelToken()
+        self._frameGenerator = FrameGeneratorWorker(
+            self._sequencePlanner.matchedPairs, self._framePipeSender, paths, cancelToken=self._pipelineToken
+        )
+        self._holoGenerator = HoloGeneratorWorker(
+            self._framePipeReceiver,
+            self._holoPipeSender,
+            *self._holoIterArgs,
+            cancelToken=self._pipelineToken
+        )
+
+        self._computedFrames = 0
+        self.replanBtn.setEnabled(True)
+
+        self.startThreads()
+
+    def planFailedEvent(self, message):
+        """
+        [UI事件] 路径规划出错，首次规划时中止计算，重规划时按原路径继续
+        """
+        worker = self.sender()
+        if worker is not self._planWorker:
+            return
+        self._planWorker = None
+
+        logHandler.error(f"Path planning failed: {message}")
+        self.statusBar.showMessage(f"路径规划失败")
+        if worker.replan:
+            self.releaseHeldFrames()
+        else:
+            self.stopThreads()
+
+    def replanHoloImg(self):
+        """
+        [UI操作] 粒子漂移后重新识别，仅对受影响的光阱增量重规划
+        """
+        if self._sequencePlanner is None or self._frameGenerator is None:
+            return -1
+
+        self.snapAsTarget(False)
+
+        message = QMessageBox.warning(
+            self,
+            '准备识别',
+            f'程序即将重新识别图像中粒子位置。识别期间请保持平台稳定，勿操作平台。\n'
+            f'准备好后点击 [OK]',
+            (QMessageBox.StandardButton.Cancel | QMessageBox.StandardButton.Ok),
+            QMessageBox.StandardButton.Ok
+        )
 
-            self.secondStatusInfo.setText("计算路径帧...")
+        if message == QMessageBox.StandardButton.Ok:
+            self.waitSnapImg(self.replanSnapEvent)
 
-            self._frameGenerator = FrameGeneratorWorker(matchedPairs, self._framePipeSender)
+    def replanSnapEvent(self, status):
+        """
+        [UI事件] 重新识别用抓图完成，识别粒子并在后台重规划
+        """
+        # 等待抓图期间计算已中止或完成
+        if self._pipelineToken is None:
+            return
 
-            self._holoGenerator = HoloGeneratorWorker(
-                self._framePipeReceiver,
-                self._holoPipeSender,
-                maxIterNum,
-                iterTarget
+        if status == -1:
+            QMessageBox.critical(
+                self,
+                '错误',
+                f'未能从相机抓取图像\n'
             )
+            return
 
-            self.progressBar.setRange(0,0)
+        currentImg = self.getCamSlmMapping().apply(self.getDetectImg())
 
-            startThreads()
+        freshPoints = FeaturesDetect.detectPoints(currentImg)
+        if len(freshPoints) == 0:
+            QMessageBox.critical(
+                self,
+                '错误',
+                f'未能识别到图像点\n'
+            )
+            return
+
+        # 规划期间暂停计算，已缓冲的帧照常播放；其间仍送达的帧暂存，待规划结果确定后播放或丢弃
+        if self._pipelineToken is not None:
+            self._pipelineToken.pause()
+        self._heldFrames = []
+        self._heldCompleted = False
+        self.replanBtn.setEnabled(False)
+        self.secondStatusInfo.setText("重新规划路径...")
+
+        self.startPlanWorker(
+            PlanWorker(self._sequencePlanner, freshPoints, self._computedFrames, replan=True, parent=self),
+            self.replanFinishedEvent
+        )
+
+    def releaseHeldFrames(self):
+        """
+        [UI操作] 重规划无变化或失败，播放暂存的帧并按暂停按钮状态恢复计算
+        """
+        held, completed = self._heldFrames or [], self._heldCompleted
+        self._heldFrames = None
+        self._heldCompleted = False
+
+        for holoImgRotated, index in held:
+            self.acceptHoloFrame(holoImgRotated, index)
+        if self._pipelineToken is not None and not self.pauseCalcBtn.isChecked():
+            self._pipelineToken.resume()
+
+        if completed:
+            self.pipelineCompleted()
+        else:
+            self.replanBtn.setEnabled(True)
+
+    def replanFinishedEvent(self, result):
+        """
+        [UI事件] 增量重规划完成，自首个失效帧起重新计算
+        """
+        if self.sender() is not self._planWorker:
+            return
+        self._planWorker = None
+
+        firstInvalid, replanned = result
+        if firstInvalid is None:
+            self.statusBar.showMessage(f"粒子位置无明显漂移，无需重新规划")
+            self.releaseHeldFrames()
+            return
+
+        # 暂存的帧按原路径计算，全部作废
+        self._heldFrames = None
+        self._heldCompleted = False
+        paused = self.pauseCalcBtn.isChecked()
+        self.shutdownGenerators()
+
+        # 已计算的帧保留在播放队列中，仅重新计算其后的帧
+        self._framePipeReceiver, self._framePipeSender = Pipe()
+        self._holoPipeReceiver, self._holoPipeSender = Pipe()
+
+        self._pipelineToken = CancelToken()
+        if paused:
+            self._pipelineToken.pause()
+        self._frameGenerator = FrameGeneratorWorker(
+            self._sequencePlanner.matchedPairs,
+            self._framePipeSender,
+            self._sequencePlanner.paths,
+            firstInvalid,
+            cancelToken=self._pipelineToken
+        )
+        self._holoGenerator = HoloGeneratorWorker(
+            self._framePipeReceiver,
+            self._holoPipeSender,
+            *self._holoIterArgs,
+            cancelToken=self._pipelineToken
+        )
+
+        self.statusBar.showMessage(f"已重新规划{len(replanned)}个光阱，自第{firstInvalid}帧起重新计算")
+        logHandler.info(f"Replanned {len(replanned)} traps, frames from {firstInvalid} invalidated")
+
+        self.replanBtn.setEnabled(True)
+        self.startThreads()
+
+    def shutdownGenerators(self, timeout=2.0):
+        """
+        [UI操作] 取消路径帧与全息图计算进程，不等待其退出
+
+        进程在当前一帧或一次迭代完成后自行关闭管道退出，由 reapGenerators 定时回收，超时仍未退出时才强制结束
+
+        :param timeout: 每个进程的等待时间 (s)
+        """
+        if self._pipelineToken is not None:
+            self._pipelineToken.cancel()
+            self._pipelineToken = None
+        # 关闭接收端，阻塞在发送上的进程随之退出
+        self.stopHoloReceiver()
+
+        deadline = time.perf_counter() + timeout
+        for worker in (self._frameGenerator, self._holoGenerator):
+            if worker is None or worker.pid is None or worker in self._retiredGenerators:
+                continue
+            self._retiredGenerators[worker] = deadline
+
+        if self._retiredGenerators and not self._reapTimer.isActive():
+            self._reapTimer.start()
+
+    def reapGenerators(self, wait=False):
+        """
+        [UI事件] 回收已取消的计算进程，超时仍未退出的强制结束
+
+        :param wait: 阻塞等待至各进程超时，仅在关闭窗口时使用
+        """
+        for worker, deadline in list(self._retiredGenerators.items()):
+            if wait:
+                worker.join(max(deadline - time.perf_counter(), 0))
+            if worker.is_alive():
+                if time.perf_counter() < deadline:
+                    continue
+                logHandler.warning(f"{type(worker).__name__} did not stop in time, terminating")
+                worker.terminate()
+            worker.join()
+            del self._retiredGenerators[worker]
+
+        if not self._retiredGenerators:
+            self._reapTimer.stop()
 
     def stopThreads(self):
-        self._frameGenerator.terminate()
-        self._holoGenerator.terminate()
-        self._imgPlayTimer.stop()
+        # 进行中的规划结果作废，线程结束后自行释放
+        self._planWorker = None
+        self._heldFrames = None
+        self._heldCompleted = False
+        self.shutdownGenerators()
+        self.updatePauseBtn()
+        self._player.stop()
         self._framePipeReceiver = None
         self._framePipeSender = None
         self._holoPipeReceiver = None
@@ -808,6 +1735,7 @@ class MainWindow(QMainWindow):
         self.progressBar.setRange(0, 100)
         self.progressBar.setValue(100)
         self.secondStatusInfo.setText(f"计算已完成")
+        self.replanBtn.setEnabled(False)
         logHandler.warning("Calculation terminated")
         self.autoCalcBtn.setText("从相机捕获")
         self.autoCalcBtn.clicked.disconnect()
@@ -817,8 +1745,12 @@ class MainWindow(QMainWindow):
 class SecondMonitorWindow(QMainWindow):
     """
     [副屏窗口类] 用于显示全息图
+
+    :var useOpenGL: 以OpenGL纹理按垂直同步逐帧显示全息图，否则转换为QPixmap显示
     """
 
+    useOpenGL = True
+
     def __init__(self):
         super().__init__()
 
@@ -831,11 +1763,15 @@ class SecondMonitorWindow(QMainWindow):
         # 隐藏任务栏按钮
         self.setWindowFlags(Qt.WindowType.SplashScreen | Qt.WindowType.FramelessWindowHint)
 
-        self.holoImgFullScn = QLabel(self)
-        self.holoImgFullScn.setAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
+        if self.useOpenGL:
+            self.holoImgFullScn = SlmPresenter(self)
+            self.holoImgFullScn.placeholder = "请在主窗口计算全息图"
+        else:
+            self.holoImgFullScn = QLabel(self)
+            self.holoImgFullScn.setAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
+            self.holoImgFullScn.setText("请在主窗口计算全息图")
         self.holoImgFullScn.setMinimumSize(320, 320)
         self.holoImgFullScn.setStyleSheet("font-size: 14px; color: #fff")
-        self.holoImgFullScn.setText("请在主窗口计算全息图")
 
         layout = QVBoxLayout()
         layout.addWidget(self.holoImgFullScn)
@@ -860,7 +1796,21 @@ class SecondMonitorWindow(QMainWindow):
         :param object image:
         """
         logHandler.debug(f"Image has been received from the main window.")
-        ImgProcess.cvImg2QPixmap(self.holoImgFullScn, image)
+        if self.useOpenGL:
+            self.holoImgFullScn.present(image)
+        else:
+            ImgProcess.cvImg2QPixmap(self.holoImgFullScn, image)
+
+    def presentStats(self):
+        """
+        [副屏] 全息图显示统计
+
+        :return: (已显示帧数, 丢弃帧数, 重复显示帧数)，未使用OpenGL显示时为None
+        """
+        if not self.useOpenGL:
+            return None
+        queue = self.holoImgFullScn.queue
+        return queue.presented, queue.dropped, queue.repeated
 
     def monitorDetection(self):
         """
@@ -929,6 +1879,25 @@ class SecondMonitorWindow(QMainWindow):
 if __name__ == '__main__':
     args = Utils.getCmdOpt()
     logHandler = Utils.getLog()
+    FeaturesDetect.detector = DETECTORS[args.detector]()
+    CameraMiddleware.mono = args.mono
+    if args.camera == 'sim':
+        from lib.cam.simCamera import SimCamera
+        SimCamera.beadCount = args.sim_beads
+        SimCamera.fps = args.sim_fps
+        CameraMiddleware.backend = SimCamera
+    elif args.camera == 'replay':
+        from lib.cam.replayCamera import ReplayCamera
+        ReplayCamera.source = args.replay
+        ReplayCamera.realtime = not args.replay_fast
+        ReplayCamera.loop = args.replay_loop
+        CameraMiddleware.backend = ReplayCamera
+    CameraMiddleware.previewFps = args.preview_fps
+    CameraMiddleware.snapFrames = max(args.snap_frames, 1)
+    SecondMonitorWindow.useOpenGL = not args.no_opengl
+    PlaybackScheduler.targetFps = args.play_fps
+    PlaybackScheduler.minBuffer = max(args.play_buffer, 1)
+    PlaybackScheduler.adaptive = not args.play_fixed
 
     app = QApplication(sys.argv)
     qInstallMessageHandler(Utils.exceptionHandler)